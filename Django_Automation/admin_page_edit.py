@@ -2,6 +2,9 @@ import os
 import subprocess
 import sys
 
+from venv_introspect import find_venv, bin_dir
+from settings_editor import SettingsEditor, Raw
+
 def ask_path(prompt):
     while True:
         path = input(prompt).strip()
@@ -11,71 +14,25 @@ def ask_path(prompt):
             print("Path does not exist. Try again.")
 
 def activate_venv(project_path):
-    possible_venvs = ['venv', 'env', '.venv']
-    for venv_name in possible_venvs:
-        venv_path = os.path.join(project_path, venv_name)
-        if os.path.exists(venv_path):
-            if os.name == 'nt':  # Windows
-                activate_script = os.path.join(venv_path, 'Scripts', 'activate')
-            else:  # Unix
-                activate_script = os.path.join(venv_path, 'bin', 'activate')
-            if os.path.exists(activate_script):
-                return activate_script
+    venv_path = find_venv(project_path)
+    if venv_path:
+        activate_script = os.path.join(bin_dir(venv_path), 'activate')
+        if os.path.exists(activate_script):
+            return activate_script
     return None
 
 def modify_settings(settings_path, app_name):
-    with open(settings_path, 'r') as f:
-        lines = f.readlines()
-
-    new_lines = []
-    in_installed_apps = False
-    inserted_app = False
-    in_templates = False
-    dirs_updated = False
-    os_imported = False
-
-    for line in lines:
-        stripped_line = line.strip()
-
-        # Ensure 'import os' is present
-        if stripped_line == 'import os':
-            os_imported = True
-
-        # Insert app into INSTALLED_APPS
-        if 'INSTALLED_APPS' in line and '=' in line:
-            in_installed_apps = True
-            new_lines.append(line)
-            continue
-
-        if in_installed_apps:
-            if f'"{app_name}"' in line:
-                inserted_app = True  # Already added
-            if '"django.contrib.admin"' in line and not inserted_app:
-                new_lines.append(f'    "{app_name}",\n')
-                inserted_app = True
-            if line.strip().startswith(']'):
-                in_installed_apps = False
-            new_lines.append(line)
-            continue
-
-        # Update DIRS properly in TEMPLATES
-        if '"DIRS"' in line and not dirs_updated:
-            indent = ' ' * (len(line) - len(line.lstrip()))
-            new_dirs_line = f'{indent}"DIRS": [\n' \
-                            f'{indent}    os.path.join(BASE_DIR, "templates"),\n' \
-                            f'{indent}    os.path.join(BASE_DIR, "{app_name}", "templates"),\n' \
-                            f'{indent}],\n'
-            new_lines.append(new_dirs_line)
-            dirs_updated = True
-            continue
-
-        new_lines.append(line)
-
-    if not os_imported:
-        new_lines.insert(0, "import os\n")
-
-    with open(settings_path, 'w') as f:
-        f.writelines(new_lines)
+    # Single parse and atomic write of settings.py
+    with SettingsEditor(settings_path) as editor:
+        editor.ensure_import('import os')
+
+        # Insert app into INSTALLED_APPS, above django.contrib.admin so its
+        # admin templates take precedence
+        editor.add_installed_app(app_name, before='django.contrib.admin')
+
+        # Add project and app template folders to TEMPLATES DIRS
+        editor.add_template_dir(Raw('os.path.join(BASE_DIR, "templates")'))
+        editor.add_template_dir(Raw(f'os.path.join(BASE_DIR, "{app_name}", "templates")'))
 
 def main():
     print("Django Automation Script")
@@ -2,6 +2,15 @@ import os
 import subprocess
 import re
 
+from bootstrap import create_traditional_project
+from pipeline import has_checkpoints
+from settings_editor import SettingsEditor, Raw
+from performance_profile import apply_profile_and_benchmark
+from cache_scaffold import setup_app_caching
+from bulk_load_scaffold import scaffold_bulk_load
+from async_scaffold import setup_app_async
+from query_inspector import inspector_installed, setup_query_inspector
+
 def validate_name(name, name_type="project"):
     """Validate project or app names."""
     if not name:
@@ -18,44 +27,16 @@ def validate_name(name, name_type="project"):
     if name.lower() in python_keywords:
         raise ValueError(f"'{name}' is a common conflict name")
 
-def create_traditional_project(project_path, project_name):
-    """Create a traditional Django project structure with virtual environment."""
-    try:
-        venv_path = os.path.join(project_path, 'venv')
-
-        # Create virtual environment
-        subprocess.run(f"python -m venv {venv_path}", shell=True, check=True)
-
-        # Install Django inside the venv
-        install_cmd = f"""
-        source {os.path.join(venv_path, 'bin/activate')} && \
-        pip install django && \
-        deactivate
-        """
-        subprocess.run(install_cmd, shell=True, executable='/bin/bash', check=True)
-
-        # Create Django project inside project_path
-        create_cmd = f"""
-        cd {project_path} && \
-        source {os.path.join(venv_path, 'bin/activate')} && \
-        django-admin startproject {project_name} . && \
-        deactivate
-        """
-        subprocess.run(create_cmd, shell=True, executable='/bin/bash', check=True)
-
-        # Run migrations to create db.sqlite3
-        migrate_cmd = f"""
-        cd {project_path} && \
-        source {os.path.join(venv_path, 'bin/activate')} && \
-        python manage.py migrate && \
-        deactivate
-        """
-        subprocess.run(migrate_cmd, shell=True, executable='/bin/bash', check=True)
+def add_installed_app(settings_path, app_name, position=None, editor=None):
+    """Insert app_name into INSTALLED_APPS (at the end unless position is given).
 
-        return True
-    except subprocess.CalledProcessError as e:
-        print(f"❌ Error during setup: {e}")
-        return False
+    Pass a SettingsEditor to batch this with other edits; the caller saves it.
+    """
+    if editor is None:
+        with SettingsEditor(settings_path) as editor:
+            return add_installed_app(settings_path, app_name, position, editor)
+    editor.add_installed_app(app_name, position)
+    return True
 
 def add_app_to_project(project_path, project_name):
     print("\n" + "="*40)
@@ -103,37 +84,7 @@ def add_app_to_project(project_path, project_name):
             print(f"❌ settings.py not found at {settings_path}. Cannot update INSTALLED_APPS.")
             return
 
-        with open(settings_path, 'r') as f:
-            lines = f.readlines()
-
-        # Find INSTALLED_APPS block
-        start_idx = -1
-        end_idx = -1
-        for i, line in enumerate(lines):
-            if re.match(r'^\s*INSTALLED_APPS\s*=\s*\[', line):
-                start_idx = i
-                break
-
-        if start_idx == -1:
-            print("❌ Could not find INSTALLED_APPS in settings.py")
-            return
-
-        # Find closing bracket of INSTALLED_APPS
-        for j in range(start_idx, len(lines)):
-            if ']' in lines[j]:
-                end_idx = j
-                break
-
-        if end_idx == -1:
-            print("❌ Could not find the end of INSTALLED_APPS list in settings.py")
-            return
-
-        # Extract current apps inside INSTALLED_APPS
-        current_apps = []
-        for k in range(start_idx+1, end_idx):
-            app_line = lines[k].strip().strip(',').strip("'\"")
-            if app_line:
-                current_apps.append(app_line)
+        current_apps = SettingsEditor(settings_path).installed_apps()
 
         print("\nCurrent apps in INSTALLED_APPS:")
         for idx, app in enumerate(current_apps, 1):
@@ -165,82 +116,47 @@ def add_app_to_project(project_path, project_name):
         else:
             position = 0
 
-        # Insert the new app
-        current_apps.insert(position, app_name)
+        add_installed_app(settings_path, app_name, position)
+
+        print(f"\n✅ Added '{app_name}' to INSTALLED_APPS in settings.py")
 
-        # Rebuild INSTALLED_APPS block lines
-        new_installed_apps_lines = ['INSTALLED_APPS = [\n']
-        for app in current_apps:
-            new_installed_apps_lines.append(f"    '{app}',\n")
-        new_installed_apps_lines.append(']\n')
+        if input(f"\nSet up caching (CACHES, cached views, fragments) for '{app_name}'? (y/n) [n]: ").strip().lower() == 'y':
+            setup_app_caching(project_path, project_name, app_name)
 
-        # Replace old INSTALLED_APPS block
-        lines = lines[:start_idx] + new_installed_apps_lines + lines[end_idx+1:]
+        if input(f"Add a bulk_load command for fast CSV imports to '{app_name}'? (y/n) [n]: ").strip().lower() == 'y':
+            scaffold_bulk_load(project_path, app_name)
 
-        with open(settings_path, 'w') as f:
-            f.writelines(lines)
+        if input(f"Add async views (async ORM, non-blocking I/O, ASGI) to '{app_name}'? (y/n) [n]: ").strip().lower() == 'y':
+            setup_app_async(project_path, project_name, app_name)
 
-        print(f"\n✅ Added '{app_name}' to INSTALLED_APPS in settings.py")
+        if not inspector_installed(project_path, project_name) and input(
+                "Install the query inspector (query counts, N+1 detection, query budgets in tests)? (y/n) [n]: "
+        ).strip().lower() == 'y':
+            setup_query_inspector(project_path, project_name)
 
     except subprocess.CalledProcessError as e:
         print(f"\n❌ Failed to create app: {e}")
+    except SyntaxError as e:
+        print(f"\n❌ Could not parse settings.py: {e}")
 
 
-def update_dirs_in_templates(settings_path, app_name=None):
-    """Update the TEMPLATES DIRS setting in Django settings.py without creating folders and without duplicates."""
-    with open(settings_path, 'r') as f:
-        content = f.read()
+def update_dirs_in_templates(settings_path, app_name=None, editor=None):
+    """Update the TEMPLATES DIRS setting in Django settings.py without creating folders and without duplicates.
 
-    # Ensure 'import os' exists at the top
-    if not re.search(r'^import\s+os\s*$', content, re.MULTILINE):
-        content = 'import os\n' + content
+    Pass a SettingsEditor to batch this with other edits; the caller saves it.
+    """
+    if editor is None:
+        with SettingsEditor(settings_path) as editor:
+            return update_dirs_in_templates(settings_path, app_name, editor)
 
-    # Regex pattern to find the DIRS list inside TEMPLATES
-    templates_pattern = re.compile(
-        r'(TEMPLATES\s*=\s*\[\s*\{[^}]*?["\']DIRS["\']\s*:\s*\[)([^\]]*)(\])',
-        re.DOTALL
-    )
+    editor.ensure_import('import os')
 
     # Build the DIRS path
     if app_name:
-        new_dir = f"os.path.join(BASE_DIR, '{app_name}', 'templates')"
-    else:
-        new_dir = "os.path.join(BASE_DIR, 'templates')"
-
-    if templates_pattern.search(content):
-        def replace_dirs(match):
-            existing_dirs = match.group(2).strip()
-            if existing_dirs:
-                existing_list = [dir.strip() for dir in existing_dirs.split(',') if dir.strip()]
-            else:
-                existing_list = []
-
-            if new_dir not in existing_list:
-                existing_list.append(new_dir)
-
-            return f"{match.group(1)} {', '.join(existing_list)} {match.group(3)}"
-
-        new_content = templates_pattern.sub(replace_dirs, content)
+        new_dir = Raw(f"os.path.join(BASE_DIR, '{app_name}', 'templates')")
     else:
-        # Add new TEMPLATES block if not found
-        new_content = content.replace(
-            'TEMPLATES = [',
-            'TEMPLATES = [\n    {\n        "BACKEND": "django.template.backends.django.DjangoTemplates",\n'
-            f'        "DIRS": [{new_dir}],\n'
-            '        "APP_DIRS": True,\n'
-            '        "OPTIONS": {\n'
-            '            "context_processors": [\n'
-            '                "django.template.context_processors.debug",\n'
-            '                "django.template.context_processors.request",\n'
-            '                "django.contrib.auth.context_processors.auth",\n'
-            '                "django.contrib.messages.context_processors.messages",\n'
-            '            ],\n'
-            '        },\n'
-            '    },'
-        )
-
-    with open(settings_path, 'w') as f:
-        f.write(new_content)
+        new_dir = Raw("os.path.join(BASE_DIR, 'templates')")
+    editor.add_template_dir(new_dir)
 
     print("✅ Successfully updated TEMPLATES DIRS configuration (no duplicates)")
     return True
@@ -257,9 +173,11 @@ def main():
         print("1. Create a new Django project")
         print("2. Add a new app to an existing Django project")
         print("3. Add templates folder and configure settings.py")
-        print("4. Exit")
+        print("4. Provision projects from a manifest (batch mode)")
+        print("5. Apply performance profile (with before/after benchmark)")
+        print("6. Exit")
 
-        choice = input("Enter your choice (1/2/3/4): ").strip()
+        choice = input("Enter your choice (1/2/3/4/5/6): ").strip()
 
         if choice == '1':
             # Create new project flow
@@ -299,10 +217,16 @@ def main():
             try:
                 os.makedirs(project_path, exist_ok=False)
             except FileExistsError:
-                print(f"❌ Project folder already exists: {project_path}")
-                continue
+                # A folder left by a failed bootstrap is resumed instead of rejected
+                if not has_checkpoints(project_path):
+                    print(f"❌ Project folder already exists: {project_path}")
+                    continue
+                print(f"♻️ Resuming unfinished bootstrap in {project_path}")
+
+            use_golden = input("Clone from golden snapshot for fast creation? (y/n) [y]: ").strip().lower() != 'n'
+            tune_sqlite = input("Tune SQLite for concurrent access (WAL, busy_timeout)? (y/n) [n]: ").strip().lower() == 'y'
 
-            if create_traditional_project(project_path, project_name):
+            if create_traditional_project(project_path, project_name, golden=use_golden, sqlite_tuning=tune_sqlite):
                 print(f"\n✅ Project created at:\n{project_path}")
                 print("Next steps:")
                 print(f"cd {project_path}")
@@ -354,10 +278,28 @@ def main():
                 print(f"✅ Created app templates folder at: {app_templates_path}")
 
         elif choice == '4':
+            # Batch mode: imported here because batch_provision imports this module
+            from batch_provision import provision_from_manifest
+
+            manifest_path = input("\nEnter path to manifest (.json/.yaml): ").strip()
+            if not os.path.exists(manifest_path):
+                print(f"❌ Manifest not found: {manifest_path}")
+                continue
+            provision_from_manifest(manifest_path)
+
+        elif choice == '5':
+            project_path = input("\nEnter full path to your Django project (where manage.py is): ").strip()
+            project_path = os.path.normpath(project_path)
+
+            project_name = input("Enter your Django project name (folder inside project path): ").strip()
+
+            apply_profile_and_benchmark(project_path, project_name)
+
+        elif choice == '6':
             print("Goodbye!")
             break
         else:
-            print("Invalid choice. Please select 1, 2, 3 or 4.")
+            print("Invalid choice. Please select 1, 2, 3, 4, 5 or 6.")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,189 @@
+import os
+import subprocess
+
+from settings_editor import SettingsEditor, Raw
+from venv_introspect import find_venv, ensure_packages
+from cache_scaffold import include_app_urls
+from load_test import run_load_test
+
+# Async option for new apps: async views using the async ORM (aget, acount,
+# async for over a queryset), a non-blocking outbound HTTP fan-out with httpx,
+# and a pair of I/O-bound endpoints (blocking vs awaiting) to benchmark under
+# the project's ASGI entry point (<project>/asgi.py served by uvicorn).
+
+IO_DELAY = 0.1  # seconds of simulated upstream latency per request
+BENCH_CONCURRENCY = 50
+BENCH_DURATION = 5.0
+
+ASGI_PY = '''"""
+ASGI config for {project} project.
+
+It exposes the ASGI callable as a module-level variable named ``application``.
+"""
+
+import os
+
+from django.core.asgi import get_asgi_application
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', '{project}.settings')
+
+application = get_asgi_application()
+'''
+
+ASYNC_VIEWS_MARKER = "# --- Async views (generated by async_scaffold.py)"
+
+ASYNC_VIEWS_PY = '''
+
+# --- Async views (generated by async_scaffold.py) ----------------------------
+# Under ASGI these run on the event loop: while one awaits the database or an
+# upstream service, the same worker serves other requests. Sync views still
+# work but each runs in a thread, one at a time by default.
+import asyncio
+import time
+
+import httpx
+from django.contrib.auth import get_user_model
+from django.http import JsonResponse
+from django.urls import reverse
+
+IO_DELAY = {delay}  # simulated upstream latency (seconds)
+
+def sync_io(request):
+    """I/O-bound and blocking: the worker (or ASGI thread) is stuck while it waits"""
+    time.sleep(IO_DELAY)
+    return JsonResponse({{'mode': 'sync', 'waited': IO_DELAY}})
+
+async def async_io(request):
+    """The same wait, awaited: other requests run in the meantime"""
+    await asyncio.sleep(IO_DELAY)
+    return JsonResponse({{'mode': 'async', 'waited': IO_DELAY}})
+
+async def async_users(request):
+    """Async ORM: acount(), async iteration over a queryset and aget()"""
+    User = get_user_model()
+    total = await User.objects.acount()
+    recent = [
+        {{'id': user.pk, 'username': user.get_username()}}
+        async for user in User.objects.filter(is_active=True).order_by('-pk')[:20]
+    ]
+    newest = None
+    if recent:
+        user = await User.objects.aget(pk=recent[0]['id'])
+        newest = user.get_username()
+    return JsonResponse({{'total': total, 'recent': recent, 'newest': newest}})
+
+async def async_fanout(request):
+    """Non-blocking outbound I/O: call several upstreams concurrently"""
+    # Only this app's own endpoint: request-supplied URLs would let anyone
+    # make the server fetch arbitrary (internal) addresses
+    urls = [request.build_absolute_uri(reverse('{app}:async_io')) for _ in range(5)]
+    started = time.perf_counter()
+    async with httpx.AsyncClient(timeout=5) as client:
+        responses = await asyncio.gather(*(client.get(url) for url in urls), return_exceptions=True)
+    return JsonResponse({{
+        'calls': len(urls),
+        'seconds': round(time.perf_counter() - started, 3),  # about one call's latency, not the sum
+        'statuses': [getattr(response, 'status_code', repr(response)) for response in responses],
+    }})
+'''
+
+URLS_PY = '''from django.urls import path
+
+from . import views
+
+app_name = '{app}'
+
+urlpatterns = [
+]
+'''
+
+ASYNC_ROUTES = [
+    ('io/sync/', 'sync_io'),
+    ('io/async/', 'async_io'),
+    ('async/users/', 'async_users'),
+    ('async/fanout/', 'async_fanout'),
+]
+
+def ensure_asgi_entry(project_path, project_name):
+    """Make sure <project>/asgi.py exists (projects older than Django 3.0 lack it)"""
+    asgi_path = os.path.join(project_path, project_name, 'asgi.py')
+    if os.path.exists(asgi_path):
+        return False
+    with open(asgi_path, 'w') as f:
+        f.write(ASGI_PY.format(project=project_name))
+    return True
+
+def scaffold_app_async(project_path, project_name, app_name):
+    """Add the async views and routes to an app and wire the ASGI server"""
+    app_path = os.path.join(project_path, app_name)
+    ensure_packages(find_venv(project_path), ['httpx', 'uvicorn'])
+    ensure_asgi_entry(project_path, project_name)
+
+    views_path = os.path.join(app_path, 'views.py')
+    scaffolded = False
+    if os.path.exists(views_path):
+        with open(views_path) as f:
+            scaffolded = ASYNC_VIEWS_MARKER in f.read()
+    # Once only: a second run would redefine the views and repeat the imports
+    if not scaffolded:
+        with open(views_path, 'a') as f:
+            f.write(ASYNC_VIEWS_PY.format(app=app_name, delay=IO_DELAY))
+
+    urls_path = os.path.join(app_path, 'urls.py')
+    if not os.path.exists(urls_path):
+        with open(urls_path, 'w') as f:
+            f.write(URLS_PY.format(app=app_name))
+    with SettingsEditor(urls_path) as editor:
+        patterns = editor.setdefault('urlpatterns', [])
+        for route, view in ASYNC_ROUTES:
+            pattern = Raw(f"path('{route}', views.{view}, name='{view}')")
+            if pattern not in patterns:
+                patterns.append(pattern)
+
+    with SettingsEditor(os.path.join(project_path, project_name, 'settings.py')) as editor:
+        editor.add_installed_app(app_name)
+    include_app_urls(project_path, project_name, app_name)
+
+BENCH_RUNS = [
+    # (label, endpoint, server)
+    ("sync / gunicorn", 'sync', 'gunicorn'),    # classic WSGI: one request per worker process
+    ("sync / uvicorn", 'sync', 'uvicorn'),      # ASGI runs sync views in threads
+    ("async / uvicorn", 'async', 'uvicorn'),    # awaited on the event loop
+]
+
+def benchmark_sync_vs_async(project_path, project_name, app_name,
+                            concurrency=BENCH_CONCURRENCY, duration=BENCH_DURATION):
+    """Throughput of the blocking vs awaiting endpoint, same number of processes for each"""
+    workers = os.cpu_count() or 1
+    results = {}
+    for label, mode, server in BENCH_RUNS:
+        if server == 'gunicorn' and os.name == 'nt':
+            continue
+        report = run_load_test(project_path, project_name, [f"/{app_name}/io/{mode}/"], concurrency,
+                               duration, server=server, workers=workers, warmup=1.0)
+        results[label] = report['total']
+
+    print(f"\n{'Endpoint / server':<20}{'Req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'Errors':>9}")
+    print("-" * 59)
+    for label, result in results.items():
+        print(f"{label:<20}{result['rps']:>10}{result.get('p50_ms', '-'):>10}{result.get('p95_ms', '-'):>10}"
+              f"{result['error_rate'] * 100:>8.1f}%")
+    print(f"\n{workers} worker process(es), {concurrency} concurrent clients, "
+          f"{IO_DELAY * 1000:.0f} ms of I/O per request")
+    return results
+
+def setup_app_async(project_path, project_name, app_name):
+    """Interactive: scaffold async views into app_name and offer the benchmark"""
+    try:
+        scaffold_app_async(project_path, project_name, app_name)
+    except (OSError, SyntaxError, subprocess.CalledProcessError) as e:
+        print(f"❌ Could not add async views: {e}")
+        return
+    print(f"✅ Async views added to '{app_name}':")
+    print(f"   /{app_name}/async/users/   async ORM (acount, async for, aget)")
+    print(f"   /{app_name}/async/fanout/  concurrent outbound HTTP with httpx")
+    print(f"   /{app_name}/io/sync/ and /{app_name}/io/async/  blocking vs awaiting I/O")
+    print(f"   Serve with ASGI: python server_runner.py uvicorn {project_path} {project_name}")
+
+    if input("Benchmark sync vs async I/O under concurrency now? (y/n) [n]: ").strip().lower() == 'y':
+        benchmark_sync_vs_async(project_path, project_name, app_name)
@@ -2,6 +2,11 @@ import os
 import subprocess
 import re
 
+from cache_scaffold import setup_app_caching
+from bulk_load_scaffold import scaffold_bulk_load
+from async_scaffold import setup_app_async
+from query_inspector import inspector_installed, setup_query_inspector
+
 def is_valid_name(name, name_type="app"):
     """Validate project or app names"""
     if not name:
@@ -66,9 +71,31 @@ def create_django_app():
         print(f"\n✅ Successfully created '{app_name}' in project '{project_name}'!")
         print(f"📍 Location: {app_path}")
         
-        print("\nNext steps:")
-        print(f"1. Add '{app_name}' to INSTALLED_APPS in {project_name}/settings.py")
-        print(f"2. Create your models in {app_name}/models.py")
+        # Caching first: it only adds its views when it creates the app's urls.py
+        caching = input(f"\n➤ Set up caching (CACHES, cached views, fragments) for '{app_name}'? (y/n) [n]: ").strip().lower() == 'y'
+        if caching:
+            # Also adds the app to INSTALLED_APPS, which its templates need
+            setup_app_caching(project_path, project_name, app_name)
+
+        if input(f"\n➤ Add a bulk_load command for fast CSV imports to '{app_name}'? (y/n) [n]: ").strip().lower() == 'y':
+            scaffold_bulk_load(project_path, app_name)
+
+        use_async = input(f"\n➤ Add async views (async ORM, non-blocking I/O, ASGI) to '{app_name}'? (y/n) [n]: ").strip().lower() == 'y'
+        if use_async:
+            setup_app_async(project_path, project_name, app_name)
+
+        if not inspector_installed(project_path, project_name) and input(
+                "\n➤ Install the query inspector (query counts, N+1 detection, query budgets in tests)? (y/n) [n]: "
+        ).strip().lower() == 'y':
+            setup_query_inspector(project_path, project_name)
+
+        if caching or use_async:
+            print("\nNext steps:")
+            print(f"1. Create your models in {app_name}/models.py")
+        else:
+            print("\nNext steps:")
+            print(f"1. Add '{app_name}' to INSTALLED_APPS in {project_name}/settings.py")
+            print(f"2. Create your models in {app_name}/models.py")
         
     except subprocess.CalledProcessError as e:
         print(f"\n❌ Failed to create app: {e}")
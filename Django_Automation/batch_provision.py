@@ -0,0 +1,213 @@
+import os
+import sys
+import json
+import time
+import subprocess
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from bootstrap import create_traditional_project
+from pipeline import has_checkpoints
+from wheelhouse import resolve_lock
+from settings_editor import SettingsEditor
+from performance_profile import apply_profile
+from venv_introspect import find_venv, installed_version, version_tuple
+from app_after_project import validate_name, update_dirs_in_templates
+from create_superuser import create_or_update_superuser, shutdown_workers
+
+# Manifest format (JSON, or YAML when PyYAML is installed):
+#
+# {
+#   "defaults": {"base_path": "/abs/folder", "golden": true, "django_version": null},
+#   "projects": [
+#     {
+#       "name": "shop",
+#       "apps": ["catalog", "orders"],
+#       "template_dirs": [".", "catalog"],      # "." = project-level templates/
+#       "performance_profile": true,            # see performance_profile.py
+#       "sqlite_tuning": true,                  # WAL etc., see sqlite_tuning.py
+#       "superusers": [{"username": "admin", "email": "", "password": "secret"}]
+#     }
+#   ]
+# }
+
+def load_manifest(manifest_path):
+    with open(manifest_path, 'r') as f:
+        if manifest_path.endswith(('.yml', '.yaml')):
+            try:
+                import yaml
+            except ImportError:
+                raise ValueError("PyYAML is not installed - use a .json manifest or `pip install pyyaml`")
+            manifest = yaml.safe_load(f)
+        else:
+            manifest = json.load(f)
+
+    defaults = manifest.get('defaults', {})
+    projects = []
+    for entry in manifest.get('projects', []):
+        spec = {**defaults, **entry}
+        validate_name(spec.get('name', ''))
+        for app_name in spec.get('apps', []):
+            validate_name(app_name, "app")
+        if not spec.get('base_path') or not os.path.isabs(spec['base_path']):
+            raise ValueError(f"Project '{spec['name']}' needs an absolute base_path")
+        projects.append(spec)
+
+    names = [spec['name'] for spec in projects]
+    duplicates = {name for name in names if names.count(name) > 1}
+    if duplicates:
+        raise ValueError(f"Duplicate project names in manifest: {', '.join(sorted(duplicates))}")
+    return projects
+
+def _provision(spec, timings):
+    project_name = spec['name']
+    project_path = os.path.join(spec['base_path'], project_name)
+    settings_path = os.path.join(project_path, project_name, 'settings.py')
+
+    def step(name, func, *args, **kwargs):
+        started = time.perf_counter()
+        result = func(*args, **kwargs)
+        timings[name] = round(time.perf_counter() - started, 3)
+        if result is False:
+            raise RuntimeError(f"step '{name}' failed")
+
+    if not has_checkpoints(project_path):
+        os.makedirs(project_path, exist_ok=False)
+    # Apps are created in parallel inside the bootstrap step graph
+    step('create_project', create_traditional_project, project_path, project_name,
+         spec.get('django_version'), spec.get('golden', True), spec.get('apps', ()), timings,
+         spec.get('sqlite_tuning', False))
+
+    def configure_templates():
+        # All template dirs in one settings.py parse and write
+        with SettingsEditor(settings_path) as editor:
+            for template_dir in spec['template_dirs']:
+                app_name = None if template_dir in ('', '.') else template_dir
+                os.makedirs(os.path.join(project_path, app_name or '', 'templates'), exist_ok=True)
+                update_dirs_in_templates(settings_path, app_name, editor)
+
+    if spec.get('template_dirs'):
+        step('templates', configure_templates)
+
+    if spec.get('performance_profile'):
+        django_version = installed_version(find_venv(project_path), 'Django')
+        step('performance_profile', apply_profile, settings_path, version_tuple(django_version))
+
+    try:
+        for user in spec.get('superusers', []):
+            step(f"superuser:{user['username']}", create_or_update_superuser, project_path, project_name,
+                 user['username'], user.get('email', ''), user['password'])
+    finally:
+        shutdown_workers()
+
+def provision_project(spec):
+    """Provision one manifest entry; output goes to <project>/provision.log"""
+    started = time.perf_counter()
+    timings = {}
+    result = {'name': spec['name'], 'ok': False, 'error': None, 'timings': timings}
+
+    log_path = os.path.join(spec['base_path'], f".{spec['name']}.provision.log")
+    saved_fds = (os.dup(1), os.dup(2))
+    try:
+        # Route this process's prints and child-process output to the log so
+        # parallel projects don't interleave on the console.
+        with open(log_path, 'w') as log:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os.dup2(log.fileno(), 1)
+            os.dup2(log.fileno(), 2)
+            try:
+                _provision(spec, timings)
+                result['ok'] = True
+            except Exception as e:
+                result['error'] = str(e) or e.__class__.__name__
+            finally:
+                sys.stdout.flush()
+                sys.stderr.flush()
+    finally:
+        os.dup2(saved_fds[0], 1)
+        os.dup2(saved_fds[1], 2)
+        os.close(saved_fds[0])
+        os.close(saved_fds[1])
+
+    # Move the log into the project folder, unless that folder wasn't ours
+    if 'create_project' in timings:
+        project_log = os.path.join(spec['base_path'], spec['name'], 'provision.log')
+        os.replace(log_path, project_log)
+        log_path = project_log
+    result['log'] = log_path
+    result['seconds'] = round(time.perf_counter() - started, 3)
+    return result
+
+def provision_from_manifest(manifest_path, max_workers=None):
+    """Provision every project in the manifest on a bounded process pool"""
+    try:
+        projects = load_manifest(manifest_path)
+    except (OSError, ValueError) as e:
+        print(f"❌ Invalid manifest: {e}")
+        return []
+
+    if not projects:
+        print("ℹ️ Manifest has no projects.")
+        return []
+
+    for spec in projects:
+        os.makedirs(spec['base_path'], exist_ok=True)
+
+    # Lock each Django version here, once, so workers never fill the
+    # wheelhouse concurrently; they get the resolved version pinned.
+    resolved = {}
+    try:
+        for spec in projects:
+            requested = spec.get('django_version')
+            if requested not in resolved:
+                resolved[requested], _ = resolve_lock(requested)
+            spec['django_version'] = resolved[requested]
+    except (OSError, RuntimeError, subprocess.CalledProcessError) as e:
+        print(f"❌ Could not prepare the wheelhouse: {e}")
+        return []
+
+    max_workers = max_workers or min(len(projects), os.cpu_count() or 1)
+    print(f"\n🚀 Provisioning {len(projects)} projects with {max_workers} workers...")
+
+    started = time.perf_counter()
+    results = []
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = {pool.submit(provision_project, spec): spec for spec in projects}
+        for future in as_completed(futures):
+            spec = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                result = {'name': spec['name'], 'ok': False, 'error': str(e), 'timings': {}, 'seconds': 0.0}
+            results.append(result)
+            print(f"{'✅' if result['ok'] else '❌'} {result['name']} ({result['seconds']:.1f}s)")
+
+    total = time.perf_counter() - started
+    print("\n" + "="*60)
+    print(f"{'Project':<24}{'Status':<10}{'Time':>10}  Slowest step")
+    print("-"*60)
+    for result in sorted(results, key=lambda r: r['name']):
+        slowest = max(result['timings'].items(), key=lambda item: item[1], default=('-', 0))
+        status = 'ok' if result['ok'] else 'FAILED'
+        print(f"{result['name']:<24}{status:<10}{result['seconds']:>9.1f}s  {slowest[0]} ({slowest[1]:.1f}s)")
+    print("="*60)
+
+    failures = [r for r in results if not r['ok']]
+    for result in failures:
+        print(f"❌ {result['name']}: {result['error']} (log: {result.get('log', 'n/a')})")
+    print(f"\n⏱️ {len(results) - len(failures)}/{len(results)} projects provisioned in {total:.1f}s")
+    return results
+
+def main():
+    print("\n" + "="*50)
+    print("Django Batch Project Provisioner".center(50))
+    print("="*50)
+
+    manifest_path = sys.argv[1] if len(sys.argv) > 1 else input("\nEnter path to manifest (.json/.yaml): ").strip()
+    if not os.path.exists(manifest_path):
+        print(f"❌ Manifest not found: {manifest_path}")
+        return
+    provision_from_manifest(manifest_path)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+import os
+import sys
+import time
+import shutil
+import hashlib
+import subprocess
+
+from wheelhouse import resolve_lock, install_from_lock
+from package_store import link_venv
+from venv_introspect import venv_python
+from settings_editor import SettingsEditor
+from sqlite_tuning import apply_tuning
+from pipeline import Step, PipelineError, CheckpointStore, run_steps, critical_path_seconds
+
+def _file_digest(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def _migration_inputs(project_path, settings_path):
+    """Fingerprint inputs for migrate: settings plus every migration file in the project"""
+    migrations = []
+    for root, dirs, files in os.walk(project_path):
+        dirs[:] = [d for d in dirs if d not in ('venv', '.venv', 'env', '.bootstrap', '__pycache__')]
+        if os.path.basename(root) == 'migrations':
+            for name in sorted(files):
+                if name.endswith('.py'):
+                    path = os.path.join(root, name)
+                    migrations.append([os.path.relpath(path, project_path), _file_digest(path)])
+    return [_file_digest(settings_path), sorted(migrations)]
+
+def bootstrap_steps(project_path, project_name, django_version=None, golden=False, apps=(), sqlite_tuning=False,
+                    checkpoints=None):
+    """Build the bootstrap step graph.
+
+    Every step calls the venv interpreter directly instead of sourcing
+    `activate` in a shell, and independent steps (venv creation and wheel
+    resolution, `startapp` for each app, linking into the package store)
+    overlap.
+    """
+    venv_path = os.path.join(project_path, 'venv')
+    python_path = venv_python(venv_path)
+    manage_py = os.path.join(project_path, 'manage.py')
+    settings_path = os.path.join(project_path, project_name, 'settings.py')
+    lock = {}
+
+    def run(*args):
+        subprocess.run(list(args), cwd=project_path, check=True)
+
+    def resolve_wheels():
+        lock['version'], lock['path'] = resolve_lock(django_version)
+
+    def install_django():
+        install_from_lock(python_path, lock['path'])
+        print(f"📦 Installed Django {lock['version']} from local wheelhouse")
+
+    def clone():
+        from golden import clone_golden
+        targets = [venv_path, os.path.join(project_path, project_name), manage_py,
+                   os.path.join(project_path, 'db.sqlite3')]
+        # Clear only what an earlier, interrupted clone of this bootstrap created
+        if checkpoints is not None:
+            for leftover in checkpoints.created_paths('clone'):
+                if os.path.isdir(leftover) and not os.path.islink(leftover):
+                    shutil.rmtree(leftover, ignore_errors=True)
+                elif os.path.lexists(leftover):
+                    os.remove(leftover)
+        existing = [path for path in targets if os.path.lexists(path)]
+        if existing:
+            raise FileExistsError(f"not cloning over existing {', '.join(map(os.path.basename, existing))}")
+        if checkpoints is not None:
+            checkpoints.record_created('clone', targets)
+        installed_version = clone_golden(project_path, project_name, django_version)
+        print(f"⚡ Cloned project from golden snapshot (Django {installed_version})")
+
+    def register_apps():
+        # Imported here because app_after_project imports this module
+        from app_after_project import add_installed_app
+        # One parse and one write for all apps
+        with SettingsEditor(settings_path) as editor:
+            for app_name in apps:
+                add_installed_app(settings_path, app_name, editor=editor)
+
+    # Steps with `inputs` are checkpointed so a rerun resumes at the first dirty step
+    if golden:
+        steps = [Step('clone', clone,
+                      inputs=lambda: [project_name, django_version],
+                      outputs=[manage_py, settings_path, python_path])]
+        project_ready = 'clone'
+    else:
+        steps = [
+            Step('venv', lambda: run(sys.executable, '-m', 'venv', venv_path),
+                 inputs=lambda: [sys.executable, sys.version], outputs=[python_path]),
+            Step('wheels', resolve_wheels),
+            Step('install', install_django, requires=['venv', 'wheels'],
+                 inputs=lambda: [_file_digest(lock['path'])]),
+            # Share identical package files with every other project venv
+            Step('link_store', lambda: link_venv(venv_path), requires=['install']),
+            Step('startproject', lambda: run(python_path, '-m', 'django', 'startproject', project_name, project_path),
+                 requires=['install'], inputs=lambda: [project_name], outputs=[manage_py, settings_path]),
+        ]
+        project_ready = 'startproject'
+
+    for app_name in apps:
+        steps.append(Step(f'startapp:{app_name}',
+                          lambda app_name=app_name: run(python_path, manage_py, 'startapp', app_name),
+                          requires=[project_ready], inputs=lambda app_name=app_name: [app_name],
+                          outputs=[os.path.join(project_path, app_name, 'apps.py')]))
+    if apps:
+        steps.append(Step('register_apps', register_apps,
+                          requires=[f'startapp:{app_name}' for app_name in apps]))
+
+    settings_ready = 'register_apps' if apps else project_ready
+    if sqlite_tuning:
+        # Before migrate, so db.sqlite3 is created in WAL mode
+        steps.append(Step('sqlite_tuning', lambda: apply_tuning(project_path, project_name),
+                          requires=[settings_ready]))
+        settings_ready = 'sqlite_tuning'
+
+    # Run migrations to create db.sqlite3 (a golden clone ships it migrated)
+    if not golden:
+        steps.append(Step('migrate', lambda: run(python_path, manage_py, 'migrate', '--noinput'),
+                          requires=[settings_ready],
+                          inputs=lambda: _migration_inputs(project_path, settings_path),
+                          outputs=[os.path.join(project_path, 'db.sqlite3')]))
+    return steps
+
+def create_traditional_project(project_path, project_name, django_version=None, golden=False, apps=(), timings=None,
+                               sqlite_tuning=False):
+    """Create a traditional Django project structure with virtual environment.
+
+    Django is installed from the local wheelhouse using the hash-checked
+    lockfile for `django_version` (newest locked version by default), so no
+    network access is needed once the wheelhouse has been filled.
+
+    With golden=True the project is cloned from a pre-migrated golden
+    snapshot instead of being bootstrapped step by step. `apps` are created
+    in parallel and added to INSTALLED_APPS. sqlite_tuning=True applies the
+    WAL/busy_timeout connection settings from sqlite_tuning.py.
+
+    Completed steps are checkpointed in <project>/.bootstrap, so calling this
+    again on a folder where bootstrap failed resumes from the first step whose
+    inputs changed or that never finished. A finished bootstrap is marked
+    complete and never resumed.
+    """
+    checkpoints = CheckpointStore(project_path)
+    if checkpoints.complete:
+        print(f"❌ {project_path} already holds a finished project; not bootstrapping over it")
+        return False
+    checkpoints.mark_started()
+    steps = bootstrap_steps(project_path, project_name, django_version, golden, apps, sqlite_tuning, checkpoints)
+    timings = {} if timings is None else timings
+    started = time.perf_counter()
+    try:
+        run_steps(steps, timings=timings, checkpoints=checkpoints)
+    except PipelineError as e:
+        print(f"❌ Error during setup: {e}")
+        return False
+    checkpoints.mark_complete()
+
+    print(f"⏱️ Bootstrap took {time.perf_counter() - started:.1f}s "
+          f"(critical path {critical_path_seconds(steps, timings):.1f}s, steps add up to {sum(timings.values()):.1f}s)")
+    return True
@@ -0,0 +1,201 @@
+import os
+import csv
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# Bulk user import/export. Runs inside the project venv (loaded by the Django
+# worker), so Django is importable here.
+#
+# Input/output is CSV or JSON Lines, chosen by file extension. Columns:
+# username, email, first_name, last_name, is_staff, is_superuser, is_active,
+# and either `password` (plain text, hashed here) or `password_hash` (an
+# already hashed value, e.g. from an export, stored as-is). Blank or missing
+# values leave an existing user's field unchanged.
+
+BOOL_FIELDS = ('is_staff', 'is_superuser', 'is_active')
+TEXT_FIELDS = ('email', 'first_name', 'last_name')
+
+def _init_hasher(settings_module):
+    # Forked workers inherit the configured Django; spawned ones set it up
+    import django
+    from django.conf import settings
+    if not settings.configured:
+        os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
+    django.setup()
+
+def _hash_passwords(passwords):
+    from django.contrib.auth.hashers import make_password
+    return [make_password(password) for password in passwords]
+
+def _read_rows(path):
+    with open(path, 'r', newline='', encoding='utf-8') as f:
+        if path.endswith('.jsonl'):
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield from csv.DictReader(f)
+
+def _validate_rows(path):
+    """Read the whole file once before writing anything, so a bad row can't leave a partial import"""
+    missing = [number for number, row in enumerate(_read_rows(path), 1) if not row.get('username')]
+    if missing:
+        shown = ', '.join(str(number) for number in missing[:10])
+        more = f" and {len(missing) - 10} more" if len(missing) > 10 else ""
+        raise ValueError(f"{len(missing)} rows without a username (rows {shown}{more}); nothing was imported")
+
+def _parse_bool(value):
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in ('1', 'true', 'yes', 'y', 't')
+
+def _batches(rows, batch_size):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+def _submit_hashing(pool, batch, workers):
+    """Hash the plain-text passwords of a batch on the pool; returns futures in order"""
+    plain = [row.get('password') or None for row in batch]
+    chunk = max(1, -(-len(plain) // workers))
+    return [pool.submit(_hash_passwords, plain[i:i + chunk]) for i in range(0, len(plain), chunk)]
+
+def _write_batch(User, batch, hashes, batch_size, supports_upsert):
+    from django.db import transaction
+
+    username_field = User.USERNAME_FIELD
+    # Rows are grouped by the fields they actually supply: a blank or absent
+    # value never overwrites what an existing user already has (it only sets
+    # the model default, or an unusable password, for new users)
+    groups = {}
+    for row, password_hash in zip(batch, hashes):
+        values = {username_field: row['username']}
+        supplied = set()
+        for field in TEXT_FIELDS:
+            if row.get(field):
+                values[field] = row[field]
+                supplied.add(field)
+        for field in BOOL_FIELDS:
+            if field in row and row[field] not in ('', None):
+                values[field] = _parse_bool(row[field])
+                supplied.add(field)
+        if row.get('password_hash'):
+            values['password'] = row['password_hash']
+            supplied.add('password')
+        else:
+            values['password'] = password_hash  # unusable password when the row has none
+            if row.get('password'):
+                supplied.add('password')
+        groups.setdefault(tuple(sorted(supplied)), []).append(User(**values))
+
+    with transaction.atomic():
+        for update_fields, objects in groups.items():
+            _upsert(User, objects, list(update_fields), batch_size, supports_upsert)
+
+def _upsert(User, objects, update_fields, batch_size, supports_upsert):
+    username_field = User.USERNAME_FIELD
+    if supports_upsert and update_fields:
+        User.objects.bulk_create(objects, batch_size=batch_size, update_conflicts=True,
+                                 unique_fields=[username_field], update_fields=update_fields)
+        return
+
+    # Older Django (or nothing to update): split into inserts and updates
+    names = [getattr(obj, username_field) for obj in objects]
+    existing = dict(User.objects.filter(**{f'{username_field}__in': names}).values_list(username_field, 'pk'))
+    new_objects = [obj for obj in objects if getattr(obj, username_field) not in existing]
+    User.objects.bulk_create(new_objects, batch_size=batch_size)
+    if update_fields:
+        updates = []
+        for obj in objects:
+            pk = existing.get(getattr(obj, username_field))
+            if pk is not None:
+                obj.pk = pk
+                updates.append(obj)
+        User.objects.bulk_update(updates, update_fields, batch_size=batch_size)
+
+def import_users(path, batch_size=1000, workers=None):
+    """Stream users from CSV/JSONL into the auth table, upserting by username.
+
+    Generator: yields a progress dict per batch, returns the final summary.
+    Password hashing (CPU-bound PBKDF2) for the next batch runs on a process
+    pool while the current batch is written.
+    """
+    import django
+    from django.conf import settings
+    from django.contrib.auth import get_user_model
+
+    User = get_user_model()
+    supports_upsert = django.VERSION >= (4, 1)
+    workers = workers or os.cpu_count() or 1
+    started = time.perf_counter()
+    total = 0
+    _validate_rows(path)
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_hasher,
+                             initargs=(os.environ.get('DJANGO_SETTINGS_MODULE', settings.SETTINGS_MODULE),)) as pool:
+        pending = None
+        for batch in _batches(_read_rows(path), batch_size):
+            futures = _submit_hashing(pool, batch, workers)
+            if pending is not None:
+                total += _finish_batch(User, pending, batch_size, supports_upsert)
+                yield _progress(total, started)
+            pending = (batch, futures)
+        if pending is not None:
+            total += _finish_batch(User, pending, batch_size, supports_upsert)
+
+    return _progress(total, started)
+
+def _finish_batch(User, pending, batch_size, supports_upsert):
+    batch, futures = pending
+    hashes = [password_hash for future in futures for password_hash in future.result()]
+    _write_batch(User, batch, hashes, batch_size, supports_upsert)
+    return len(batch)
+
+def _progress(rows, started):
+    seconds = time.perf_counter() - started
+    return {'rows': rows, 'seconds': round(seconds, 3), 'rows_per_sec': round(rows / seconds, 1) if seconds else 0.0}
+
+EXPORT_FIELDS = ('email', 'first_name', 'last_name', 'is_staff', 'is_superuser', 'is_active')
+
+def export_users(path, batch_size=2000, include_password_hashes=False):
+    """Stream the auth table to CSV/JSONL without loading it into memory.
+
+    Generator: yields progress every batch, returns the final summary.
+    Password hashes are left out unless include_password_hashes is set
+    (then they're exported as `password_hash`, which import stores as-is).
+    """
+    from django.contrib.auth import get_user_model
+
+    User = get_user_model()
+    columns = ['username', *EXPORT_FIELDS]
+    query_fields = [User.USERNAME_FIELD, *EXPORT_FIELDS]
+    if include_password_hashes:
+        columns.append('password_hash')
+        query_fields.append('password')
+    rows = User.objects.order_by('pk').values_list(*query_fields).iterator(chunk_size=batch_size)
+
+    started = time.perf_counter()
+    total = 0
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', newline='', encoding='utf-8') as f:
+        if path.endswith('.jsonl'):
+            def write(row):
+                f.write(json.dumps(dict(zip(columns, row))) + '\n')
+        else:
+            writer = csv.writer(f)
+            writer.writerow(columns)
+            write = writer.writerow
+
+        for row in rows:
+            write(row)
+            total += 1
+            if total % batch_size == 0:
+                yield _progress(total, started)
+    os.replace(tmp_path, path)
+    return _progress(total, started)
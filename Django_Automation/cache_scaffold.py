@@ -0,0 +1,284 @@
+import os
+import subprocess
+
+from settings_editor import SettingsEditor, Raw
+from venv_introspect import find_venv, venv_python, installed_version, version_tuple, ensure_packages
+
+# Cache setup for new apps: configures CACHES in settings.py and scaffolds
+# per-view caching, template fragment caching and cache-key versioning into
+# the app, plus a demo view that reports hit ratio and latency with and
+# without the cache.
+
+CACHE_TIMEOUT = 300
+DEFAULT_REDIS_URL = 'redis://127.0.0.1:6379/1'
+
+CACHE_BACKENDS = {
+    'locmem': "Local memory (per process, no setup)",
+    'file': "File-based (shared by processes on one machine)",
+    'db': "Database (creates the cache table)",
+    'redis': "Redis protocol (Redis, Valkey, KeyDB or a local stand-in)",
+}
+
+def cache_config(backend, project_name, django_version, location=None):
+    """CACHES['default'] for one of CACHE_BACKENDS"""
+    if backend == 'locmem':
+        config = {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': project_name}
+    elif backend == 'file':
+        config = {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+                  'LOCATION': location or Raw("os.path.join(BASE_DIR, 'cache')")}
+    elif backend == 'db':
+        config = {'BACKEND': 'django.core.cache.backends.db.DatabaseCache', 'LOCATION': location or 'django_cache'}
+    elif backend == 'redis':
+        # Built in since Django 4.0; older releases need django-redis
+        engine = ('django.core.cache.backends.redis.RedisCache' if django_version >= (4, 0)
+                  else 'django_redis.cache.RedisCache')
+        config = {'BACKEND': engine, 'LOCATION': location or DEFAULT_REDIS_URL}
+    else:
+        raise ValueError(f"Unknown cache backend '{backend}'")
+    # KEY_PREFIX keeps projects sharing a server apart; raising VERSION on
+    # deploy invalidates every key at once
+    config.update({'TIMEOUT': CACHE_TIMEOUT, 'KEY_PREFIX': project_name, 'VERSION': 1})
+    return config
+
+def configure_caches(project_path, project_name, backend, location=None):
+    """Point CACHES['default'] at backend and prepare what it needs (packages, cache table)"""
+    settings_path = os.path.join(project_path, project_name, 'settings.py')
+    venv_path = find_venv(project_path)
+    django_version = version_tuple(installed_version(venv_path, 'Django') or '0')
+
+    if backend == 'redis':
+        ensure_packages(venv_path, ['redis'] if django_version >= (4, 0) else ['django-redis'])
+
+    config = cache_config(backend, project_name, django_version, location)
+    with SettingsEditor(settings_path) as editor:
+        if backend == 'file':
+            editor.ensure_import('import os')
+        editor.setdefault('CACHES', {})['default'] = config
+
+    if backend == 'db':
+        subprocess.run([venv_python(venv_path), os.path.join(project_path, 'manage.py'), 'createcachetable'],
+                       cwd=project_path, check=True)
+    return config
+
+# --- App scaffolding ---------------------------------------------------------
+
+CACHE_KEYS_PY = '''from django.core.cache import cache
+
+# Namespaced cache keys. Each namespace has a version counter that is part of
+# every key in it, so bump_namespace() invalidates the whole namespace at once
+# (the old entries are never read again and simply expire).
+#
+# Reading the version is a cache round-trip of its own, so read it once per
+# request or view with key_builder() and build every key from that.
+#
+# For a single key use Django's own versioning: cache.set(key, value,
+# version=2) / cache.incr_version(key). To invalidate everything on deploy,
+# raise CACHES['default']['VERSION'] in settings.py.
+
+def _version_key(namespace):
+    return f"ns:{namespace}"
+
+def namespace_version(namespace):
+    return cache.get_or_set(_version_key(namespace), 1, timeout=None)
+
+def key_builder(namespace):
+    """make(*parts) for keys in namespace, with its version read once (make.version)"""
+    version = namespace_version(namespace)
+
+    def make(*parts):
+        return ":".join([namespace, f"v{version}", *map(str, parts)])
+    make.version = version
+    return make
+
+def make_key(namespace, *parts):
+    """One-off key; use key_builder() when building several"""
+    return key_builder(namespace)(*parts)
+
+def bump_namespace(namespace):
+    try:
+        return cache.incr(_version_key(namespace))
+    except ValueError:
+        # Counter was evicted: start over above any version handed out before
+        cache.set(_version_key(namespace), 2, timeout=None)
+        return 2
+'''
+
+VIEWS_PY = '''
+
+# --- Caching examples ------------------------------------------------------
+
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.http import JsonResponse
+from django.views.decorators.cache import cache_page
+
+from .cache_keys import key_builder, bump_namespace
+
+CACHE_SECONDS = 60
+
+def _slow_lookup(n):
+    time.sleep(0.002)  # stands in for a slow query or API call
+    return n * n
+
+def _slow_items():
+    return [_slow_lookup(n) for n in range(10)]
+
+@cache_page(CACHE_SECONDS)
+def cached_page(request):
+    # Per-view caching: the whole response is stored for CACHE_SECONDS
+    return render(request, '{app}/cached_page.html', {{'generated_at': time.strftime('%H:%M:%S')}})
+
+def fragment_page(request):
+    # Only the {{% cache %}} block is cached; `items` is a callable, so the
+    # template calls it only when the fragment has to be rendered
+    return render(request, '{app}/fragment.html', {{
+        'generated_at': time.strftime('%H:%M:%S'),
+        'items': _slow_items,
+    }})
+
+def cache_demo(request):
+    """Run the same lookups with and without the cache; ?bump=1 bumps the key namespace"""
+    if request.GET.get('bump'):
+        bump_namespace('demo')
+
+    keys = [i % 20 for i in range(200)]  # repeated lookups, like real traffic
+
+    # Both paths do the same work per request: each distinct key is computed
+    # at most once (no cache: always; cache: only on a miss)
+    started = time.perf_counter()
+    computed = {{n: _slow_lookup(n) for n in set(keys)}}
+    results = [computed[n] for n in keys]
+    uncached = time.perf_counter() - started
+
+    started = time.perf_counter()
+    make_key = key_builder('demo')  # one read of the namespace version for the whole view
+    wanted = {{make_key(n): n for n in set(keys)}}
+    found = cache.get_many(wanted)  # one round-trip for every lookup
+    missing = {{key: _slow_lookup(n) for key, n in wanted.items() if key not in found}}
+    if missing:
+        with transaction.atomic():  # the database backend then commits the misses once, not per key
+            cache.set_many(missing, CACHE_SECONDS)
+    values = {{**found, **missing}}
+    results = [values[make_key(n)] for n in keys]
+    hits = sum(make_key(n) in found for n in keys)  # lookups the cache answered
+    cached = time.perf_counter() - started
+
+    return JsonResponse({{
+        'backend': settings.CACHES['default']['BACKEND'],
+        'namespace_version': make_key.version,
+        'lookups': len(keys),
+        'hits': hits,
+        'hit_ratio': round(hits / len(keys), 3),
+        'uncached_ms': round(uncached * 1000, 2),
+        'cached_ms': round(cached * 1000, 2),
+        'speedup': round(uncached / cached, 1) if cached else None,
+    }})
+'''
+
+CACHED_PAGE_HTML = '''<!DOCTYPE html>
+<html>
+<head><title>Cached page</title></head>
+<body>
+  <h1>Per-view cache</h1>
+  <p>Generated at {{ generated_at }}. Reload: the time only changes once the cached response expires.</p>
+</body>
+</html>
+'''
+
+FRAGMENT_HTML = '''{% load cache %}<!DOCTYPE html>
+<html>
+<head><title>Fragment cache</title></head>
+<body>
+  <h1>Template fragment cache</h1>
+  <p>Page rendered at {{ generated_at }}.</p>
+  {% cache 300 {app}_items request.user.username %}
+    <p>Fragment rendered at {{ generated_at }} (cached per user for 5 minutes):</p>
+    <ul>{% for item in items %}<li>{{ item }}</li>{% endfor %}</ul>
+  {% endcache %}
+</body>
+</html>
+'''
+
+URLS_PY = '''from django.urls import path
+
+from . import views
+
+app_name = '{app}'
+
+urlpatterns = [
+    path('cached/', views.cached_page, name='cached_page'),
+    path('fragment/', views.fragment_page, name='fragment_page'),
+    path('cache-demo/', views.cache_demo, name='cache_demo'),
+]
+'''
+
+def _write_new(path, content):
+    if os.path.exists(path):
+        print(f"⚠️ {path} already exists, left unchanged")
+        return False
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        f.write(content)
+    return True
+
+def include_app_urls(project_path, project_name, app_name):
+    """Add path('<app>/', include('<app>.urls')) to the project urls.py"""
+    with SettingsEditor(os.path.join(project_path, project_name, 'urls.py')) as editor:
+        patterns = editor.setdefault('urlpatterns', [])
+        route = Raw(f"path('{app_name}/', include('{app_name}.urls'))")
+        if route in patterns:
+            return False
+        editor.ensure_import('from django.urls import include')
+        editor.ensure_import('from django.urls import path')
+        patterns.append(route)
+        return True
+
+def scaffold_app_cache(project_path, project_name, app_name):
+    """Add the caching views, templates, key helpers and routes to an app"""
+    app_path = os.path.join(project_path, app_name)
+    templates = os.path.join(app_path, 'templates', app_name)
+
+    _write_new(os.path.join(app_path, 'cache_keys.py'), CACHE_KEYS_PY)
+    _write_new(os.path.join(templates, 'cached_page.html'), CACHED_PAGE_HTML)
+    _write_new(os.path.join(templates, 'fragment.html'), FRAGMENT_HTML.replace('{app}', app_name))
+    if _write_new(os.path.join(app_path, 'urls.py'), URLS_PY.format(app=app_name)):
+        with open(os.path.join(app_path, 'views.py'), 'a') as f:
+            f.write(VIEWS_PY.format(app=app_name))
+
+    # Templates are looked up in installed apps only
+    with SettingsEditor(os.path.join(project_path, project_name, 'settings.py')) as editor:
+        editor.add_installed_app(app_name)
+    include_app_urls(project_path, project_name, app_name)
+
+def setup_app_caching(project_path, project_name, app_name):
+    """Interactive: configure CACHES and scaffold caching into app_name"""
+    print("\n🗄️ Cache backend for the project:")
+    backends = list(CACHE_BACKENDS)
+    for idx, backend in enumerate(backends, 1):
+        print(f"{idx}. {CACHE_BACKENDS[backend]}")
+    print(f"{len(backends) + 1}. Keep current CACHES")
+    choice = input(f"Choose option (1-{len(backends) + 1}) [{len(backends) + 1}]: ").strip()
+
+    if choice.isdigit() and 1 <= int(choice) <= len(backends):
+        backend = backends[int(choice) - 1]
+        location = None
+        if backend == 'redis':
+            location = input(f"Redis URL [{DEFAULT_REDIS_URL}]: ").strip() or DEFAULT_REDIS_URL
+        try:
+            config = configure_caches(project_path, project_name, backend, location)
+            print(f"✅ CACHES['default'] now uses {config['BACKEND']}")
+        except (subprocess.CalledProcessError, SyntaxError) as e:
+            print(f"❌ Could not configure CACHES: {e}")
+            return
+
+    scaffold = input(f"Scaffold cached views, fragment caching and key versioning in '{app_name}'? (y/n) [y]: ")
+    if scaffold.strip().lower() == 'n':
+        return
+    scaffold_app_cache(project_path, project_name, app_name)
+    print(f"✅ Caching examples added to '{app_name}':")
+    print(f"   /{app_name}/cached/      per-view cache (cache_page)")
+    print(f"   /{app_name}/fragment/    template fragment cache")
+    print(f"   /{app_name}/cache-demo/  hit ratio and latency, ?bump=1 to bump the key namespace")
@@ -1,63 +1,98 @@
 import os
 import subprocess
-import webbrowser
-import time
 import getpass
+import atexit
+
+from venv_introspect import ensure_packages
+from django_worker import DjangoWorker, WorkerError
+from server_runner import ask_server, serve
+
+# One persistent Django worker per (project path, project name)
+_workers = {}
 
 def ensure_django_installed(project_path):
     """Ensure Django is installed in the virtual environment"""
     venv_path = os.path.join(project_path, 'venv')
     if not os.path.exists(venv_path):
         raise FileNotFoundError(f"Virtual environment not found at {venv_path}")
-    
-    check_django_cmd = [
-        os.path.join(venv_path, 'bin', 'python'),
-        '-c',
-        "import django; print(django.__version__)"
-    ]
 
+    # Read from dist-info metadata; pip only runs if Django is missing
     try:
-        subprocess.run(check_django_cmd, check=True, capture_output=True)
+        ensure_packages(venv_path, ['Django'])
         return True
-    except subprocess.CalledProcessError:
-        print("Installing Django...")
-        pip_path = os.path.join(venv_path, 'bin', 'pip')
-        install_cmd = [pip_path, 'install', 'django']
-        try:
-            subprocess.run(install_cmd, check=True)
-            return True
-        except subprocess.CalledProcessError as e:
-            print(f"❌ Failed to install Django: {e}")
-            return False
-
-def list_existing_users(project_path, project_name):
-    """List existing superusers in the database"""
-    venv_path = os.path.join(project_path, 'venv')
-    python_path = os.path.join(venv_path, 'bin', 'python')
+    except subprocess.CalledProcessError as e:
+        print(f"❌ Failed to install Django: {e}")
+        return False
 
-    list_users_script = f"""
-import os
-import django
-
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', '{project_name}.settings')
-django.setup()
-
-from django.contrib.auth import get_user_model
-User = get_user_model()
-users = User.objects.all()
-for user in users:
-    print(user.username)
-"""
-
-    result = subprocess.run([python_path, '-c', list_users_script], cwd=project_path, capture_output=True, text=True)
-    user_list = result.stdout.strip().split('\n')
-    if user_list == ['']:
-        print("\n📜 No users found in the database.\n")
-    else:
-        print("\n📜 Existing users in the database:\n")
-        for user in user_list:
-            print(user)
+def get_worker(project_path, project_name):
+    """Return the persistent Django worker for a project, starting it on first use"""
+    key = (os.path.abspath(project_path), project_name)
+    if key not in _workers:
+        python_path = os.path.join(project_path, 'venv', 'bin', 'python')
+        _workers[key] = DjangoWorker(project_path, project_name, python_path)
+    return _workers[key].start()
+
+def shutdown_workers():
+    """Stop every worker this process started"""
+    while _workers:
+        _, worker = _workers.popitem()
+        worker.close()
+
+atexit.register(shutdown_workers)
+
+def list_existing_users(project_path, project_name, filters=None, page_size=50):
+    """List users page by page, streaming rows from the worker.
+
+    filters: prefix, is_superuser, is_staff, joined_after, joined_before
+    (dates as YYYY-MM-DD). Pages use keyset pagination on the primary key,
+    so memory stays flat however large the table is.
+    """
+    filters = filters or {}
+    worker = get_worker(project_path, project_name)
+    try:
+        total = worker.call('count_users', estimate=not filters, **filters)
+        if total['count'] == 0:
+            print("\n📜 No users found in the database.\n")
+            return
+        approx = '~' if total['estimated'] else ''
+        print(f"\n📜 {approx}{total['count']} matching users:\n")
+        print(f"{'ID':>8}  {'Username':<30}{'Staff':<7}{'Super':<7}Joined")
+
+        after = None
+        while True:
+            page = worker.stream('list_users', after=after, limit=page_size, **filters)
+            while True:
+                try:
+                    rows = next(page)
+                except StopIteration as stop:
+                    after = stop.value['next_after']
+                    break
+                for pk, username, is_staff, is_superuser, date_joined in rows:
+                    print(f"{pk:>8}  {username:<30}{'yes' if is_staff else 'no':<7}"
+                          f"{'yes' if is_superuser else 'no':<7}{date_joined[:19]}")
+            if after is None:
+                break
+            if input("\n-- Enter for next page, q to stop -- ").strip().lower() == 'q':
+                break
         print("\n")
+    except WorkerError as e:
+        print(f"❌ Could not list users: {e}")
+
+def ask_user_filters():
+    """Prompt for optional listing filters; empty answers are skipped"""
+    filters = {}
+    prefix = input("Username prefix (Enter to skip): ").strip()
+    if prefix:
+        filters['prefix'] = prefix
+    for field, label in (('is_superuser', 'Superusers only'), ('is_staff', 'Staff only')):
+        answer = input(f"{label}? (y/n, Enter to skip): ").strip().lower()
+        if answer in ('y', 'n'):
+            filters[field] = answer == 'y'
+    for field, label in (('joined_after', 'Joined on/after'), ('joined_before', 'Joined before')):
+        value = input(f"{label} (YYYY-MM-DD, Enter to skip): ").strip()
+        if value:
+            filters[field] = value
+    return filters
 
 def get_superuser_details():
     """Collect superuser details from user"""
@@ -80,133 +115,76 @@ def get_superuser_details():
 
 def check_user_exists(project_path, project_name, username):
     """Check if a user already exists"""
-    venv_path = os.path.join(project_path, 'venv')
-    python_path = os.path.join(venv_path, 'bin', 'python')
-
-    check_user_script = f"""
-import os
-import django
-
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', '{project_name}.settings')
-django.setup()
-
-from django.contrib.auth import get_user_model
-User = get_user_model()
-exists = User.objects.filter(username='{username}').exists()
-print('EXISTS' if exists else 'NOT_EXISTS')
-"""
-
-    result = subprocess.run([python_path, '-c', check_user_script], cwd=project_path, capture_output=True, text=True)
-    status = result.stdout.strip()
-    return status == 'EXISTS'
+    return get_worker(project_path, project_name).call('user_exists', username=username)
 
 def create_or_update_superuser(project_path, project_name, username, email, password):
     """Create or update Django superuser"""
-    venv_path = os.path.join(project_path, 'venv')
-    python_path = os.path.join(venv_path, 'bin', 'python')
-
     try:
         if check_user_exists(project_path, project_name, username):
             print("⚙️ User already exists. Updating password...")
-            update_password_script = f"""
-import os
-import django
-
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', '{project_name}.settings')
-django.setup()
-
-from django.contrib.auth import get_user_model
-User = get_user_model()
-user = User.objects.get(username='{username}')
-user.set_password('{password}')
-user.save()
-
-print("✅ Password updated successfully")
-"""
-            subprocess.run([python_path, '-c', update_password_script], cwd=project_path, check=True)
-            return True
         else:
             print("👑 Creating superuser...")
-            create_cmd = [
-                python_path,
-                'manage.py',
-                'createsuperuser',
-                '--username', username,
-                '--email', email if email else '',
-                '--noinput'
-            ]
-            subprocess.run(create_cmd, cwd=project_path, check=True)
-
-            set_password_script = f"""
-import os
-import django
-
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', '{project_name}.settings')
-django.setup()
-
-from django.contrib.auth import get_user_model
-User = get_user_model()
-user = User.objects.get(username='{username}')
-user.set_password('{password}')
-user.save()
-
-print("✅ Superuser created successfully")
-"""
-            subprocess.run([python_path, '-c', set_password_script], cwd=project_path, check=True)
-            return True
+        outcome = get_worker(project_path, project_name).call(
+            'set_superuser', username=username, email=email, password=password
+        )
+        if outcome == 'updated':
+            print("✅ Password updated successfully")
+        else:
+            print("✅ Superuser created successfully")
+        return True
 
-    except subprocess.CalledProcessError as e:
+    except WorkerError as e:
         print(f"❌ Error creating or updating superuser: {e}")
         return False
 
 def delete_user(project_path, project_name, username):
     """Delete a user by username"""
-    venv_path = os.path.join(project_path, 'venv')
-    python_path = os.path.join(venv_path, 'bin', 'python')
-
-    delete_user_script = f"""
-import os
-import django
-
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', '{project_name}.settings')
-django.setup()
-
-from django.contrib.auth import get_user_model
-User = get_user_model()
-
-try:
-    user = User.objects.get(username='{username}')
-    user.delete()
-    print('✅ User deleted successfully')
-except User.DoesNotExist:
-    print('❌ User does not exist')
-"""
-
-    subprocess.run([python_path, '-c', delete_user_script], cwd=project_path)
-
-def run_server_and_open_admin(project_path):
-    """Run development server and open admin panel"""
-    venv_path = os.path.join(project_path, 'venv')
-    python_path = os.path.join(venv_path, 'bin', 'python')
-
     try:
-        server_process = subprocess.Popen(
-            [python_path, 'manage.py', 'runserver'],
-            cwd=project_path
-        )
-
-        time.sleep(3)
-        webbrowser.open("http://127.0.0.1:8000/admin/")
-
-        print("\n✅ Admin panel opened in your browser. Please login with your superuser credentials.")
-        print("Press Ctrl+C in this terminal when you're done to stop the server.")
-
-        server_process.wait()
+        deleted = get_worker(project_path, project_name).call('delete_user', username=username)
+    except WorkerError as e:
+        print(f"❌ Could not delete user: {e}")
+        return
+    print('✅ User deleted successfully' if deleted else '❌ User does not exist')
+
+def bulk_import_users(project_path, project_name, source_path, batch_size=1000, workers=None):
+    """Import users from CSV/JSONL (upserting by username) and report rows per second"""
+    worker = get_worker(project_path, project_name)
+    try:
+        progress = worker.stream('import_users', path=os.path.abspath(source_path),
+                                 batch_size=batch_size, workers=workers)
+        summary = print_progress(progress, "Imported")
+    except WorkerError as e:
+        print(f"\n❌ Import failed: {e}")
+        return None
+    print(f"\n✅ Imported {summary['rows']} users in {summary['seconds']:.1f}s ({summary['rows_per_sec']:.0f} rows/s)")
+    return summary
+
+def bulk_export_users(project_path, project_name, target_path, batch_size=2000, include_password_hashes=False):
+    """Stream all users to CSV/JSONL and report rows per second"""
+    worker = get_worker(project_path, project_name)
+    try:
+        progress = worker.stream('export_users', path=os.path.abspath(target_path), batch_size=batch_size,
+                                 include_password_hashes=include_password_hashes)
+        summary = print_progress(progress, "Exported")
+    except WorkerError as e:
+        print(f"\n❌ Export failed: {e}")
+        return None
+    print(f"\n✅ Exported {summary['rows']} users in {summary['seconds']:.1f}s ({summary['rows_per_sec']:.0f} rows/s)")
+    return summary
+
+def print_progress(progress, label):
+    """Print streamed progress chunks on one line; returns the generator's final result"""
+    while True:
+        try:
+            chunk = next(progress)
+        except StopIteration as stop:
+            return stop.value
+        print(f"\r⏳ {label} {chunk['rows']} rows ({chunk['rows_per_sec']:.0f} rows/s)", end='', flush=True)
 
-    except Exception as e:
-        print(f"❌ Error running server: {e}")
-        if 'server_process' in locals():
-            server_process.terminate()
+def run_server_and_open_admin(project_path, project_name, server='runserver', workers=None):
+    """Run the project's server and open the admin panel once it responds"""
+    print("Log in with your superuser credentials once the admin panel opens.")
+    serve(project_path, project_name, server, workers)
 
 def main():
     print("\n" + "=" * 50)
@@ -235,13 +213,18 @@ def main():
             print("[1] List existing users")
             print("[2] Create or update superuser")
             print("[3] Delete a user")
-            print("[4] Run development server and open admin panel")
-            print("[5] Exit")
+            print("[4] Run the server (dev or multi-worker) and open admin panel")
+            print("[5] Bulk import users from CSV/JSONL")
+            print("[6] Bulk export users to CSV/JSONL")
+            print("[7] Exit")
 
-            choice = input("\nEnter your choice (1-5): ").strip()
+            choice = input("\nEnter your choice (1-7): ").strip()
 
             if choice == '1':
-                list_existing_users(project_path, project_name)
+                filters = ask_user_filters()
+                page_size = input("Page size [50]: ").strip()
+                list_existing_users(project_path, project_name, filters,
+                                    int(page_size) if page_size.isdigit() else 50)
             elif choice == '2':
                 username, email, password = get_superuser_details()
                 if create_or_update_superuser(project_path, project_name, username, email, password):
@@ -253,17 +236,33 @@ def main():
                 else:
                     print("❌ Username cannot be empty")
             elif choice == '4':
-                print("\n🚀 Starting development server...")
-                run_server_and_open_admin(project_path)
+                server, workers = ask_server()
+                run_server_and_open_admin(project_path, project_name, server, workers)
             elif choice == '5':
+                source_path = input("\nEnter path to the .csv or .jsonl file to import: ").strip()
+                if not os.path.exists(source_path):
+                    print(f"❌ File not found: {source_path}")
+                    continue
+                batch_size = input("Batch size [1000]: ").strip()
+                bulk_import_users(project_path, project_name, source_path,
+                                  int(batch_size) if batch_size.isdigit() else 1000)
+            elif choice == '6':
+                target_path = input("\nEnter output path (.csv or .jsonl): ").strip()
+                if target_path:
+                    hashes = input("Include password hashes (needed to re-import logins)? (y/n) [n]: ").strip().lower() == 'y'
+                    bulk_export_users(project_path, project_name, target_path, include_password_hashes=hashes)
+                else:
+                    print("❌ Output path cannot be empty")
+            elif choice == '7':
                 print("\n👋 Exiting...")
                 break
             else:
-                print("❌ Invalid choice. Please select from 1 to 5.")
+                print("❌ Invalid choice. Please select from 1 to 7.")
 
     except Exception as e:
         print(f"❌ Error: {e}")
     finally:
+        shutdown_workers()
         print("\nScript completed")
 
 if __name__ == "__main__":
@@ -0,0 +1,79 @@
+import os
+import sys
+import json
+import time
+
+# Connection overhead benchmark for MySQL-backed projects. Runs *inside the
+# project's venv*, one process per connection mode:
+#
+#     venv/bin/python db_pool_bench.py <project_path> <settings_module> <mode> <requests>
+#
+# It loads the project's DATABASES['default'], switches it to the given mode
+# (see sql_connect.connection_settings) and simulates requests: the
+# request_started/request_finished signals fire around a trivial query, so
+# Django opens, reuses, pools or closes connections exactly as it would
+# under real traffic. Real TCP+auth handshakes are counted on the server
+# (`Connections` status variable), so any MySQL-compatible server works as a
+# stand-in (a local MySQL/MariaDB, or a container).
+
+WARMUP_REQUESTS = 10
+
+def _server_connections(db):
+    import pymysql
+    conn = pymysql.connect(host=db.get('HOST') or '127.0.0.1', port=int(db.get('PORT') or 3306),
+                           user=db['USER'], password=db.get('PASSWORD', ''), database=db['NAME'])
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("SHOW GLOBAL STATUS LIKE 'Connections'")
+            return int(cursor.fetchone()[1])
+    finally:
+        conn.close()
+
+def bench(project_path, settings_module, mode, requests):
+    os.chdir(project_path)
+    sys.path.insert(0, project_path)
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
+
+    import django
+    from django.conf import settings
+    from sql_connect import connection_settings
+
+    # Connections are created lazily, so DATABASES can still change here
+    db = settings.DATABASES['default']
+    db.pop('POOL_OPTIONS', None)
+    db.pop('CONN_HEALTH_CHECKS', None)
+    db.update(connection_settings(mode, django_version=django.VERSION[:2]))
+    django.setup()
+
+    from django.core.signals import request_started, request_finished
+    from django.db import connection
+
+    def fake_request():
+        request_started.send(sender=None)
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+            cursor.fetchone()
+        request_finished.send(sender=None)
+
+    for _ in range(WARMUP_REQUESTS):
+        fake_request()
+
+    before = _server_connections(db)
+    latencies = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        fake_request()
+        latencies.append(time.perf_counter() - started)
+    connects = _server_connections(db) - before - 1  # minus the second probe itself
+
+    latencies.sort()
+    print(json.dumps({
+        'mode': mode,
+        'requests': requests,
+        'mean_ms': round(sum(latencies) / len(latencies) * 1000, 3),
+        'p95_ms': round(latencies[int(len(latencies) * 0.95) - 1] * 1000, 3),
+        'server_connects': max(connects, 0),
+    }))
+
+if __name__ == "__main__":
+    bench(sys.argv[1], sys.argv[2], sys.argv[3], int(sys.argv[4]))
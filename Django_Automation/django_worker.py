@@ -0,0 +1,306 @@
+import os
+import sys
+import json
+import subprocess
+
+# One long-lived Python process per project that runs django.setup() once and
+# then answers commands sent as JSON lines over its stdin/stdout pipes.
+#
+# This file has two halves:
+# - serve(): runs *inside the project's venv* (`venv/bin/python django_worker.py
+#   <project_path> <settings_module>`), so it may import Django.
+# - DjangoWorker: the client used by the automation scripts; stdlib only.
+#
+# Protocol: each request is {"cmd": ..., **params}. Each reply is one line,
+# {"ok": true, "result": ...} or {"ok": false, "error": ...}. Commands that
+# stream send any number of {"chunk": [...]} lines before the final reply.
+
+WORKER_SCRIPT = os.path.abspath(__file__)
+
+class WorkerError(Exception):
+    pass
+
+# --- Server side (inside the project venv) ----------------------------------
+
+COMMANDS = {}
+
+def command(func):
+    COMMANDS[func.__name__] = func
+    return func
+
+def _user_model():
+    from django.contrib.auth import get_user_model
+    return get_user_model()
+
+@command
+def ping():
+    import django
+    return {'django': django.get_version()}
+
+USER_LIST_EXTRA_FIELDS = ('is_staff', 'is_superuser', 'date_joined')
+
+def _start_of_day(value):
+    """'YYYY-MM-DD' -> datetime at midnight, aware when USE_TZ is on"""
+    from datetime import datetime, time
+    from django.conf import settings
+    from django.utils import timezone
+    from django.utils.dateparse import parse_date
+
+    day = parse_date(value)
+    if day is None:
+        raise ValueError(f"Invalid date '{value}', expected YYYY-MM-DD")
+    moment = datetime.combine(day, time.min)
+    return timezone.make_aware(moment) if settings.USE_TZ else moment
+
+def _filtered_users(prefix=None, is_superuser=None, is_staff=None, joined_after=None, joined_before=None):
+    """Server-side filters; range filters (not __date) so indexes stay usable"""
+    User = _user_model()
+    queryset = User.objects.all()
+    if prefix:
+        queryset = queryset.filter(**{f'{User.USERNAME_FIELD}__startswith': prefix})
+    if is_superuser is not None:
+        queryset = queryset.filter(is_superuser=is_superuser)
+    if is_staff is not None:
+        queryset = queryset.filter(is_staff=is_staff)
+    if joined_after:
+        queryset = queryset.filter(date_joined__gte=_start_of_day(joined_after))
+    if joined_before:
+        queryset = queryset.filter(date_joined__lt=_start_of_day(joined_before))
+    return queryset
+
+@command
+def list_users(after=None, limit=None, chunk_size=500, **filters):
+    """Stream [pk, username, is_staff, is_superuser, date_joined] rows in pk order.
+
+    Keyset pagination: pass the returned `next_after` as `after` to get the
+    next page. Rows are fetched with a server-side iterator and sent in
+    chunks, so memory stays flat regardless of table size.
+    """
+    User = _user_model()
+    queryset = _filtered_users(**filters).order_by('pk')
+    if after is not None:
+        queryset = queryset.filter(pk__gt=after)
+    if limit:
+        queryset = queryset[:limit]
+
+    rows = queryset.values_list('pk', User.USERNAME_FIELD, *USER_LIST_EXTRA_FIELDS)
+    chunk = []
+    sent = 0
+    last_pk = None
+    for row in rows.iterator(chunk_size=chunk_size):
+        chunk.append(row)
+        last_pk = row[0]
+        if len(chunk) >= chunk_size:
+            yield chunk
+            sent += len(chunk)
+            chunk = []
+    if chunk:
+        yield chunk
+        sent += len(chunk)
+    has_more = bool(limit) and sent == limit
+    return {'rows': sent, 'next_after': last_pk if has_more else None}
+
+@command
+def count_users(estimate=False, **filters):
+    """Row count for the filters; `estimate` uses catalog statistics for unfiltered MySQL/PostgreSQL tables.
+
+    The statistics are only for display: they're often 0 or stale right after
+    a bulk load, so whether there are any users at all is always checked exactly.
+    """
+    from django.db import connection
+
+    User = _user_model()
+    table = User._meta.db_table
+    if estimate and not any(value not in (None, '') for value in filters.values()):
+        approximate = None
+        with connection.cursor() as cursor:
+            if connection.vendor == 'mysql':
+                cursor.execute("SELECT TABLE_ROWS FROM information_schema.TABLES "
+                               "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s", [table])
+                row = cursor.fetchone()
+                if row and row[0] is not None:
+                    approximate = int(row[0])
+            elif connection.vendor == 'postgresql':
+                cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE relname = %s", [table])
+                row = cursor.fetchone()
+                if row and row[0] >= 0:
+                    approximate = int(row[0])
+        if approximate:
+            if not User.objects.exists():
+                return {'count': 0, 'estimated': False}
+            return {'count': approximate, 'estimated': True}
+    return {'count': _filtered_users(**filters).count(), 'estimated': False}
+
+@command
+def user_exists(username):
+    User = _user_model()
+    return User.objects.filter(**{User.USERNAME_FIELD: username}).exists()
+
+@command
+def set_superuser(username, email, password):
+    """Create a superuser, or update the password of an existing user"""
+    User = _user_model()
+    try:
+        user = User.objects.get(**{User.USERNAME_FIELD: username})
+    except User.DoesNotExist:
+        fields = {User.USERNAME_FIELD: username, 'password': password}
+        # When email is the USERNAME_FIELD it's already set to username
+        fields.setdefault('email', email or '')
+        User.objects.create_superuser(**fields)
+        return 'created'
+    user.set_password(password)
+    user.save()
+    return 'updated'
+
+@command
+def delete_user(username):
+    User = _user_model()
+    deleted, _ = User.objects.filter(**{User.USERNAME_FIELD: username}).delete()
+    return deleted > 0
+
+@command
+def import_users(path, batch_size=1000, workers=None):
+    import bulk_users
+    return bulk_users.import_users(path, batch_size, workers)
+
+@command
+def export_users(path, batch_size=2000, include_password_hashes=False):
+    import bulk_users
+    return bulk_users.export_users(path, batch_size, include_password_hashes)
+
+def serve(project_path, settings_module):
+    # Keep the real stdout for protocol replies; anything Django or app code
+    # prints goes to stderr instead of corrupting the pipe.
+    protocol = os.fdopen(os.dup(1), 'w', buffering=1)
+    os.dup2(2, 1)
+    sys.stdout = sys.stderr
+
+    def send(message):
+        protocol.write(json.dumps(message, default=str) + '\n')
+
+    os.chdir(project_path)
+    sys.path.insert(0, project_path)
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
+
+    import django
+    django.setup()
+    from django.db import close_old_connections
+
+    send({'ok': True, 'result': 'ready'})
+
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        request = json.loads(line)
+        cmd = request.pop('cmd')
+        if cmd == 'shutdown':
+            send({'ok': True, 'result': 'bye'})
+            break
+
+        handler = COMMANDS.get(cmd)
+        if handler is None:
+            send({'ok': False, 'error': f"unknown command '{cmd}'"})
+            continue
+        try:
+            close_old_connections()
+            result = handler(**request)
+            if hasattr(result, '__next__'):
+                # Generator commands stream chunks and return a final summary
+                try:
+                    while True:
+                        send({'chunk': next(result)})
+                except StopIteration as stop:
+                    result = stop.value
+            send({'ok': True, 'result': result})
+        except Exception as e:
+            send({'ok': False, 'error': f"{e.__class__.__name__}: {e}"})
+
+# --- Client side (automation scripts) ----------------------------------------
+
+class DjangoWorker:
+    """Client for a persistent worker process bound to one Django project"""
+
+    def __init__(self, project_path, project_name, python_path=None):
+        self.project_path = project_path
+        self.settings_module = f"{project_name}.settings"
+        self.python_path = python_path or os.path.join(project_path, 'venv', 'bin', 'python')
+        self.process = None
+
+    def start(self):
+        if self.process is not None and self.process.poll() is None:
+            return self
+        self.process = subprocess.Popen(
+            [self.python_path, WORKER_SCRIPT, self.project_path, self.settings_module],
+            cwd=self.project_path,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+            bufsize=1,
+        )
+        self._read_reply()
+        return self
+
+    def _read_reply(self):
+        line = self.process.stdout.readline()
+        if not line:
+            code = self.process.wait()
+            self.process = None
+            raise WorkerError(f"Django worker exited (code {code}); see the error output above")
+        return json.loads(line)
+
+    def _send(self, cmd, params):
+        self.start()
+        self.process.stdin.write(json.dumps({'cmd': cmd, **params}) + '\n')
+        self.process.stdin.flush()
+
+    def _final(self, reply):
+        if not reply.get('ok'):
+            raise WorkerError(reply.get('error', 'unknown error'))
+        return reply.get('result')
+
+    def call(self, cmd, **params):
+        """Run a command and return its result"""
+        self._send(cmd, params)
+        reply = self._read_reply()
+        while 'chunk' in reply:
+            reply = self._read_reply()
+        return self._final(reply)
+
+    def stream(self, cmd, **params):
+        """Run a streaming command, yielding each chunk; returns the final result"""
+        self._send(cmd, params)
+        reply = self._read_reply()
+        while 'chunk' in reply:
+            try:
+                yield reply['chunk']
+            except GeneratorExit:
+                # Consumer stopped early: drain the rest so the next call starts clean
+                while 'chunk' in reply and self.process is not None:
+                    reply = self._read_reply()
+                raise
+            reply = self._read_reply()
+        return self._final(reply)
+
+    def close(self, timeout=5):
+        if self.process is None:
+            return
+        try:
+            if self.process.poll() is None:
+                self.process.stdin.write(json.dumps({'cmd': 'shutdown'}) + '\n')
+                self.process.stdin.flush()
+                self.process.stdin.close()
+                self.process.wait(timeout=timeout)
+        except (OSError, subprocess.TimeoutExpired):
+            self.process.kill()
+            self.process.wait()
+        finally:
+            self.process = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+if __name__ == "__main__":
+    serve(sys.argv[1], sys.argv[2])
@@ -0,0 +1,163 @@
+import os
+import re
+import json
+import fcntl
+import shutil
+import secrets
+import tempfile
+
+from starter_paths import starter_dir
+from wheelhouse import python_tag, resolve_lock
+
+# A golden snapshot is a fully bootstrapped and migrated project (venv,
+# manage.py, package, db.sqlite3) built once per Django version. New projects
+# are cloned from it: package files are hardlinked, the database is reflinked
+# or copied, and only files that mention the project name or the venv path
+# are rewritten.
+GOLDEN_ROOT = starter_dir('golden')
+GOLDEN_NAME = 'goldenproject'
+MARKER = '.golden.json'
+
+# Files inside the project package whose content depends on the project name
+NAME_DEPENDENT_FILES = ('settings.py', 'urls.py', 'wsgi.py', 'asgi.py')
+
+SECRET_KEY_CHARS = 'abcdefghijklmnopqrstuvwxyz0123456789!@#$%^&*(-_=+)'
+SECRET_KEY_RE = re.compile(r"^SECRET_KEY\s*=\s*(['\"]).*?\1", re.MULTILINE)
+
+FICLONE = 0x40049409  # Linux ioctl for copy-on-write file clones
+
+def golden_path(django_version):
+    return os.path.join(GOLDEN_ROOT, f"{django_version}-{python_tag()}")
+
+def _read_marker(path):
+    marker = os.path.join(path, MARKER)
+    if not os.path.exists(marker):
+        return None
+    with open(marker, 'r') as f:
+        return json.load(f)
+
+def ensure_golden(django_version=None):
+    """Return (path, marker) of the golden snapshot, building it on first use"""
+    # Imported here because bootstrap imports this module for golden mode
+    from bootstrap import create_traditional_project
+
+    django_version, _ = resolve_lock(django_version)
+    path = golden_path(django_version)
+
+    # Serialise builders so parallel project creation builds the snapshot once
+    with open(path + '.lock', 'w') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+
+        marker = _read_marker(path)
+        if marker:
+            return path, marker
+
+        print(f"🏗️ Building golden snapshot for Django {django_version} (one-time)...")
+        shutil.rmtree(path, ignore_errors=True)
+        os.makedirs(path)
+        # Built in place: venv scripts embed their absolute path, which is
+        # recorded in the marker and rewritten when cloning.
+        if not create_traditional_project(path, GOLDEN_NAME, django_version):
+            shutil.rmtree(path, ignore_errors=True)
+            raise RuntimeError(f"Could not build golden snapshot for Django {django_version}")
+
+        marker = {
+            'django_version': django_version,
+            'project_name': GOLDEN_NAME,
+            'venv_path': os.path.join(path, 'venv'),
+        }
+        with open(os.path.join(path, MARKER), 'w') as f:
+            json.dump(marker, f, indent=2)
+        return path, marker
+
+def new_secret_key():
+    return 'django-insecure-' + ''.join(secrets.choice(SECRET_KEY_CHARS) for _ in range(50))
+
+def reflink_or_copy(src, dst):
+    """Copy-on-write clone when the filesystem supports it, plain copy otherwise"""
+    with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+        try:
+            fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+        except OSError:
+            shutil.copyfileobj(fsrc, fdst, 1024 * 1024)
+    shutil.copystat(src, dst)
+
+def _link_or_copy(src, dst):
+    try:
+        os.link(src, dst)
+    except OSError:
+        # Different filesystem or links not allowed
+        shutil.copy2(src, dst)
+
+def _clone_venv(src_venv, dst_venv):
+    """Clone a venv by hardlinking its files and rewriting files that embed its path"""
+    old_path = src_venv.encode()
+    new_path = dst_venv.encode()
+    bin_dir = os.path.join(src_venv, 'bin')
+
+    for root, dirs, files in os.walk(src_venv):
+        target_root = os.path.join(dst_venv, os.path.relpath(root, src_venv))
+        os.makedirs(target_root, exist_ok=True)
+
+        for name in dirs:
+            src = os.path.join(root, name)
+            if os.path.islink(src):
+                os.symlink(os.readlink(src), os.path.join(target_root, name))
+        dirs[:] = [d for d in dirs if not os.path.islink(os.path.join(root, d))]
+
+        for name in files:
+            src = os.path.join(root, name)
+            dst = os.path.join(target_root, name)
+            if os.path.islink(src):
+                os.symlink(os.readlink(src), dst)
+                continue
+
+            # Only activate scripts, console-script shebangs and pyvenv.cfg
+            # carry the venv path; everything else is shared.
+            if root == bin_dir or root == src_venv:
+                with open(src, 'rb') as f:
+                    content = f.read()
+                if old_path in content:
+                    with open(dst, 'wb') as f:
+                        f.write(content.replace(old_path, new_path))
+                    shutil.copymode(src, dst)
+                    continue
+
+            _link_or_copy(src, dst)
+
+def _rewrite_name(path, dst, old_name, new_name):
+    with open(path, 'r') as f:
+        content = f.read()
+    content = re.sub(rf'\b{re.escape(old_name)}\b', new_name, content)
+    if os.path.basename(dst) == 'settings.py':
+        content = SECRET_KEY_RE.sub(lambda m: f"SECRET_KEY = {m.group(1)}{new_secret_key()}{m.group(1)}", content, count=1)
+    with open(dst, 'w') as f:
+        f.write(content)
+    shutil.copystat(path, dst)
+
+def clone_golden(project_path, project_name, django_version=None):
+    """Create a project by cloning the golden snapshot into project_path"""
+    source, marker = ensure_golden(django_version)
+    old_name = marker['project_name']
+
+    _clone_venv(marker['venv_path'], os.path.join(project_path, 'venv'))
+
+    reflink_or_copy(os.path.join(source, 'db.sqlite3'), os.path.join(project_path, 'db.sqlite3'))
+    _rewrite_name(os.path.join(source, 'manage.py'), os.path.join(project_path, 'manage.py'), old_name, project_name)
+
+    # Write the package under a temporary name and rename it into place so an
+    # interrupted clone never leaves a half-written package behind.
+    package_src = os.path.join(source, old_name)
+    package_tmp = tempfile.mkdtemp(prefix=f".{project_name}-", dir=project_path)
+    for filename in os.listdir(package_src):
+        src = os.path.join(package_src, filename)
+        if filename == '__pycache__':
+            continue
+        if filename in NAME_DEPENDENT_FILES:
+            _rewrite_name(src, os.path.join(package_tmp, filename), old_name, project_name)
+        else:
+            shutil.copy2(src, os.path.join(package_tmp, filename))
+    os.chmod(package_tmp, 0o755)
+    os.rename(package_tmp, os.path.join(project_path, project_name))
+
+    return marker['django_version']
@@ -0,0 +1,246 @@
+import os
+import sys
+import glob
+import json
+import time
+import asyncio
+import hashlib
+import argparse
+import platform
+
+from server_runner import ServerProcess, SERVERS
+from venv_introspect import detect_project_name
+
+# HTTP load test for a generated project. Starts the project's server the
+# same way create_superuser.py does (server_runner.ServerProcess), then keeps
+# `concurrency` asyncio clients busy on keep-alive connections for a fixed
+# time, cycling through the target URLs:
+#
+#     python load_test.py <project_path> [--url /admin/login/ ...] [--concurrency 20]
+#                         [--duration 10] [--server gunicorn] [--workers N]
+#
+# Throughput, p50/p95/p99 latency and error rates (connection errors and
+# HTTP 5xx; 4xx too unless --allow-4xx) are printed and saved as JSON in
+# <project>/.loadtest/. Each report records its parameters and a hash of
+# settings.py; runs with the same parameters are compared with the previous
+# one, flagging regressions beyond --threshold percent.
+
+DEFAULT_URLS = ['/admin/login/']
+DEFAULT_CONCURRENCY = 20
+DEFAULT_DURATION = 10.0
+WARMUP_SECONDS = 2.0
+REGRESSION_THRESHOLD = 10.0  # percent
+REPORT_DIR = '.loadtest'
+
+def _percentile(sorted_values, percent):
+    index = max(0, min(len(sorted_values) - 1, round(percent / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+# --- asyncio HTTP/1.1 client ------------------------------------------------------
+
+async def _read_body(reader, headers):
+    if headers.get('transfer-encoding', '').lower() == 'chunked':
+        size = 0
+        while True:
+            chunk_size = int((await reader.readline()).split(b';')[0].strip() or b'0', 16)
+            if chunk_size == 0:
+                await reader.readline()  # trailing CRLF (no trailers expected)
+                return size
+            await reader.readexactly(chunk_size + 2)
+            size += chunk_size
+    if 'content-length' in headers:
+        length = int(headers['content-length'])
+        await reader.readexactly(length)
+        return length
+    return len(await reader.read())  # body runs until the server closes
+
+async def _request(reader, writer, host, port, path):
+    """GET path on an open connection; returns (status, keep_alive)"""
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: {host}:{port}\r\n"
+                 f"User-Agent: django-starter-load-test\r\nAccept: */*\r\n\r\n".encode())
+    await writer.drain()
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError("connection closed by server")
+    status = int(status_line.split()[1])
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+    await _read_body(reader, headers)
+    keep_alive = headers.get('connection', '').lower() != 'close' and (
+        'content-length' in headers or 'transfer-encoding' in headers)
+    return status, keep_alive
+
+async def _client(index, host, port, urls, stop_at, record_from, samples):
+    reader = writer = None
+    sent = index  # spread the clients over the URLs from the first request
+    while time.perf_counter() < stop_at:
+        path = urls[sent % len(urls)]
+        sent += 1
+        started = time.perf_counter()
+        try:
+            if writer is None:
+                reader, writer = await asyncio.open_connection(host, port)
+            status, keep_alive = await _request(reader, writer, host, port, path)
+        except (OSError, ConnectionError, asyncio.IncompleteReadError, ValueError, IndexError):
+            status, keep_alive = None, False
+        finished = time.perf_counter()
+        if started >= record_from:
+            samples.append((path, status, finished - started))
+        if not keep_alive and writer is not None:
+            writer.close()
+            reader = writer = None
+    if writer is not None:
+        writer.close()
+
+async def _drive(host, port, urls, concurrency, duration, warmup):
+    samples = []
+    record_from = time.perf_counter() + warmup
+    stop_at = record_from + duration
+    await asyncio.gather(*(_client(index, host, port, urls, stop_at, record_from, samples)
+                           for index in range(concurrency)))
+    return samples
+
+def summarize(samples, duration, allow_4xx=False):
+    """Throughput, latency percentiles and error rate for a list of (path, status, seconds)"""
+    latencies = sorted(seconds for _, _, seconds in samples)
+    errors = sum(1 for _, status, _ in samples
+                 if status is None or status >= 500 or (status >= 400 and not allow_4xx))
+    statuses = {}
+    for _, status, _ in samples:
+        key = str(status) if status is not None else 'connection_error'
+        statuses[key] = statuses.get(key, 0) + 1
+    if not latencies:
+        return {'requests': 0, 'rps': 0.0, 'error_rate': 1.0, 'statuses': statuses}
+    return {
+        'requests': len(samples),
+        'rps': round(len(samples) / duration, 1),
+        'mean_ms': round(sum(latencies) / len(latencies) * 1000, 2),
+        'p50_ms': round(_percentile(latencies, 50) * 1000, 2),
+        'p95_ms': round(_percentile(latencies, 95) * 1000, 2),
+        'p99_ms': round(_percentile(latencies, 99) * 1000, 2),
+        'error_rate': round(errors / len(samples), 4),
+        'statuses': statuses,
+    }
+
+def _settings_hash(project_path, project_name):
+    with open(os.path.join(project_path, project_name, 'settings.py'), 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()[:12]
+
+def run_load_test(project_path, project_name=None, urls=None, concurrency=DEFAULT_CONCURRENCY,
+                  duration=DEFAULT_DURATION, server='runserver', workers=None, allow_4xx=False,
+                  warmup=WARMUP_SECONDS):
+    """Start the server, drive traffic at urls and return the report (also saved as JSON)"""
+    project_name = project_name or detect_project_name(project_path)
+    urls = urls or DEFAULT_URLS
+    runner = ServerProcess(project_path, project_name, server, workers, quiet=True)
+    print(f"🚀 Starting {runner.server}...")
+    runner.start(urls[0].lstrip('/'))
+    try:
+        print(f"⏱️ {concurrency} clients for {duration:g}s (+{warmup:g}s warm-up) on {', '.join(urls)}")
+        samples = asyncio.run(_drive(runner.host, runner.port, urls, concurrency, duration, warmup))
+    finally:
+        runner.stop()
+
+    report = {
+        'started': time.strftime('%Y%m%d-%H%M%S'),
+        'params': {
+            'urls': urls,
+            'concurrency': concurrency,
+            'duration': duration,
+            'server': runner.server,
+            'workers': runner.workers if runner.server != 'runserver' else 1,
+        },
+        'environment': {
+            'cpu_count': os.cpu_count(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'settings_sha256': _settings_hash(project_path, project_name),
+        },
+        'total': summarize(samples, duration, allow_4xx),
+        'urls': {url: summarize([sample for sample in samples if sample[0] == url], duration, allow_4xx)
+                 for url in urls},
+    }
+    report_dir = os.path.join(project_path, REPORT_DIR)
+    os.makedirs(report_dir, exist_ok=True)
+    report['report_path'] = os.path.join(report_dir, f"report-{report['started']}.json")
+    with open(report['report_path'], 'w') as f:
+        json.dump(report, f, indent=2)
+    return report
+
+def previous_report(project_path, report):
+    """Latest earlier report with the same parameters, or None"""
+    paths = sorted(glob.glob(os.path.join(project_path, REPORT_DIR, 'report-*.json')), reverse=True)
+    for path in paths:
+        if os.path.abspath(path) == os.path.abspath(report['report_path']):
+            continue
+        with open(path) as f:
+            earlier = json.load(f)
+        if earlier.get('params') == report['params']:
+            return earlier
+    return None
+
+def compare(before, after, threshold=REGRESSION_THRESHOLD):
+    """Print before/after totals; returns the list of regressed metrics"""
+    rows = [("Requests/sec", 'rps', True), ("p50 (ms)", 'p50_ms', False),
+            ("p95 (ms)", 'p95_ms', False), ("p99 (ms)", 'p99_ms', False), ("Error rate", 'error_rate', False)]
+    regressions = []
+    changed = before['environment']['settings_sha256'] != after['environment']['settings_sha256']
+    print(f"\nCompared with {before['started']}" + (" (settings.py changed since)" if changed else ""))
+    print(f"{'Metric':<16}{'Before':>12}{'After':>12}{'Change':>10}")
+    print("-" * 50)
+    for label, key, higher_is_better in rows:
+        old, new = before['total'].get(key, 0), after['total'].get(key, 0)
+        change = (new - old) / old * 100 if old else (0.0 if new == old else 100.0)
+        worse = change < -threshold if higher_is_better else change > threshold
+        if worse:
+            regressions.append(key)
+        print(f"{label:<16}{old:>12}{new:>12}{change:>+9.1f}% {'❌' if worse else ''}")
+    return regressions
+
+def print_report(report):
+    print(f"\n{'URL':<32}{'Req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'Errors':>9}")
+    print("-" * 77)
+    for url, result in [*report['urls'].items(), ('TOTAL', report['total'])]:
+        print(f"{url[:31]:<32}{result['rps']:>9}{result.get('p50_ms', '-'):>9}{result.get('p95_ms', '-'):>9}"
+              f"{result.get('p99_ms', '-'):>9}{result['error_rate'] * 100:>8.1f}%")
+    print(f"\n📄 Report: {report['report_path']}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test a generated Django project")
+    parser.add_argument('project_path')
+    parser.add_argument('--project-name', help="Folder with settings.py (detected if omitted)")
+    parser.add_argument('--url', action='append', dest='urls', help="Path to request; repeat for several")
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument('--duration', type=float, default=DEFAULT_DURATION, help="Measured seconds")
+    parser.add_argument('--server', choices=list(SERVERS), default='runserver')
+    parser.add_argument('--workers', type=int)
+    parser.add_argument('--allow-4xx', action='store_true', help="Don't count 4xx responses as errors")
+    parser.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD,
+                        help="Percent change that counts as a regression")
+    parser.add_argument('--fail-on-regression', action='store_true')
+    args = parser.parse_args()
+
+    project_path = os.path.abspath(args.project_path)
+    project_name = args.project_name or detect_project_name(project_path)
+    if project_name is None:
+        sys.exit(f"❌ No <project>/settings.py found in {project_path}")
+
+    report = run_load_test(project_path, project_name, args.urls, args.concurrency, args.duration,
+                           args.server, args.workers, args.allow_4xx)
+    print_report(report)
+    print(json.dumps({key: report[key] for key in ('params', 'total', 'urls')}))
+
+    before = previous_report(project_path, report)
+    regressions = compare(before, report, args.threshold) if before else []
+    if regressions:
+        print(f"\n❌ Regression in: {', '.join(regressions)}")
+        if args.fail_on_regression:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+import os
+import re
+import sys
+import json
+import codecs
+import time
+import threading
+import subprocess
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from settings_editor import SettingsEditor
+from venv_introspect import find_venv, venv_python
+
+# Runs `manage.py migrate` with its output streamed as it happens and a JSON
+# report of how long every migration took, so slow migrations in a long
+# deploy are easy to find.
+# - Success is the process's exit code; warnings on stderr don't fail a run.
+# - Output is read in chunks and printed straight away; only the last lines
+#   are kept (for the error summary), so huge outputs don't pile up in memory.
+# - Several database aliases migrate in parallel, one process each, with
+#   their lines prefixed by the alias.
+# Reports are written to <project>/.migrate/report-<timestamp>.json.
+
+REPORT_DIR = '.migrate'
+TAIL_LINES = 20
+
+# `migrate -v 2` prints "  Applying app.0002_x... OK (0.123s)"
+APPLYING = re.compile(r'^\s*(Applying|Unapplying) (\S+)\.\.\.')
+ELAPSED = re.compile(r'\((\d+(?:\.\d+)?)s\)')
+
+_print_lock = threading.Lock()
+
+def _echo(prefix, text, end='\n'):
+    with _print_lock:
+        print(f"{prefix}{text}", end=end, flush=True)
+
+def stream(command, cwd, prefix='', on_line=None, on_partial=None):
+    """Run command, echoing its output live; returns (returncode, last lines)"""
+    env = dict(os.environ, PYTHONUNBUFFERED='1')
+    process = subprocess.Popen(command, cwd=cwd, env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+    tail = deque(maxlen=TAIL_LINES)
+    pending = ''
+    echoed = 0  # characters of `pending` already printed
+    fd = process.stdout.fileno()
+    # Keeps a multi-byte character that straddles two reads intact
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    while True:
+        chunk = os.read(fd, 65536)
+        pending += decoder.decode(chunk, final=not chunk)
+        if not chunk:
+            break
+        *lines, pending = pending.split('\n')
+        for line in lines:
+            line = line.rstrip('\r')
+            _echo('' if echoed else prefix, line[echoed:])
+            echoed = 0
+            tail.append(line)
+            if on_line:
+                on_line(line)
+        if pending and on_partial and on_partial(pending) and not prefix:
+            # e.g. "Applying x..." while x runs: show it now, finish the line later
+            # (not when several processes share the terminal)
+            _echo('' if echoed else prefix, pending[echoed:], end='')
+            echoed = len(pending)
+    if pending:
+        _echo('' if echoed else prefix, pending[echoed:])
+        tail.append(pending)
+        if on_line:
+            on_line(pending)
+    process.stdout.close()
+    return process.wait(), list(tail)
+
+def migrate_aliases(settings_path):
+    """DATABASES aliases to migrate: everything except test mirrors (read replicas)"""
+    aliases = []
+    for alias, config in SettingsEditor(settings_path).databases().items():
+        test = config.get('TEST')
+        mirror = test.get('MIRROR') if test is not None and hasattr(test, 'get') else None
+        if mirror is None:
+            aliases.append(alias)
+    return aliases or ['default']
+
+def migrate_database(project_path, python, alias, prefix='', extra_args=()):
+    """Migrate one alias; returns its part of the report"""
+    migrations = []
+    current = {}
+
+    def started(text):
+        match = APPLYING.match(text)
+        if match and current.get('name') != match.group(2):
+            current.update(name=match.group(2), started=time.perf_counter())
+        return bool(match)
+
+    def finished(line):
+        if started(line) and 'started' in current:
+            elapsed = ELAPSED.search(line)
+            seconds = float(elapsed.group(1)) if elapsed else time.perf_counter() - current['started']
+            migrations.append({'name': current['name'], 'seconds': round(seconds, 3),
+                               'ok': ' OK' in line or line.rstrip().endswith('OK')})
+            current.clear()
+
+    command = [python, 'manage.py', 'migrate', '--database', alias, '--noinput', '-v', '2', *extra_args]
+    begin = time.perf_counter()
+    returncode, tail = stream(command, project_path, prefix, on_line=finished, on_partial=started)
+    result = {
+        'alias': alias,
+        'returncode': returncode,
+        'success': returncode == 0,
+        'seconds': round(time.perf_counter() - begin, 3),
+        'migrations': migrations,
+    }
+    if 'started' in current:
+        # Interrupted while applying this one
+        result['failed_migration'] = current['name']
+    if returncode != 0:
+        result['output_tail'] = tail
+    return result
+
+def run_migrate(project_path, project_name, venv_path=None, aliases=None, extra_args=()):
+    """Migrate aliases in parallel, write the JSON report and return it"""
+    venv_path = venv_path or find_venv(project_path)
+    python = venv_python(venv_path) if venv_path else sys.executable
+    if aliases is None:
+        aliases = migrate_aliases(os.path.join(project_path, project_name, 'settings.py'))
+
+    started_at = time.strftime('%Y%m%d-%H%M%S')
+    begin = time.perf_counter()
+    print(f"\n🔄 Migrating {', '.join(aliases)}" + (" in parallel" if len(aliases) > 1 else ""))
+    with ThreadPoolExecutor(max_workers=len(aliases)) as pool:
+        results = list(pool.map(
+            lambda alias: migrate_database(project_path, python, alias,
+                                           f"[{alias}] " if len(aliases) > 1 else '', extra_args),
+            aliases))
+
+    report = {
+        'project': project_name,
+        'started': started_at,
+        'seconds': round(time.perf_counter() - begin, 3),
+        'success': all(result['success'] for result in results),
+        'databases': {result['alias']: result for result in results},
+    }
+    report_dir = os.path.join(project_path, REPORT_DIR)
+    os.makedirs(report_dir, exist_ok=True)
+    report['report_path'] = os.path.join(report_dir, f"report-{started_at}.json")
+    with open(report['report_path'], 'w') as f:
+        json.dump(report, f, indent=2)
+    return report
+
+def print_summary(report, slowest=5):
+    for alias, result in report['databases'].items():
+        icon = '✅' if result['success'] else '❌'
+        print(f"\n{icon} {alias}: {len(result['migrations'])} migration(s) in {result['seconds']:.1f}s"
+              f"{'' if result['success'] else ' (exit code ' + str(result['returncode']) + ')'}")
+        if result.get('failed_migration'):
+            print(f"   Stopped in {result['failed_migration']}")
+        for migration in sorted(result['migrations'], key=lambda m: m['seconds'], reverse=True)[:slowest]:
+            print(f"   {migration['seconds']:>9.3f}s  {migration['name']}")
+    print(f"\n📄 Report: {report['report_path']}")
+
+def main():
+    print("\n" + "="*50)
+    print("Migrate Runner".center(50))
+    print("="*50)
+
+    project_path = os.path.normpath(input("\nEnter full path to your Django project (where manage.py is): ").strip())
+    project_name = input("Enter your Django project name (folder inside project path): ").strip()
+    settings_path = os.path.join(project_path, project_name, 'settings.py')
+    if not os.path.exists(settings_path):
+        print("❌ settings.py not found")
+        return
+    default_aliases = migrate_aliases(settings_path)
+    aliases = input(f"Database aliases, comma separated [{','.join(default_aliases)}]: ").strip()
+    aliases = [alias.strip() for alias in aliases.split(',') if alias.strip()] or default_aliases
+
+    report = run_migrate(project_path, project_name, aliases=aliases)
+    print_summary(report)
+    sys.exit(0 if report['success'] else 1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,309 @@
+import os
+import sys
+import json
+import subprocess
+
+from venv_introspect import find_venv, venv_python
+
+# Looks at the pending migration plan before `migrate` and flags operations
+# that rewrite or lock tables, with a rough duration from current row counts
+# and a safer pattern for each.
+#
+# Like performance_profile.py this file has two halves:
+# - analyze_migrations() / print_report() / main(): used by the automation
+#   scripts (sql_connect.run_migrations), stdlib only.
+# - analyze(): runs *inside the project's venv* (`venv/bin/python
+#   migration_analyzer.py analyze <project_path> <settings_module> [database]`),
+#   builds the plan with Django's MigrationExecutor and prints a JSON report.
+#   Nothing is migrated.
+
+ANALYZER_SCRIPT = os.path.abspath(__file__)
+
+# Rough rows/second per kind of work on a mid-size server. Only meant to rank
+# operations and spot the ones that take minutes, not to predict exact times.
+ROWS_PER_SECOND = {
+    'rewrite': 50000,    # table copy / rebuild (ALTER with ALGORITHM=COPY)
+    'index': 200000,     # index or unique constraint build
+    'scan': 500000,      # full-table validation (NOT NULL, CHECK)
+    'data': 5000,        # row-by-row ORM backfill in RunPython
+}
+HIGH_SECONDS = 60
+MEDIUM_SECONDS = 5
+
+SUGGESTIONS = {
+    'add_not_null': "Add the column with null=True, backfill it in batches, then make it NOT NULL in a later migration",
+    'alter_type': "Add a new column, backfill it in batches and switch over, then drop the old column later",
+    'set_not_null': "Backfill the NULLs in batches first, then apply the NOT NULL change off-peak",
+    'index': "Move the index to its own migration and run it off-peak "
+             "(PostgreSQL: AddIndexConcurrently in a migration with atomic = False)",
+    'remove_field': "Stop using the field in code and deploy first, then drop the column off-peak",
+    'data': "Backfill in batches: walk pk ranges and bulk_update() a few thousand rows per transaction, "
+            "in a migration with atomic = False",
+    'mixed': "Split schema changes and data migrations into separate migrations so locks aren't held during the backfill",
+}
+
+# --- Venv side -------------------------------------------------------------------
+
+def _table_stats(connection):
+    """{table: rows}; engine estimates where a COUNT(*) would scan big tables.
+
+    Estimates of 0 (or PostgreSQL's -1 for never-analyzed tables) are often
+    just stale, so those tables are checked with EXISTS: empty ones stay 0,
+    the others become None (size unknown).
+    """
+    with connection.cursor() as cursor:
+        if connection.vendor in ('mysql', 'postgresql'):
+            if connection.vendor == 'mysql':
+                cursor.execute("SELECT TABLE_NAME, TABLE_ROWS FROM information_schema.TABLES "
+                               "WHERE TABLE_SCHEMA = DATABASE()")
+            else:
+                cursor.execute("SELECT relname, reltuples::bigint FROM pg_class "
+                               "WHERE relkind = 'r' AND relnamespace = 'public'::regnamespace")
+            stats = {}
+            for table, rows in cursor.fetchall():
+                if rows is not None and rows > 0:
+                    stats[table] = int(rows)
+                    continue
+                cursor.execute(f"SELECT EXISTS(SELECT 1 FROM {connection.ops.quote_name(table)})")
+                stats[table] = None if cursor.fetchone()[0] else 0
+            return stats
+        stats = {}
+        for table in connection.introspection.table_names(cursor):
+            cursor.execute(f"SELECT COUNT(*) FROM {connection.ops.quote_name(table)}")
+            stats[table] = cursor.fetchone()[0]
+        return stats
+
+def _model_state(state, app_label, model_name):
+    return state.models.get((app_label, model_name.lower()))
+
+def _db_table(state, app_label, model_name):
+    model_state = _model_state(state, app_label, model_name)
+    if model_state is not None and model_state.options.get('db_table'):
+        return model_state.options['db_table']
+    return f"{app_label}_{model_name.lower()}"
+
+def _has_index(field):
+    return bool(field.db_index or field.unique or field.remote_field is not None and not field.many_to_many)
+
+def _type_signature(field):
+    return (type(field).__name__, getattr(field, 'max_length', None),
+            getattr(field, 'max_digits', None), getattr(field, 'decimal_places', None))
+
+def classify(operation, app_label, state, vendor):
+    """[(kind, table, note, suggestion)] for one operation, given the state before it"""
+    from django.db.migrations import operations
+
+    name = type(operation).__name__
+    if 'Concurrently' in name:
+        return []  # e.g. AddIndexConcurrently: already the safe form
+
+    if isinstance(operation, operations.AddField):
+        field = operation.field
+        table = _db_table(state, app_label, operation.model_name)
+        if field.many_to_many:
+            return []
+        findings = []
+        if not field.null:
+            findings.append(('rewrite', table,
+                             "NOT NULL column: every existing row is filled with the default "
+                             "(a table rebuild unless the server can add it instantly)",
+                             SUGGESTIONS['add_not_null']))
+        if _has_index(field):
+            findings.append(('index', table, "builds an index for the new column", SUGGESTIONS['index']))
+        return findings
+
+    if isinstance(operation, operations.AlterField):
+        table = _db_table(state, app_label, operation.model_name)
+        model_state = _model_state(state, app_label, operation.model_name)
+        old = model_state.fields.get(operation.name) if model_state is not None else None
+        new = operation.field
+        if old is None:
+            return [('rewrite', table, "column change", SUGGESTIONS['alter_type'])]
+        findings = []
+        if _type_signature(old) != _type_signature(new):
+            findings.append(('rewrite', table, "column type or size change copies the table",
+                             SUGGESTIONS['alter_type']))
+        elif old.null and not new.null:
+            kind = 'rewrite' if vendor == 'mysql' else 'scan'
+            findings.append((kind, table, "NULL -> NOT NULL checks every row"
+                             f"{' and rebuilds the table' if kind == 'rewrite' else ''}",
+                             SUGGESTIONS['set_not_null']))
+        elif old.null != new.null and vendor == 'mysql':
+            findings.append(('rewrite', table, "changing nullability rebuilds the table on MySQL",
+                             SUGGESTIONS['alter_type']))
+        if _has_index(new) and not _has_index(old):
+            findings.append(('index', table, "adds an index or unique constraint", SUGGESTIONS['index']))
+        return findings
+
+    if isinstance(operation, operations.RemoveField):
+        if vendor != 'mysql':
+            return []  # metadata-only elsewhere
+        table = _db_table(state, app_label, operation.model_name)
+        return [('rewrite', table, "dropping a column can rebuild the table on MySQL/MariaDB",
+                 SUGGESTIONS['remove_field'])]
+
+    if isinstance(operation, (operations.AddIndex, operations.AlterUniqueTogether)) or \
+            name in ('AlterIndexTogether', 'AddConstraint'):
+        model_name = getattr(operation, 'model_name', None) or operation.name
+        table = _db_table(state, app_label, model_name)
+        if name in ('AlterUniqueTogether', 'AlterIndexTogether'):
+            option = operation.option_name
+            model_state = _model_state(state, app_label, model_name)
+            before = set(model_state.options.get(option) or ()) if model_state is not None else set()
+            if set(getattr(operation, option) or ()) <= before:
+                return []  # only removes groups
+        constraint = getattr(operation, 'constraint', None)
+        if constraint is not None and type(constraint).__name__ == 'CheckConstraint':
+            return [('scan', table, "validates the CHECK constraint against every row",
+                     "Add the constraint off-peak (PostgreSQL: NOT VALID first, then VALIDATE)")]
+        return [('index', table, "builds an index or unique constraint", SUGGESTIONS['index'])]
+
+    if isinstance(operation, (operations.RunPython, operations.RunSQL)):
+        return [('data', None, f"{name} runs arbitrary code; its cost depends on the rows it touches",
+                 SUGGESTIONS['data'])]
+
+    return []
+
+def _risk(kind, seconds):
+    if seconds is None:
+        return 'review'
+    if seconds >= HIGH_SECONDS:
+        return 'high'
+    if seconds >= MEDIUM_SECONDS:
+        return 'medium'
+    return 'low'
+
+def analyze(project_path, settings_module, database='default'):
+    os.chdir(project_path)
+    sys.path.insert(0, project_path)
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
+
+    import django
+    django.setup()
+
+    from django.db import connections
+    from django.db.migrations import operations
+    from django.db.migrations.executor import MigrationExecutor
+
+    connection = connections[database]
+    executor = MigrationExecutor(connection)
+    plan = [migration for migration, backwards in
+            executor.migration_plan(executor.loader.graph.leaf_nodes()) if not backwards]
+    rows = _table_stats(connection)
+    # Nothing to rewrite or backfill yet: data migrations on a fresh database are harmless
+    empty_database = all(count == 0 for count in rows.values())
+
+    findings = []
+    for migration in plan:
+        label = f"{migration.app_label}.{migration.name}"
+        # Django's own data migrations (contrib permissions, content types...) are small and routine
+        builtin = type(migration).__module__.startswith('django.')
+        state = executor.loader.project_state((migration.app_label, migration.name), at_end=False)
+        has_data = has_schema = False
+        for operation in migration.operations:
+            is_data = isinstance(operation, (operations.RunPython, operations.RunSQL))
+            has_data, has_schema = has_data or is_data, has_schema or not is_data
+            for kind, table, note, suggestion in classify(operation, migration.app_label, state, connection.vendor):
+                if table and table not in rows:
+                    continue  # created later in this plan: nothing to lock or copy yet
+                if kind == 'data' and builtin:
+                    continue
+                table_rows = rows.get(table) if table else None
+                if table_rows == 0 or (kind == 'data' and empty_database):
+                    seconds = 0.0  # empty table: nothing to block on
+                elif table_rows is not None:
+                    seconds = table_rows / ROWS_PER_SECOND[kind]
+                else:
+                    seconds = None
+                findings.append({
+                    'migration': label,
+                    'operation': operation.describe(),
+                    'table': table,
+                    'rows': table_rows,
+                    'kind': kind,
+                    'risk': _risk(kind, seconds),
+                    'estimated_seconds': round(seconds, 1) if seconds is not None else None,
+                    'note': note,
+                    'suggestion': suggestion,
+                })
+            operation.state_forwards(migration.app_label, state)
+        if (has_data and has_schema and migration.atomic and connection.features.can_rollback_ddl
+                and not builtin and not empty_database):
+            findings.append({
+                'migration': label, 'operation': "schema and data operations in one transaction",
+                'table': None, 'rows': None, 'kind': 'data', 'risk': 'review', 'estimated_seconds': None,
+                'note': "locks taken by the schema changes are held until the data migration finishes",
+                'suggestion': SUGGESTIONS['mixed'],
+            })
+
+    known = [finding['estimated_seconds'] for finding in findings if finding['estimated_seconds'] is not None]
+    print(json.dumps({
+        'database': database,
+        'vendor': connection.vendor,
+        'pending': [f"{migration.app_label}.{migration.name}" for migration in plan],
+        'findings': findings,
+        'estimated_seconds': round(sum(known), 1),
+    }))
+
+# --- Automation side -------------------------------------------------------------
+
+RISK_ICONS = {'high': '🔴', 'medium': '🟠', 'review': '🟡', 'low': '🟢'}
+
+def analyze_migrations(project_path, project_name, venv_path=None, database='default'):
+    """Run the analyzer in the project's venv; returns its report, or None if it failed"""
+    venv_path = venv_path or find_venv(project_path)
+    python = venv_python(venv_path) if venv_path else sys.executable
+    process = subprocess.run(
+        [python, ANALYZER_SCRIPT, 'analyze', project_path, f"{project_name}.settings", database],
+        cwd=project_path,
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    if process.returncode != 0:
+        print(f"❌ Migration analysis failed (exit code {process.returncode}); see the error output above")
+        return None
+    return json.loads(process.stdout.strip().splitlines()[-1])
+
+def needs_confirmation(report):
+    return any(finding['risk'] in ('high', 'medium', 'review') for finding in report['findings'])
+
+def print_report(report):
+    if not report['pending']:
+        print("\n✅ No pending migrations")
+        return
+    print(f"\n🔎 {len(report['pending'])} pending migration(s) on '{report['database']}' ({report['vendor']})")
+    if not report['findings']:
+        print("✅ No table rewrites, index builds or data migrations found")
+        return
+    for finding in report['findings']:
+        rows = f"{finding['rows']:,} rows" if finding['rows'] is not None else "rows unknown"
+        duration = (f"~{finding['estimated_seconds']:g}s" if finding['estimated_seconds'] is not None
+                    else "duration unknown")
+        table = f" on {finding['table']}" if finding['table'] else ""
+        print(f"\n{RISK_ICONS[finding['risk']]} {finding['risk'].upper()}  {finding['migration']}: "
+              f"{finding['operation']}{table}")
+        print(f"   {finding['note']} ({rows}, {duration})")
+        print(f"   💡 {finding['suggestion']}")
+    print(f"\n⏱️ Estimated time for the flagged operations: ~{report['estimated_seconds']:g}s")
+
+def main():
+    print("\n" + "="*50)
+    print("Migration Analyzer".center(50))
+    print("="*50)
+
+    project_path = os.path.normpath(input("\nEnter full path to your Django project (where manage.py is): ").strip())
+    project_name = input("Enter your Django project name (folder inside project path): ").strip()
+    if not os.path.exists(os.path.join(project_path, project_name, 'settings.py')):
+        print("❌ settings.py not found")
+        return
+    database = input("Database alias [default]: ").strip() or 'default'
+
+    report = analyze_migrations(project_path, project_name, database=database)
+    if report is not None:
+        print_report(report)
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == 'analyze':
+        analyze(sys.argv[2], sys.argv[3], sys.argv[4] if len(sys.argv) > 4 else 'default')
+    else:
+        main()
@@ -0,0 +1,496 @@
+import os
+import sys
+import ast
+import json
+import time
+import argparse
+
+from settings_editor import SettingsEditor
+from venv_introspect import detect_project_name
+
+# Static check for ORM query patterns that become N+1 problems in production,
+# complementing the runtime query inspector (query_inspector.py). It parses
+# the source of every project app in INSTALLED_APPS - nothing is imported or
+# run, so a whole project takes well under a second:
+#
+#     python orm_lint.py <project_path> [--min-severity medium] [--json]
+#
+# It reports
+# - loops over querysets that read foreign-key / one-to-one fields or use
+#   reverse and many-to-many managers not covered by select_related() /
+#   prefetch_related() (model relations are read from the apps' models.py)
+# - queries issued inside loops
+# - len(queryset) instead of .count(), .count() used as an existence check
+#   instead of .exists(), and .count() before iterating the same queryset
+# - queries inside template tags and filters, which run on every render
+# Findings are ranked by severity with file:line. The exit code is 1 when
+# there are findings, so it works as a pre-commit hook. Add
+# "# orm-lint: ignore" to a line to silence it.
+
+SEVERITIES = {'high': 3, 'medium': 2, 'low': 1}
+SEVERITY_ICONS = {'high': '🔴', 'medium': '🟠', 'low': '🟡'}
+IGNORE_MARKER = 'orm-lint: ignore'
+
+RELATION_FIELDS = {'ForeignKey': 'fk', 'OneToOneField': 'o2o', 'ManyToManyField': 'm2m'}
+SINGLE_KINDS = ('fk', 'o2o', 'reverse_one')
+MANY_KINDS = ('m2m', 'reverse_many')
+MANAGERS = {'objects', '_default_manager', '_base_manager'}
+# Methods that return another queryset (chains we can follow)
+QUERYSET_METHODS = {'all', 'filter', 'exclude', 'order_by', 'select_related', 'prefetch_related', 'distinct',
+                    'annotate', 'alias', 'using', 'only', 'defer', 'reverse', 'values', 'values_list',
+                    'iterator', 'select_for_update', 'none'}
+# Calls that (usually) hit the database
+QUERY_CALLS = {'get', 'filter', 'exclude', 'all', 'count', 'exists', 'first', 'last', 'aggregate', 'earliest',
+               'latest', 'in_bulk', 'values', 'values_list', 'get_or_create', 'update_or_create', 'update',
+               'delete', 'create'}
+TAG_DECORATORS = {'simple_tag', 'inclusion_tag', 'filter', 'tag'}
+# Relations of django.contrib models that project code often loops over
+BUILTIN_RELATIONS = {
+    'User': {'groups': ('m2m', 'Group'), 'user_permissions': ('m2m', 'Permission')},
+    'Group': {'permissions': ('m2m', 'Permission'), 'user_set': ('reverse_many', 'User')},
+    'Permission': {'content_type': ('fk', 'ContentType')},
+    'LogEntry': {'user': ('fk', 'User'), 'content_type': ('fk', 'ContentType')},
+}
+
+class QuerySetInfo:
+    """What a queryset expression is known to load: its model and related lookups"""
+
+    def __init__(self, model):
+        self.model = model
+        self.selected = set()
+        self.select_all = False
+        self.prefetched = set()
+        self.values = False
+
+    def copy(self):
+        info = QuerySetInfo(self.model)
+        info.selected, info.prefetched = set(self.selected), set(self.prefetched)
+        info.select_all, info.values = self.select_all, self.values
+        return info
+
+    def covers(self, path, kind):
+        lookups = set(self.prefetched)
+        if kind in SINGLE_KINDS:
+            if self.select_all and kind != 'reverse_one':
+                return True
+            lookups |= self.selected
+        return any(lookup == path or lookup.startswith(path + '__') for lookup in lookups)
+
+# --- Project discovery --------------------------------------------------------------
+
+def app_directories(project_path, project_name):
+    """Source folders of the INSTALLED_APPS that live in the project (contrib/third-party skipped)"""
+    apps = SettingsEditor(os.path.join(project_path, project_name, 'settings.py')).installed_apps()
+    directories = []
+    for entry in apps:
+        if not isinstance(entry, str):
+            continue
+        parts = entry.split('.')
+        # 'blog' and 'blog.apps.BlogConfig' both point at the blog/ folder
+        while parts:
+            candidate = os.path.join(project_path, *parts)
+            if os.path.isfile(os.path.join(candidate, '__init__.py')) or os.path.isfile(os.path.join(candidate, 'apps.py')):
+                if candidate not in directories:
+                    directories.append(candidate)
+                break
+            parts.pop()
+    return directories
+
+def source_files(app_dir):
+    for root, dirs, files in os.walk(app_dir):
+        dirs[:] = [d for d in dirs if d not in ('migrations', '__pycache__') and not d.startswith('.')]
+        for name in sorted(files):
+            if name.endswith('.py'):
+                yield os.path.join(root, name)
+
+def _name(node):
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        return node.attr
+    return None
+
+def _constant_string(node):
+    return node.value if isinstance(node, ast.Constant) and isinstance(node.value, str) else None
+
+def collect_relations(trees):
+    """{model: {attribute: (kind, target model)}} from the models modules of the apps"""
+    classes = {}
+    for app_label, tree in trees:
+        for node in ast.walk(tree):
+            if not isinstance(node, ast.ClassDef):
+                continue
+            fields = []
+            abstract = False
+            for statement in node.body:
+                if isinstance(statement, ast.ClassDef) and statement.name == 'Meta':
+                    abstract = any(isinstance(meta, ast.Assign) and _name(meta.targets[0]) == 'abstract'
+                                   and isinstance(meta.value, ast.Constant) and meta.value.value is True
+                                   for meta in statement.body)
+                target = statement.targets[0] if isinstance(statement, ast.Assign) and len(statement.targets) == 1 \
+                    else getattr(statement, 'target', None) if isinstance(statement, ast.AnnAssign) else None
+                value = getattr(statement, 'value', None)
+                if not isinstance(target, ast.Name) or not isinstance(value, ast.Call):
+                    continue
+                kind = RELATION_FIELDS.get(_name(value.func))
+                if kind is None:
+                    continue
+                keywords = {keyword.arg: keyword.value for keyword in value.keywords}
+                to = value.args[0] if value.args else keywords.get('to')
+                to_name = _constant_string(to) or _name(to)
+                if to_name is None:
+                    continue
+                to_name = node.name if to_name == 'self' else to_name.split('.')[-1]
+                fields.append((target.id, kind, to_name, _constant_string(keywords.get('related_name'))))
+            classes[node.name] = (app_label, [_name(base) for base in node.bases], fields, abstract)
+
+    relations = {model: dict(fields) for model, fields in BUILTIN_RELATIONS.items()}
+
+    def inherited(model, seen=()):
+        app_label, bases, fields, _ = classes[model]
+        found = []
+        for base in bases:
+            if base in classes and base not in seen:
+                found += inherited(base, seen + (model,))
+        return found + fields
+
+    for model, (app_label, _, _, abstract) in classes.items():
+        for name, kind, target, related_name in inherited(model):
+            relations.setdefault(model, {})[name] = (kind, target)
+            if abstract:
+                continue  # no table: the reverse accessors belong to the concrete subclasses
+            if related_name == '+' or (related_name or '').endswith('+'):
+                continue
+            if related_name:
+                reverse_name = related_name.replace('%(class)s', model.lower()).replace('%(app_label)s', app_label)
+            else:
+                reverse_name = model.lower() if kind == 'o2o' else f"{model.lower()}_set"
+            relations.setdefault(target, {})[reverse_name] = ('reverse_one' if kind == 'o2o' else 'reverse_many', model)
+    return relations
+
+# --- Checks ------------------------------------------------------------------------
+
+def _walk(node):
+    """ast.walk that doesn't descend into nested functions or classes (own scopes)"""
+    yield node
+    for child in ast.iter_child_nodes(node):
+        if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            continue
+        yield from _walk(child)
+
+def _loops(function):
+    """(target, iterable, body nodes, line) for every for-loop and comprehension, in source order"""
+    loops = []
+    for node in _walk(function):
+        if isinstance(node, (ast.For, ast.AsyncFor)):
+            loops.append((node.target, node.iter, node.body + node.orelse, node.lineno))
+        elif isinstance(node, (ast.ListComp, ast.SetComp, ast.GeneratorExp, ast.DictComp)):
+            results = [node.key, node.value] if isinstance(node, ast.DictComp) else [node.elt]
+            for index, generator in enumerate(node.generators):
+                later = [part for g in node.generators[index + 1:] for part in [g.iter, *g.ifs]]
+                loops.append((generator.target, generator.iter, results + generator.ifs + later, node.lineno))
+    return sorted(loops, key=lambda loop: loop[3])
+
+def _body_nodes(body):
+    for statement in body:
+        yield from _walk(statement)
+
+def _is_zero_arg_call(node, method):
+    return (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute) and node.func.attr == method
+            and not node.args and not node.keywords)
+
+class Linter:
+    def __init__(self, relations):
+        self.relations = relations
+        self.many_names = {name for fields in relations.values()
+                           for name, (kind, _) in fields.items() if kind in MANY_KINDS}
+        self.findings = []
+        self._reported = set()
+
+    def report(self, severity, path, node, message, hint, lines):
+        line = node.lineno
+        if IGNORE_MARKER in lines[line - 1] or (path, line, message) in self._reported:
+            return
+        self._reported.add((path, line, message))
+        self.findings.append({'severity': severity, 'path': path, 'line': line, 'message': message, 'hint': hint})
+
+    def queryset(self, node, qs_vars, loop_models):
+        """QuerySetInfo for a queryset expression, or None if it isn't (known to be) one"""
+        calls = []
+        while isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute):
+            calls.append(node)
+            node = node.func.value
+        if isinstance(node, ast.Attribute) and node.attr in MANAGERS:
+            info = QuerySetInfo(_name(node.value))
+        elif isinstance(node, ast.Name) and node.id in qs_vars:
+            info = qs_vars[node.id].copy()
+        elif (isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name) and calls
+              and node.value.id in loop_models):
+            kind, target = self.relations.get(loop_models[node.value.id], {}).get(node.attr, (None, None))
+            if kind not in MANY_KINDS:
+                return None
+            info = QuerySetInfo(target)  # related manager, e.g. order.items.all()
+        else:
+            return None
+
+        for call in reversed(calls):
+            method = call.func.attr
+            if method not in QUERYSET_METHODS:
+                return None
+            if method == 'select_related':
+                info.select_all |= not call.args
+                info.selected.update(filter(None, map(_constant_string, call.args)))
+            elif method == 'prefetch_related':
+                for arg in call.args:
+                    lookup = _constant_string(arg)
+                    if lookup is None and isinstance(arg, ast.Call) and arg.args:  # Prefetch('lookup', ...)
+                        lookup = _constant_string(arg.args[0])
+                    if lookup:
+                        info.prefetched.add(lookup)
+            elif method in ('values', 'values_list'):
+                info.values = True
+        return info
+
+    def _uncovered(self, model, attrs, info):
+        """First relation along obj.a.b... that the queryset doesn't load: (path, kind) or None"""
+        path = []
+        for index, attr in enumerate(attrs):
+            kind, target = self.relations.get(model, {}).get(attr, (None, None))
+            if kind is None:
+                return None
+            path.append(attr)
+            lookup = '__'.join(path)
+            if kind in MANY_KINDS:
+                # obj.tags alone is just the manager; obj.tags.all() etc. runs the query
+                if index + 1 < len(attrs) and not info.covers(lookup, kind):
+                    return lookup, kind
+                return None
+            if not info.covers(lookup, kind):
+                return lookup, kind
+            model = target
+        return None
+
+    def check_function(self, function, path, lines):
+        qs_vars, loop_models = {}, {}
+        assignments = sorted((node for node in _walk(function) if isinstance(node, ast.Assign)
+                              and len(node.targets) == 1 and isinstance(node.targets[0], ast.Name)),
+                             key=lambda node: node.lineno)
+        for node in assignments:
+            info = self.queryset(node.value, qs_vars, loop_models)
+            if info is not None:
+                qs_vars[node.targets[0].id] = info
+        loops = _loops(function)
+        iterated = {_name(iterable) if isinstance(iterable, ast.Name) else _name(iterable.func.value)
+                    for _, iterable, _, _ in loops
+                    if isinstance(iterable, ast.Name) or _is_zero_arg_call(iterable, 'all')}
+
+        for target, iterable, body, line in loops:
+            info = self.queryset(iterable, qs_vars, loop_models)
+            variable = target.id if isinstance(target, ast.Name) else None
+            if info is not None and variable and not info.values:
+                loop_models[variable] = info.model
+            body_nodes = list(_body_nodes(body))
+            if variable:
+                self._check_loop_relations(variable, info, body_nodes, line, path, lines)
+            self._check_queries_in_loop(body_nodes, qs_vars, loop_models, path, lines)
+
+        self._check_counting(function, qs_vars, loop_models, iterated, path, lines)
+
+    def _check_loop_relations(self, variable, info, body_nodes, loop_line, path, lines):
+        known = info is not None and not info.values and info.model in self.relations
+        seen = set()  # one finding per relation and loop
+        for node in body_nodes:
+            if not isinstance(node, ast.Attribute):
+                continue
+            attrs = []
+            base = node
+            while isinstance(base, ast.Attribute):
+                attrs.insert(0, base.attr)
+                base = base.value
+            if not (isinstance(base, ast.Name) and base.id == variable):
+                continue
+            if known:
+                uncovered = self._uncovered(info.model, attrs, info)
+                if uncovered and uncovered not in seen:
+                    seen.add(uncovered)
+                    lookup, kind = uncovered
+                    method = 'prefetch_related' if kind in MANY_KINDS else 'select_related'
+                    self.report('high', path, node,
+                                f"N+1: loop over {info.model} (line {loop_line}) reads "
+                                f"{variable}.{lookup.replace('__', '.')}, one query per row",
+                                f"add .{method}('{lookup}') to the queryset", lines)
+            elif len(attrs) >= 2 and attrs[0] in self.many_names and attrs[1] in QUERY_CALLS and attrs[0] not in seen:
+                seen.add(attrs[0])
+                self.report('medium', path, node,
+                            f"Possible N+1: {variable}.{attrs[0]}.{attrs[1]}() runs a query on every "
+                            f"iteration (line {loop_line})",
+                            f"prefetch_related('{attrs[0]}') on the queryset being looped over", lines)
+
+    def _check_queries_in_loop(self, body_nodes, qs_vars, loop_models, path, lines):
+        chained = set()  # Model.objects.filter(...).first() is one query, reported once
+        for node in body_nodes:
+            if node in chained or not (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute)
+                                       and node.func.attr in QUERY_CALLS):
+                continue
+            receiver = node.func.value
+            while isinstance(receiver, ast.Call) and isinstance(receiver.func, ast.Attribute):
+                chained.add(receiver)
+                receiver = receiver.func.value
+            if isinstance(receiver, ast.Attribute) and receiver.attr in MANAGERS:
+                model = _name(receiver.value)
+            elif isinstance(receiver, ast.Name) and receiver.id in qs_vars:
+                model = qs_vars[receiver.id].model
+            else:
+                continue
+            if node.func.attr == 'create':
+                self.report('low', path, node, f"{model}.objects.create() inside a loop, one INSERT per row",
+                            "collect the objects and use bulk_create()", lines)
+            else:
+                self.report('medium', path, node, f"Query on {model} inside a loop ({node.func.attr}())",
+                            "fetch the rows once before the loop (filter(..__in=...), in_bulk() or a dict)", lines)
+
+    def _is_queryset(self, node, qs_vars, loop_models):
+        if self.queryset(node, qs_vars, loop_models) is not None:
+            return True
+        # obj.items.all() on an untyped object: a related manager by its name
+        return (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute)
+                and node.func.attr in QUERYSET_METHODS and isinstance(node.func.value, ast.Attribute)
+                and node.func.value.attr in self.many_names)
+
+    def _check_counting(self, function, qs_vars, loop_models, iterated, path, lines):
+        existence = set()
+        for node in _walk(function):
+            tests = []
+            if isinstance(node, (ast.If, ast.While, ast.IfExp)):
+                tests.append(node.test.operand if isinstance(node.test, ast.UnaryOp) else node.test)
+            elif isinstance(node, ast.BoolOp):
+                tests += node.values
+            for test in tests:
+                if _is_zero_arg_call(test, 'count'):
+                    existence.add(test)
+            if isinstance(node, ast.Compare) and len(node.ops) == 1:
+                op, right = node.ops[0], node.comparators[0]
+                if isinstance(right, ast.Constant) and (
+                        (right.value == 0 and isinstance(op, (ast.Gt, ast.NotEq, ast.Eq, ast.LtE)))
+                        or (right.value == 1 and isinstance(op, (ast.GtE, ast.Lt)))):
+                    existence.add(node.left)
+
+        for node in _walk(function):
+            if not isinstance(node, ast.Call):
+                continue
+            if isinstance(node.func, ast.Name) and node.func.id == 'len' and len(node.args) == 1:
+                arg = node.args[0]
+                if not self._is_queryset(arg, qs_vars, loop_models) or _name(arg) in iterated:
+                    continue  # len() of a queryset that gets iterated anyway reuses its cache
+                if node in existence:
+                    self.report('medium', path, node, "len(queryset) used as an existence check loads every row",
+                                "use .exists()", lines)
+                else:
+                    self.report('medium', path, node, "len(queryset) loads every row just to count them",
+                                "use .count() (SELECT COUNT(*))", lines)
+            elif _is_zero_arg_call(node, 'count'):
+                receiver = node.func.value
+                variable = receiver.id if isinstance(receiver, ast.Name) and receiver.id in qs_vars else None
+                if node in existence:
+                    hint = (f"use 'if {variable}:', which evaluates once for the loop too" if variable in iterated
+                            else "use .exists(), which stops at the first row")
+                    self.report('medium', path, node, ".count() used as an existence check", hint, lines)
+                elif variable in iterated:
+                    self.report('low', path, node,
+                                f"{variable}.count() and then iterating {variable} runs two queries",
+                                f"iterate first and use len({variable}), or count in the loop", lines)
+
+    def check_template_tags(self, tree, path, lines):
+        for function in ast.walk(tree):
+            if not isinstance(function, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                continue
+            kinds = [_name(decorator.func if isinstance(decorator, ast.Call) else decorator)
+                     for decorator in function.decorator_list]
+            kind = next((kind for kind in kinds if kind in TAG_DECORATORS), None)
+            if kind is None:
+                continue
+            params = {arg.arg for arg in function.args.args}
+            for node in _walk(function):
+                if not (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute)):
+                    continue
+                receiver = node.func.value
+                while isinstance(receiver, ast.Call) and isinstance(receiver.func, ast.Attribute):
+                    receiver = receiver.func.value
+                manager_query = isinstance(receiver, ast.Attribute) and receiver.attr in MANAGERS
+                related_query = (isinstance(receiver, ast.Attribute) and receiver.attr in self.many_names
+                                 and isinstance(receiver.value, ast.Name) and receiver.value.id in params
+                                 and node.func.attr in QUERY_CALLS)
+                if not (manager_query or related_query):
+                    continue
+                # Filters are mostly applied per item inside {% for %}
+                self.report('high' if kind == 'filter' else 'medium', path, node,
+                            f"Query inside template {'filter' if kind == 'filter' else 'tag'} "
+                            f"'{function.name}', run on every render and every {{% for %}} iteration",
+                            "compute it in the view (with select/prefetch_related) and pass it in the context",
+                            lines)
+                break  # one finding per tag is enough
+
+    def check_file(self, tree, path, lines):
+        for node in ast.walk(tree):
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                self.check_function(node, path, lines)
+        if 'templatetags' in path.split(os.sep):
+            self.check_template_tags(tree, path, lines)
+
+def lint_project(project_path, project_name=None):
+    """(findings ranked by severity, number of files scanned)"""
+    project_name = project_name or detect_project_name(project_path)
+    parsed, model_trees = [], []
+    for app_dir in app_directories(project_path, project_name):
+        for path in source_files(app_dir):
+            with open(path, encoding='utf-8') as f:
+                source = f.read()
+            try:
+                tree = ast.parse(source, path)
+            except SyntaxError as e:
+                print(f"⚠️ Skipping {path}: {e}")
+                continue
+            relative = os.path.relpath(path, project_path)
+            parsed.append((tree, relative, source.splitlines()))
+            if os.path.basename(path) == 'models.py' or os.path.basename(os.path.dirname(path)) == 'models':
+                model_trees.append((os.path.basename(app_dir), tree))
+
+    linter = Linter(collect_relations(model_trees))
+    for tree, relative, lines in parsed:
+        linter.check_file(tree, relative, lines)
+    findings = sorted(linter.findings, key=lambda f: (-SEVERITIES[f['severity']], f['path'], f['line']))
+    return findings, len(parsed)
+
+def print_findings(findings, files, seconds):
+    for finding in findings:
+        print(f"{SEVERITY_ICONS[finding['severity']]} {finding['path']}:{finding['line']}  {finding['message']}")
+        print(f"   ↳ {finding['hint']}")
+    counts = ', '.join(f"{sum(f['severity'] == level for f in findings)} {level}" for level in SEVERITIES)
+    status = "✅ No ORM issues found" if not findings else f"❌ {len(findings)} finding(s) ({counts})"
+    print(f"\n{status} in {files} files ({seconds:.2f}s)")
+
+def main():
+    parser = argparse.ArgumentParser(description="Find N+1 and other ORM query patterns in a Django project")
+    parser.add_argument('project_path', nargs='?', default='.')
+    parser.add_argument('--project-name', help="Folder with settings.py (detected if omitted)")
+    parser.add_argument('--min-severity', choices=list(SEVERITIES), default='low',
+                        help="Report (and fail on) findings at this level or above")
+    parser.add_argument('--json', action='store_true', help="Print the findings as JSON")
+    args = parser.parse_args()
+
+    project_path = os.path.abspath(args.project_path)
+    project_name = args.project_name or detect_project_name(project_path)
+    if project_name is None:
+        sys.exit(f"❌ No <project>/settings.py found in {project_path}")
+
+    started = time.perf_counter()
+    findings, files = lint_project(project_path, project_name)
+    findings = [f for f in findings if SEVERITIES[f['severity']] >= SEVERITIES[args.min_severity]]
+    if args.json:
+        print(json.dumps(findings, indent=2))
+    else:
+        print_findings(findings, files, time.perf_counter() - started)
+    sys.exit(1 if findings else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+import os
+import glob
+import stat
+import hashlib
+
+from starter_paths import starter_dir
+
+# Content-addressed store shared by all project venvs. Every distribution file
+# in a venv's site-packages is hardlinked to store/objects/<aa>/<sha256>, so
+# identical files across hundreds of venvs occupy disk (and page cache) once.
+#
+# Files are replaced, never modified in place, by pip and by Python when it
+# rewrites .pyc files, so sharing inodes between venvs is safe. An object whose
+# only remaining link is the store itself is garbage.
+STORE_ROOT = starter_dir('store', 'objects')
+
+def _sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def object_path(path, st):
+    """Store location for a file; the executable bit is part of the key because links share modes"""
+    key = _sha256(path) + ('-x' if st.st_mode & stat.S_IXUSR else '')
+    return os.path.join(STORE_ROOT, key[:2], key)
+
+def site_packages_dirs(venv_path):
+    return glob.glob(os.path.join(venv_path, 'lib', 'python*', 'site-packages'))
+
+def find_venvs(base_path):
+    """Yield every venv (folder with pyvenv.cfg) below base_path"""
+    for root, dirs, files in os.walk(base_path):
+        if 'pyvenv.cfg' in files:
+            yield root
+            dirs[:] = []
+
+def link_venv(venv_path):
+    """Replace the venv's distribution files with hardlinks into the store.
+
+    Returns a dict with counts of linked, already shared and skipped files and
+    the bytes released by this run.
+    """
+    stats = {'linked': 0, 'shared': 0, 'skipped': 0, 'bytes_saved': 0}
+
+    for site_packages in site_packages_dirs(venv_path):
+        for root, dirs, files in os.walk(site_packages):
+            for name in files:
+                path = os.path.join(root, name)
+                st = os.lstat(path)
+                if not stat.S_ISREG(st.st_mode):
+                    continue
+
+                target = object_path(path, st)
+                try:
+                    if not os.path.exists(target):
+                        # First copy of this content becomes the store object
+                        os.makedirs(os.path.dirname(target), exist_ok=True)
+                        os.link(path, target)
+                        stats['linked'] += 1
+                        continue
+
+                    if os.path.samefile(path, target):
+                        stats['shared'] += 1
+                        continue
+
+                    # Link next to the file and swap atomically so the venv
+                    # never sees a missing file.
+                    tmp_path = f"{path}.store-{os.getpid()}"
+                    os.link(target, tmp_path)
+                    os.replace(tmp_path, path)
+                    stats['linked'] += 1
+                    stats['bytes_saved'] += st.st_size
+                except OSError:
+                    # Store on another filesystem, read-only venv, ...
+                    stats['skipped'] += 1
+
+    return stats
+
+def collect_garbage():
+    """Delete store objects no venv links to anymore. Returns (objects, bytes) removed"""
+    removed = 0
+    freed = 0
+    for shard in os.listdir(STORE_ROOT):
+        shard_path = os.path.join(STORE_ROOT, shard)
+        for name in os.listdir(shard_path):
+            path = os.path.join(shard_path, name)
+            st = os.stat(path)
+            if st.st_nlink == 1:
+                os.remove(path)
+                removed += 1
+                freed += st.st_size
+        if not os.listdir(shard_path):
+            os.rmdir(shard_path)
+    return removed, freed
+
+def store_report():
+    """Compare store usage with what the same venvs would use as plain copies"""
+    report = {'objects': 0, 'references': 0, 'store_bytes': 0, 'plain_bytes': 0, 'garbage_objects': 0}
+    for shard in os.listdir(STORE_ROOT):
+        shard_path = os.path.join(STORE_ROOT, shard)
+        for name in os.listdir(shard_path):
+            st = os.stat(os.path.join(shard_path, name))
+            references = st.st_nlink - 1
+            report['objects'] += 1
+            if references == 0:
+                report['garbage_objects'] += 1
+            report['references'] += references
+            report['store_bytes'] += st.st_size
+            report['plain_bytes'] += st.st_size * references
+    report['saved_bytes'] = max(report['plain_bytes'] - report['store_bytes'], 0)
+    return report
+
+def format_size(num_bytes):
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if num_bytes < 1024 or unit == 'GB':
+            return f"{num_bytes:.1f} {unit}" if unit != 'B' else f"{num_bytes} B"
+        num_bytes /= 1024
+
+def main():
+    print("\n" + "="*50)
+    print("Shared Package Store".center(50))
+    print("="*50)
+    print(f"Store: {STORE_ROOT}")
+
+    while True:
+        print("\nChoose an option:")
+        print("1. Link venvs into the store (project folder or folder of projects)")
+        print("2. Garbage-collect unused store objects")
+        print("3. Show disk savings report")
+        print("4. Exit")
+
+        choice = input("Enter your choice (1/2/3/4): ").strip()
+
+        if choice == '1':
+            base_path = input("Enter folder to scan for venvs: ").strip()
+            if not os.path.isdir(base_path):
+                print(f"❌ Folder not found: {base_path}")
+                continue
+            venvs = list(find_venvs(base_path))
+            if not venvs:
+                print("ℹ️ No venvs found.")
+            for venv_path in venvs:
+                stats = link_venv(venv_path)
+                print(f"✅ {venv_path}: {stats['linked']} linked, {stats['shared']} already shared, "
+                      f"{stats['skipped']} skipped, {format_size(stats['bytes_saved'])} released")
+        elif choice == '2':
+            removed, freed = collect_garbage()
+            print(f"🧹 Removed {removed} unused objects ({format_size(freed)})")
+        elif choice == '3':
+            report = store_report()
+            print(f"\n📊 {report['objects']} objects referenced {report['references']} times")
+            print(f"Plain venvs would use: {format_size(report['plain_bytes'])}")
+            print(f"Store uses:            {format_size(report['store_bytes'])}")
+            print(f"Saved:                 {format_size(report['saved_bytes'])}")
+            if report['garbage_objects']:
+                print(f"ℹ️ {report['garbage_objects']} unreferenced objects can be garbage-collected")
+        elif choice == '4':
+            print("Goodbye!")
+            break
+        else:
+            print("Invalid choice. Please select 1, 2, 3 or 4.")
+
+if __name__ == "__main__":
+    main()
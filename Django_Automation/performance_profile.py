@@ -0,0 +1,268 @@
+import os
+import sys
+import json
+import time
+import subprocess
+
+from settings_editor import SettingsEditor, Raw
+from venv_introspect import find_venv, venv_python, installed_version, version_tuple
+
+# Opt-in production performance profile for a project's settings.py, with a
+# benchmark that measures a sample page before and after applying it.
+#
+# Like django_worker.py this file has two halves:
+# - apply_profile() / main(): used by the automation scripts, stdlib only.
+# - bench(): runs *inside the project's venv* (`venv/bin/python
+#   performance_profile.py bench <project_path> <settings_module> <url> <requests>`)
+#   and drives the page through Django's test client, so the numbers cover
+#   the full middleware/view/template stack without network noise.
+
+PROFILE_SCRIPT = os.path.abspath(__file__)
+
+CACHED_LOADERS = [
+    ('django.template.loaders.cached.Loader', [
+        'django.template.loaders.filesystem.Loader',
+        'django.template.loaders.app_directories.Loader',
+    ]),
+]
+CONN_MAX_AGE = 600
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+SECURITY_MIDDLEWARE = 'django.middleware.security.SecurityMiddleware'
+GZIP_MIDDLEWARE = 'django.middleware.gzip.GZipMiddleware'
+MANIFEST_STORAGE = 'django.contrib.staticfiles.storage.ManifestStaticFilesStorage'
+
+# Middleware that only does work for an app that may not be installed
+MIDDLEWARE_APPS = {
+    'django.contrib.sessions.middleware.SessionMiddleware': 'django.contrib.sessions',
+    'django.contrib.auth.middleware.AuthenticationMiddleware': 'django.contrib.auth',
+    'django.contrib.messages.middleware.MessageMiddleware': 'django.contrib.messages',
+}
+
+DEFAULT_URL = '/admin/login/'
+DEFAULT_REQUESTS = 500
+WARMUP_REQUESTS = 20
+
+# --- Settings profile ------------------------------------------------------------
+
+def _update(mapping, key, value):
+    """Set mapping[key] unless it already holds value; True if it changed"""
+    current = mapping.get(key)
+    if current is not None and current.python() == value:
+        return False
+    mapping[key] = value
+    return True
+
+def _update_setting(editor, name, value):
+    if name in editor and editor.get(name) == value:
+        return False
+    editor.set(name, value)
+    return True
+
+def apply_profile(settings_path, django_version, remove_middleware=(), editor=None):
+    """Apply the performance profile; returns a list of what changed.
+
+    `django_version` is a version tuple such as (5, 2); settings that only
+    exist on newer releases (CONN_HEALTH_CHECKS, STORAGES) are chosen by it.
+    Pass a SettingsEditor to batch this with other edits; the caller saves it.
+    """
+    if editor is None:
+        with SettingsEditor(settings_path) as editor:
+            return apply_profile(settings_path, django_version, remove_middleware, editor)
+
+    changes = []
+    apps = editor.installed_apps()
+
+    # Cached template loaders; Django refuses `loaders` together with APP_DIRS
+    backend = editor.django_templates()
+    options = backend.setdefault('OPTIONS', {})
+    if _update(options, 'loaders', CACHED_LOADERS):
+        changes.append("cached template loaders")
+    backend.pop('APP_DIRS')
+
+    # Persistent database connections, checked before reuse where supported
+    for alias, config in editor.databases().items():
+        changed = _update(config, 'CONN_MAX_AGE', CONN_MAX_AGE)
+        if django_version >= (4, 1):
+            changed = _update(config, 'CONN_HEALTH_CHECKS', True) or changed
+        if changed:
+            changes.append(f"persistent connections for '{alias}' database")
+
+    if 'django.contrib.sessions' in apps and _update_setting(editor, 'SESSION_ENGINE', SESSION_ENGINE):
+        changes.append("cached_db sessions")
+
+    # GZip as early as possible so it compresses what the rest produce
+    middleware = editor.setdefault('MIDDLEWARE', [])
+    if SECURITY_MIDDLEWARE in middleware:
+        added = editor.add_middleware(GZIP_MIDDLEWARE, after=SECURITY_MIDDLEWARE)
+    else:
+        added = editor.add_middleware(GZIP_MIDDLEWARE, position=0)
+    if added:
+        changes.append("GZip middleware")
+
+    # Hashed static file names so browsers can cache them forever
+    editor.ensure_import('import os')
+    if 'STATIC_ROOT' not in editor:
+        editor.set('STATIC_ROOT', Raw("os.path.join(BASE_DIR, 'staticfiles')"))
+        changes.append("STATIC_ROOT for collectstatic")
+    if django_version >= (4, 2):
+        editor.remove('STATICFILES_STORAGE')  # Django rejects it alongside STORAGES
+        if 'STORAGES' in editor:
+            storages = editor.value('STORAGES')
+            changed = _update(storages, 'staticfiles', {'BACKEND': MANIFEST_STORAGE})
+        else:
+            changed = _update_setting(editor, 'STORAGES', {
+                'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+                'staticfiles': {'BACKEND': MANIFEST_STORAGE},
+            })
+    else:
+        changed = _update_setting(editor, 'STATICFILES_STORAGE', MANIFEST_STORAGE)
+    if changed:
+        changes.append("ManifestStaticFilesStorage")
+
+    # Middleware for apps that aren't installed, plus anything asked for
+    unneeded = [path for path, app in MIDDLEWARE_APPS.items() if app not in apps]
+    for path in [*unneeded, *remove_middleware]:
+        if editor.remove_middleware(path):
+            changes.append(f"removed {path.rsplit('.', 1)[-1]}")
+
+    return changes
+
+# --- Benchmark (runs inside the project venv) ------------------------------------
+
+def _percentile(sorted_values, percent):
+    index = max(0, min(len(sorted_values) - 1, round(percent / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+def bench(project_path, settings_module, url, requests):
+    os.chdir(project_path)
+    sys.path.insert(0, project_path)
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
+
+    import django
+    django.setup()
+    from django.conf import settings
+    from django.test import Client
+
+    # The test client talks to 'testserver', which ALLOWED_HOSTS may not list
+    settings.ALLOWED_HOSTS = [*settings.ALLOWED_HOSTS, 'testserver']
+    client = Client(HTTP_ACCEPT_ENCODING='gzip')
+
+    for _ in range(WARMUP_REQUESTS):
+        response = client.get(url)
+        if response.status_code >= 400:
+            raise SystemExit(f"GET {url} returned {response.status_code}")
+
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(requests):
+        request_started = time.perf_counter()
+        response = client.get(url)
+        latencies.append(time.perf_counter() - request_started)
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    body = b''.join(response) if response.streaming else response.content
+    print(json.dumps({
+        'url': url,
+        'requests': requests,
+        'rps': round(requests / elapsed, 1),
+        'p50_ms': round(_percentile(latencies, 50) * 1000, 2),
+        'p95_ms': round(_percentile(latencies, 95) * 1000, 2),
+        'p99_ms': round(_percentile(latencies, 99) * 1000, 2),
+        'bytes': len(body),
+        'gzip': response.get('Content-Encoding') == 'gzip',
+    }))
+
+# --- Client side ---------------------------------------------------------------
+
+def run_benchmark(project_path, project_name, url=DEFAULT_URL, requests=DEFAULT_REQUESTS):
+    """Benchmark url in a fresh interpreter; returns the result dict or None"""
+    python_path = venv_python(find_venv(project_path))
+    result = subprocess.run(
+        [python_path, PROFILE_SCRIPT, 'bench', project_path, f"{project_name}.settings", url, str(requests)],
+        cwd=project_path,
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    if result.returncode != 0:
+        print(f"❌ Benchmark failed (exit code {result.returncode}); see the error output above")
+        return None
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def print_comparison(before, after):
+    rows = [
+        ("Requests/sec", 'rps', True),
+        ("Latency p50 (ms)", 'p50_ms', False),
+        ("Latency p95 (ms)", 'p95_ms', False),
+        ("Latency p99 (ms)", 'p99_ms', False),
+        ("Response bytes", 'bytes', False),
+    ]
+    print(f"\n{'Metric':<20}{'Before':>12}{'After':>12}{'Change':>10}")
+    print("-" * 54)
+    for label, key, higher_is_better in rows:
+        old, new = before[key], after[key]
+        change = (new - old) / old * 100 if old else 0.0
+        marker = "✅" if (change > 0) == higher_is_better and change else "  "
+        print(f"{label:<20}{old:>12}{new:>12}{change:>+9.1f}% {marker}")
+
+def apply_profile_and_benchmark(project_path, project_name):
+    settings_path = os.path.join(project_path, project_name, 'settings.py')
+    if not os.path.exists(settings_path):
+        print(f"❌ settings.py not found at {settings_path}")
+        return
+
+    venv_path = find_venv(project_path)
+    django_version = installed_version(venv_path, 'Django') if venv_path else None
+    if not django_version:
+        print("❌ No virtual environment with Django found in the project folder")
+        return
+
+    remove = input("Extra middleware to remove (comma separated dotted paths, blank for none): ").strip()
+    remove_middleware = [path.strip() for path in remove.split(',') if path.strip()]
+
+    benchmark = input("Benchmark a sample page before and after? (y/n) [y]: ").strip().lower() != 'n'
+    if benchmark:
+        url = input(f"Sample page URL [{DEFAULT_URL}]: ").strip() or DEFAULT_URL
+        requests = input(f"Requests per run [{DEFAULT_REQUESTS}]: ").strip()
+        requests = int(requests) if requests.isdigit() else DEFAULT_REQUESTS
+        print(f"\n⏱️ Benchmarking {url} with stock settings...")
+        before = run_benchmark(project_path, project_name, url, requests)
+
+    try:
+        changes = apply_profile(settings_path, version_tuple(django_version), remove_middleware)
+    except SyntaxError as e:
+        print(f"❌ Could not parse settings.py: {e}")
+        return
+    if not changes:
+        print("\n✅ Performance profile already applied")
+    else:
+        print("\n✅ Performance profile applied:")
+        for change in changes:
+            print(f"   • {change}")
+
+    # Manifest storage serves hashed names from STATIC_ROOT, so collect them now
+    print("\n📦 Collecting static files...")
+    manage_py = os.path.join(project_path, 'manage.py')
+    subprocess.run([venv_python(venv_path), manage_py, 'collectstatic', '--noinput', '-v', '0'],
+                   cwd=project_path, check=False)
+
+    if benchmark and before:
+        print(f"\n⏱️ Benchmarking {url} with the performance profile...")
+        after = run_benchmark(project_path, project_name, url, requests)
+        if after:
+            print_comparison(before, after)
+
+def main():
+    print("\n" + "="*50)
+    print("Django Performance Profile".center(50))
+    print("="*50)
+
+    project_path = os.path.normpath(input("\nEnter full path to your Django project (where manage.py is): ").strip())
+    project_name = input("Enter your Django project name (folder inside project path): ").strip()
+    apply_profile_and_benchmark(project_path, project_name)
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == 'bench':
+        bench(sys.argv[2], sys.argv[3], sys.argv[4], int(sys.argv[5]))
+    else:
+        main()
@@ -0,0 +1,205 @@
+import os
+import json
+import time
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+# Small dependency-graph executor for bootstrap steps. Steps are mostly
+# subprocess- or I/O-bound, so threads are enough to overlap them; a step
+# starts as soon as everything it requires has finished.
+#
+# Steps that declare `inputs` are checkpointed: once a step succeeds, its
+# fingerprint (its inputs plus the fingerprints of the steps it requires) is
+# recorded, and a later run skips it while the fingerprint is unchanged, its
+# `outputs` still exist and none of the checkpointed steps it requires had to
+# run again. Steps without `inputs` are cheap and idempotent and always run.
+
+CHECKPOINT_FILE = os.path.join('.bootstrap', 'checkpoints.json')
+# Reserved records next to the step fingerprints: when the bootstrap started
+# and finished, and which paths its own steps created (safe to clean up)
+STARTED, COMPLETE, CREATED = '@started', '@complete', '@created'
+
+class Step:
+    def __init__(self, name, func, requires=(), inputs=None, outputs=()):
+        self.name = name
+        self.func = func
+        self.requires = tuple(requires)
+        # Callable returning JSON-serialisable inputs, evaluated right before
+        # the step would run (so it can look at what earlier steps produced).
+        self.inputs = inputs
+        self.outputs = tuple(outputs)
+
+    def __repr__(self):
+        return f"Step({self.name!r}, requires={self.requires!r})"
+
+class PipelineError(Exception):
+    def __init__(self, step_name, error):
+        super().__init__(f"step '{step_name}' failed: {error}")
+        self.step_name = step_name
+        self.error = error
+
+class CheckpointStore:
+    """Step fingerprints recorded in <project>/.bootstrap/checkpoints.json"""
+
+    def __init__(self, project_path):
+        self.path = os.path.join(project_path, CHECKPOINT_FILE)
+        self._lock = threading.Lock()
+        try:
+            with open(self.path, 'r') as f:
+                self.records = json.load(f)
+        except (OSError, ValueError):
+            self.records = {}
+
+    def is_current(self, step, fingerprint):
+        record = self.records.get(step.name)
+        return (record is not None and record['fingerprint'] == fingerprint
+                and all(os.path.exists(path) for path in step.outputs))
+
+    def record(self, step, fingerprint):
+        with self._lock:
+            self.records[step.name] = {'fingerprint': fingerprint, 'finished_at': time.time()}
+            self._save()
+
+    def mark_started(self):
+        """Recorded before the first step, so a run that fails straight away can still be resumed"""
+        with self._lock:
+            self.records.pop(COMPLETE, None)
+            self.records.setdefault(STARTED, time.time())
+            self._save()
+
+    def mark_complete(self):
+        with self._lock:
+            self.records[COMPLETE] = time.time()
+            self._save()
+
+    @property
+    def complete(self):
+        return COMPLETE in self.records
+
+    def created_paths(self, key):
+        return list(self.records.get(CREATED, {}).get(key, []))
+
+    def record_created(self, key, paths):
+        """Paths a step is about to create; a retry of that step may remove exactly these"""
+        with self._lock:
+            self.records.setdefault(CREATED, {})[key] = list(paths)
+            self._save()
+
+    def _save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.records, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+def has_checkpoints(project_path):
+    """True for a folder left by an unfinished bootstrap (finished projects are never resumed)"""
+    if not os.path.exists(os.path.join(project_path, CHECKPOINT_FILE)):
+        return False
+    store = CheckpointStore(project_path)
+    return STARTED in store.records and not store.complete
+
+def _fingerprint(step, inputs, fingerprints):
+    payload = json.dumps([step.name, inputs, [fingerprints.get(name, '') for name in step.requires]],
+                         sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+def _check_graph(steps):
+    names = {step.name for step in steps}
+    if len(names) != len(steps):
+        raise ValueError("Step names must be unique")
+    for step in steps:
+        missing = [name for name in step.requires if name not in names]
+        if missing:
+            raise ValueError(f"Step '{step.name}' requires unknown steps: {', '.join(missing)}")
+
+    # Kahn's algorithm, only to reject cycles before anything runs
+    remaining = {step.name: set(step.requires) for step in steps}
+    while remaining:
+        ready = [name for name, requires in remaining.items() if not requires]
+        if not ready:
+            raise ValueError(f"Dependency cycle between steps: {', '.join(sorted(remaining))}")
+        for name in ready:
+            del remaining[name]
+        for requires in remaining.values():
+            requires.difference_update(ready)
+
+def run_steps(steps, max_workers=None, timings=None, checkpoints=None):
+    """Run steps concurrently in dependency order.
+
+    Returns {step name: seconds}. On the first failure no new steps are
+    started, running ones are allowed to finish, and PipelineError is raised.
+    With a CheckpointStore, completed steps whose fingerprint is unchanged
+    are skipped (timed as 0s).
+    """
+    _check_graph(steps)
+    timings = {} if timings is None else timings
+    pending = {step.name: step for step in steps}
+    done = set()
+    running = {}
+    failure = None
+    fingerprints = {}
+    executed = set()
+
+    def timed(step):
+        started = time.perf_counter()
+        try:
+            if checkpoints is not None and step.inputs is not None:
+                fingerprint = _fingerprint(step, step.inputs(), fingerprints)
+                fingerprints[step.name] = fingerprint
+                upstream_ran = any(name in executed for name in step.requires)
+                if not upstream_ran and checkpoints.is_current(step, fingerprint):
+                    print(f"↷ Skipping '{step.name}' (unchanged since last run)")
+                    return
+                executed.add(step.name)
+                step.func()
+                checkpoints.record(step, fingerprint)
+            else:
+                if any(name in executed for name in step.requires):
+                    executed.add(step.name)
+                step.func()
+        finally:
+            timings[step.name] = round(time.perf_counter() - started, 3)
+
+    max_workers = max_workers or min(len(steps), (os.cpu_count() or 1) + 2) or 1
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        while pending or running:
+            if failure is None:
+                for name, step in list(pending.items()):
+                    if all(required in done for required in step.requires):
+                        running[pool.submit(timed, step)] = step
+                        del pending[name]
+
+            if not running:
+                break
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                step = running.pop(future)
+                try:
+                    future.result()
+                    done.add(step.name)
+                except Exception as e:
+                    if failure is None:
+                        failure = PipelineError(step.name, e)
+
+            if failure is not None:
+                pending.clear()
+
+    if failure is not None:
+        raise failure
+    return timings
+
+def critical_path_seconds(steps, timings):
+    """Longest chain of step timings through the graph (the best possible wall time)"""
+    by_name = {step.name: step for step in steps}
+    finish = {}
+
+    def finish_time(name):
+        if name not in finish:
+            step = by_name[name]
+            finish[name] = timings.get(name, 0.0) + max((finish_time(r) for r in step.requires), default=0.0)
+        return finish[name]
+
+    return max((finish_time(step.name) for step in steps), default=0.0)
@@ -0,0 +1,215 @@
+import os
+
+from settings_editor import SettingsEditor, Raw
+
+# Development middleware for generated projects: records every SQL query of a
+# request, groups them by shape (literals and IN lists stripped), flags N+1
+# patterns with the line of project code that issued them, and enforces
+# per-view query budgets when tests run. Written to
+# <project>/query_inspector.py and configured through QUERY_INSPECTOR in
+# settings.py; reports go to the console and to a JSON Lines file.
+
+INSPECTOR_MODULE = 'query_inspector'
+
+INSPECTOR_PY = '''import json
+import os
+import re
+import sys
+import time
+import traceback
+from collections import defaultdict
+from contextlib import ExitStack, contextmanager
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+# Generated by query_inspector.py. Active when DEBUG is on or budgets are
+# enforced (test runs); settings.QUERY_INSPECTOR:
+#   N_PLUS_ONE_THRESHOLD  same query shape from the same line this many times = N+1
+#   REPORT_PATH           JSON Lines file, one record per request (None: console only)
+#   ENFORCE               raise QueryBudgetExceeded when a view goes over budget
+#   DEFAULT_BUDGET        max queries per request (None: unlimited)
+#   BUDGETS               {'app:url_name' or route: max queries}
+# Only queries made on the request's thread are seen: async views' ORM calls
+# run in worker threads and aren't counted.
+
+DEFAULTS = {
+    'N_PLUS_ONE_THRESHOLD': 5,
+    'REPORT_PATH': None,
+    'ENFORCE': False,
+    'DEFAULT_BUDGET': None,
+    'BUDGETS': {},
+}
+
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\\b\\d+(?:\\.\\d+)?\\b")
+_IN_LISTS = re.compile(r"\\bIN \\([^()]*\\)", re.IGNORECASE)
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+def inspector_settings():
+    return {**DEFAULTS, **getattr(settings, 'QUERY_INSPECTOR', {})}
+
+def query_shape(sql):
+    """SQL with literals and IN (...) lists replaced, so repeats of one query group together"""
+    return _LITERALS.sub('?', _IN_LISTS.sub('IN (...)', sql))
+
+def _caller():
+    """file:line of the innermost project frame that led to the query"""
+    base_dir = str(getattr(settings, 'BASE_DIR', ''))
+    for frame in reversed(traceback.extract_stack()):
+        # The project's venv lives under BASE_DIR too; its packages aren't project code
+        if (frame.filename.startswith(base_dir) and frame.filename != __file__
+                and 'site-packages' not in frame.filename):
+            return f"{os.path.relpath(frame.filename, base_dir)}:{frame.lineno} in {frame.name}"
+    return None
+
+class QueryRecorder:
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append({
+                'alias': context['connection'].alias,
+                'sql': sql,
+                'ms': (time.perf_counter() - started) * 1000,
+                'caller': _caller(),
+            })
+
+    def groups(self):
+        grouped = defaultdict(lambda: {'count': 0, 'ms': 0.0, 'callers': defaultdict(int)})
+        for query in self.queries:
+            group = grouped[query_shape(query['sql'])]
+            group['count'] += 1
+            group['ms'] += query['ms']
+            group['callers'][query['caller']] += 1
+        return grouped
+
+    def n_plus_one(self, threshold):
+        suspects = []
+        for shape, group in self.groups().items():
+            for caller, count in group['callers'].items():
+                if count >= threshold:
+                    suspects.append({'shape': shape, 'count': count, 'caller': caller})
+        return sorted(suspects, key=lambda suspect: -suspect['count'])
+
+@contextmanager
+def record_queries():
+    """Record every query on every database inside the block"""
+    recorder = QueryRecorder()
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(recorder))
+        yield recorder
+
+@contextmanager
+def query_budget(max_queries):
+    """For tests: fail if the block runs more than max_queries queries"""
+    with record_queries() as recorder:
+        yield recorder
+    if len(recorder.queries) > max_queries:
+        raise QueryBudgetExceeded(_budget_message("block", len(recorder.queries), max_queries, recorder))
+
+def _budget_message(where, count, budget, recorder):
+    worst = sorted(recorder.groups().items(), key=lambda item: -item[1]['count'])[:3]
+    lines = [f"{where} ran {count} queries, budget is {budget}. Most repeated:"]
+    lines += [f"  {group['count']}x {shape[:120]}" for shape, group in worst]
+    return "\\n".join(lines)
+
+def _budget(request, config):
+    match = getattr(request, 'resolver_match', None)
+    budgets = config['BUDGETS']
+    if match is not None:
+        for key in (match.view_name, match.route):
+            if key in budgets:
+                return key, budgets[key]
+        return match.view_name, config['DEFAULT_BUDGET']
+    return request.path, config['DEFAULT_BUDGET']
+
+class QueryInspectorMiddleware:
+    def __init__(self, get_response):
+        config = inspector_settings()
+        if not (settings.DEBUG or config['ENFORCE']):
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+
+    def __call__(self, request):
+        config = inspector_settings()
+        started = time.perf_counter()
+        with record_queries() as recorder:
+            response = self.get_response(request)
+        view, budget = _budget(request, config)
+        report = {
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'method': request.method,
+            'path': request.path,
+            'view': view,
+            'status': response.status_code,
+            'queries': len(recorder.queries),
+            'db_ms': round(sum(query['ms'] for query in recorder.queries), 2),
+            'request_ms': round((time.perf_counter() - started) * 1000, 2),
+            'budget': budget,
+            'n_plus_one': recorder.n_plus_one(config['N_PLUS_ONE_THRESHOLD']),
+            'repeated': sorted(({'shape': shape, 'count': group['count'], 'ms': round(group['ms'], 2)}
+                                for shape, group in recorder.groups().items() if group['count'] > 1),
+                               key=lambda item: -item['count'])[:10],
+        }
+        self._console(report)
+        if config['REPORT_PATH']:
+            with open(config['REPORT_PATH'], 'a') as f:
+                f.write(json.dumps(report) + "\\n")
+
+        response['X-Query-Count'] = str(report['queries'])
+        if config['ENFORCE'] and budget is not None and report['queries'] > budget:
+            raise QueryBudgetExceeded(_budget_message(f"{request.method} {request.path} ({view})",
+                                                      report['queries'], budget, recorder))
+        return response
+
+    def _console(self, report):
+        over = report['budget'] is not None and report['queries'] > report['budget']
+        line = (f"[queries] {report['method']} {report['path']} -> {report['queries']} queries "
+                f"in {report['db_ms']} ms" + (f" (budget {report['budget']} exceeded)" if over else ""))
+        print(line, file=sys.stderr)
+        for suspect in report['n_plus_one']:
+            print(f"[queries]   N+1? {suspect['count']}x {suspect['shape'][:120]}\\n"
+                  f"[queries]        at {suspect['caller'] or 'unknown caller'}", file=sys.stderr)
+'''
+
+def inspector_installed(project_path, project_name):
+    return os.path.exists(os.path.join(project_path, project_name, f'{INSPECTOR_MODULE}.py'))
+
+def install_query_inspector(project_path, project_name, default_budget=None, threshold=5):
+    """Write <project>/query_inspector.py and enable it in settings.py"""
+    with open(os.path.join(project_path, project_name, f'{INSPECTOR_MODULE}.py'), 'w') as f:
+        f.write(INSPECTOR_PY)
+
+    with SettingsEditor(os.path.join(project_path, project_name, 'settings.py')) as editor:
+        editor.ensure_import('import os')
+        editor.ensure_import('import sys')
+        # Outermost, so queries made by other middleware are counted too
+        editor.add_middleware(f"{project_name}.{INSPECTOR_MODULE}.QueryInspectorMiddleware", position=0)
+        if 'QUERY_INSPECTOR' not in editor:
+            editor.set('QUERY_INSPECTOR', {
+                'N_PLUS_ONE_THRESHOLD': threshold,
+                'REPORT_PATH': Raw("os.path.join(BASE_DIR, 'query_report.jsonl')"),
+                'ENFORCE': Raw("len(sys.argv) > 1 and sys.argv[1] == 'test'"),
+                'DEFAULT_BUDGET': default_budget,
+                'BUDGETS': {},
+            })
+
+def setup_query_inspector(project_path, project_name):
+    """Interactive: install the inspector with a default per-view budget"""
+    budget = input("Default query budget per view in tests (Enter for none): ").strip()
+    try:
+        install_query_inspector(project_path, project_name, int(budget) if budget.isdigit() else None)
+    except (OSError, SyntaxError) as e:
+        print(f"❌ Could not install the query inspector: {e}")
+        return
+    print("✅ Query inspector installed (active with DEBUG=True and in tests)")
+    print("   Per-request query counts and N+1 suspects print to the console and go to query_report.jsonl")
+    print(f"   Per-view budgets: QUERY_INSPECTOR['BUDGETS'] in {project_name}/settings.py")
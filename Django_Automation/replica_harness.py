@@ -0,0 +1,131 @@
+import os
+import sys
+import json
+import shutil
+import tempfile
+from collections import Counter
+
+# Shows how the generated primary/replica router spreads queries. Runs *inside
+# the project's venv*:
+#
+#     venv/bin/python replica_harness.py <project_path> <settings_module> [requests] [--configured]
+#
+# By default every alias in DATABASES is swapped for a local SQLite file: the
+# primary is migrated and copied to each replica (a stand-in for replication),
+# so nothing outside the project is touched. With --configured the project's
+# real DATABASES are used (e.g. local MySQL stand-ins already replicating).
+#
+# Requests go through the router's middleware. Read-only requests should land
+# on the replicas roughly by DATABASE_REPLICA_WEIGHTS; in write requests,
+# every read after the write must hit the primary.
+
+def _sqlite_stand_ins(settings, scratch):
+    for alias in settings.DATABASES:
+        settings.DATABASES[alias] = {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.path.join(scratch, f'{alias}.sqlite3'),
+            'TEST': {'MIRROR': 'default'} if alias != 'default' else {},
+        }
+
+def run(project_path, settings_module, requests=1000, configured=False):
+    os.chdir(project_path)
+    sys.path.insert(0, project_path)
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
+
+    import django
+    from django.conf import settings
+
+    scratch = None
+    if not configured:
+        # Connections are created lazily, so DATABASES can still change here
+        scratch = tempfile.mkdtemp(prefix='replica-harness-')
+        _sqlite_stand_ins(settings, scratch)
+    django.setup()
+
+    from django.core.management import call_command
+    from django.db import connections
+    from django.contrib.auth.models import Group
+    from django.http import HttpResponse
+    from django.test import RequestFactory
+    from django.utils.module_loading import import_string
+
+    try:
+        if scratch:
+            call_command('migrate', database='default', verbosity=0)
+            connections['default'].close()
+            for alias in settings.DATABASES:
+                if alias != 'default':
+                    shutil.copyfile(settings.DATABASES['default']['NAME'], settings.DATABASES[alias]['NAME'])
+
+        middleware_path = next((path for path in settings.MIDDLEWARE if path.endswith('PinPrimaryAfterWriteMiddleware')), None)
+        if middleware_path is None:
+            raise SystemExit("PinPrimaryAfterWriteMiddleware is not in MIDDLEWARE; configure replicas with sql_connect first")
+        middleware = import_string(middleware_path)
+
+        log = []  # (alias, phase) for every query
+
+        def recorder(alias):
+            def wrapper(execute, sql, params, many, context):
+                log.append((alias, phase[0]))
+                return execute(sql, params, many, context)
+            return wrapper
+
+        phase = ['read']
+
+        def read_view(request):
+            phase[0] = 'read'
+            Group.objects.count()
+            list(Group.objects.all()[:10])
+            return HttpResponse()
+
+        def write_view(request):
+            phase[0] = 'before_write'
+            Group.objects.count()
+            phase[0] = 'write'
+            Group.objects.create(name=f"harness-{len(log)}")
+            phase[0] = 'after_write'
+            Group.objects.count()
+            list(Group.objects.all()[:10])
+            return HttpResponse()
+
+        factory = RequestFactory()
+        read_handler, write_handler = middleware(read_view), middleware(write_view)
+        wrappers = [connections[alias].execute_wrapper(recorder(alias)) for alias in settings.DATABASES]
+        for wrapper in wrappers:
+            wrapper.__enter__()
+        try:
+            for number in range(requests):
+                # One request in ten writes, like a read-heavy service
+                handler = write_handler if number % 10 == 0 else read_handler
+                handler(factory.get('/'))
+        finally:
+            for wrapper in reversed(wrappers):
+                wrapper.__exit__(None, None, None)
+    finally:
+        connections.close_all()
+        if scratch:
+            shutil.rmtree(scratch, ignore_errors=True)
+
+    reads = Counter(alias for alias, query_phase in log if query_phase in ('read', 'before_write'))
+    after_write = Counter(alias for alias, query_phase in log if query_phase == 'after_write')
+    weights = getattr(settings, 'DATABASE_REPLICA_WEIGHTS', {})
+    total_reads = sum(reads.values())
+    total_weight = sum(weights.values())
+
+    print(f"\n{'Alias':<12}{'Reads':>8}{'Share':>9}{'Expected':>10}{'After write':>13}")
+    print("-" * 52)
+    for alias in settings.DATABASES:
+        share = reads[alias] / total_reads * 100 if total_reads else 0.0
+        expected = weights.get(alias, 0) / total_weight * 100 if total_weight else 0.0
+        print(f"{alias:<12}{reads[alias]:>8}{share:>8.1f}%{expected:>9.1f}%{after_write[alias]:>13}")
+
+    sticky = set(after_write) <= {'default'}
+    print("\n✅ Reads after a write stayed on the primary" if sticky
+          else "\n❌ Some reads after a write went to a replica")
+    print(json.dumps({'reads': dict(reads), 'reads_after_write': dict(after_write), 'sticky': sticky}))
+    return sticky
+
+if __name__ == "__main__":
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    ok = run(args[0], args[1], int(args[2]) if len(args) > 2 else 1000, '--configured' in sys.argv)
+    sys.exit(0 if ok else 1)
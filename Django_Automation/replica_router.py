@@ -0,0 +1,153 @@
+import os
+
+# Primary/replica setup for sql_connect: extra DATABASES aliases for read
+# replicas plus a generated <project>/db_router.py that
+# - sends reads to the replicas, picked at random by DATABASE_REPLICA_WEIGHTS
+# - sends writes (and migrations) to the primary ('default')
+# - pins reads to the primary for the rest of a request once it has written,
+#   so a request always reads its own writes despite replication lag
+#
+# The pin lives in a ContextVar, so it is per request under both WSGI
+# threads and ASGI tasks. Writes only pin inside the generated middleware's
+# scope; shells and management commands never get stuck on the primary.
+
+ROUTER_MODULE = 'db_router'
+
+ROUTER_PY = '''import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+
+# Generated by sql_connect.py: reads go to replicas by weight, writes to the
+# primary, and after a write the rest of the request reads from the primary.
+
+PRIMARY = 'default'
+
+# Per-request state set by the middleware ({'pinned': bool, 'forced': depth
+# of pinned_to_primary blocks}, shared with the threads async views run ORM
+# calls in); None outside a request
+_request_pin = ContextVar('db_request_pin', default=None)
+
+def replica_weights():
+    weights = getattr(settings, 'DATABASE_REPLICA_WEIGHTS', None)
+    if weights is None:
+        weights = {alias: 1 for alias in settings.DATABASES if alias != PRIMARY}
+    return {alias: weight for alias, weight in weights.items() if weight > 0}
+
+@contextmanager
+def pinned_to_primary():
+    """Read from the primary inside this block (e.g. right after a write elsewhere)"""
+    pin = _request_pin.get()
+    if pin is None:
+        # Outside a request: a state of its own for the block only
+        token = _request_pin.set({'pinned': False, 'forced': 1})
+        try:
+            yield
+        finally:
+            _request_pin.reset(token)
+        return
+    # Inside a request: keep the request's state so a write in the block
+    # still pins the rest of the request
+    pin['forced'] += 1
+    try:
+        yield
+    finally:
+        pin['forced'] -= 1
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        pin = _request_pin.get()
+        if pin is not None and (pin['pinned'] or pin['forced']):
+            return PRIMARY
+        weights = replica_weights()
+        if not weights:
+            return PRIMARY
+        aliases = list(weights)
+        return random.choices(aliases, weights=[weights[alias] for alias in aliases])[0]
+
+    def db_for_write(self, model, **hints):
+        pin = _request_pin.get()
+        if pin is not None:
+            pin['pinned'] = True  # read-your-writes for the rest of this request
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same data as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas get the schema through replication
+        return db == PRIMARY
+
+class PinPrimaryAfterWriteMiddleware:
+    """Scopes the read-your-writes pin to a single request"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = _request_pin.set({'pinned': False, 'forced': 0})
+        try:
+            return self.get_response(request)
+        finally:
+            _request_pin.reset(token)
+'''
+
+def router_paths(project_name):
+    return (f"{project_name}.{ROUTER_MODULE}.PrimaryReplicaRouter",
+            f"{project_name}.{ROUTER_MODULE}.PinPrimaryAfterWriteMiddleware")
+
+def replica_databases(primary, replicas):
+    """DATABASES entries for replicas: {alias: {'HOST':..., 'PORT':..., ...}} over the primary's settings"""
+    databases = {}
+    for alias, overrides in replicas.items():
+        config = {**primary, **overrides}
+        # Tests use the primary's test database for replicas too
+        config['TEST'] = {'MIRROR': 'default'}
+        databases[alias] = config
+    return databases
+
+def configure_replicas(editor, project_path, project_name, primary, replicas, weights):
+    """Queue DATABASES, router and middleware edits on editor and write db_router.py"""
+    router, middleware = router_paths(project_name)
+    editor.set('DATABASES', {'default': primary, **replica_databases(primary, replicas)})
+    editor.set('DATABASE_ROUTERS', [router])
+    editor.set('DATABASE_REPLICA_WEIGHTS', weights)
+    # Outermost, so the pin covers every other middleware's queries too
+    editor.add_middleware(middleware, position=0)
+
+    with open(os.path.join(project_path, project_name, f'{ROUTER_MODULE}.py'), 'w') as f:
+        f.write(ROUTER_PY)
+
+def remove_replicas(editor, project_name):
+    """Queue removal of the router settings and middleware configure_replicas added"""
+    router, middleware = router_paths(project_name)
+    if 'DATABASE_ROUTERS' in editor:
+        routers = editor.value('DATABASE_ROUTERS')
+        if router in routers:
+            routers.remove(router)
+        if not len(routers):
+            editor.remove('DATABASE_ROUTERS')
+    if 'DATABASE_REPLICA_WEIGHTS' in editor:
+        editor.remove('DATABASE_REPLICA_WEIGHTS')
+    editor.remove_middleware(middleware)
+
+def ask_replicas(primary):
+    """Prompt for replica hosts and weights; returns (replicas, weights)"""
+    count = input("Number of read replicas [0]: ").strip()
+    count = int(count) if count.isdigit() else 0
+
+    replicas, weights = {}, {}
+    for number in range(1, count + 1):
+        alias = f"replica{number}"
+        print(f"\n📖 {alias} (leave blank to reuse the primary's value)")
+        overrides = {}
+        for key, label in (('HOST', "Host"), ('PORT', "Port"), ('NAME', "Database name"), ('USER', "User")):
+            value = input(f"{label} [{primary.get(key, '')}]: ").strip()
+            if value:
+                overrides[key] = value
+        weight = input("Read weight [1]: ").strip()
+        replicas[alias] = overrides
+        weights[alias] = int(weight) if weight.isdigit() else 1
+    return replicas, weights
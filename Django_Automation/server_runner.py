@@ -0,0 +1,218 @@
+import os
+import sys
+import time
+import socket
+import signal
+import subprocess
+import webbrowser
+import urllib.error
+import urllib.request
+
+from venv_introspect import find_venv, venv_python, ensure_packages
+
+# Runs a project under the dev server or a multi-process production server
+# and waits until it actually answers before anyone opens a browser.
+# - gunicorn (WSGI): (2 x cores) + 1 sync workers; SIGHUP reloads the workers
+#   gracefully, SIGTERM lets in-flight requests finish before exiting
+# - uvicorn (ASGI): one worker per core; reload restarts it gracefully
+# - runserver: Django's single-process dev server, as before
+# gunicorn doesn't run on Windows; uvicorn is used there instead.
+
+SERVERS = {
+    'runserver': "Django development server (single process, auto-reload)",
+    'gunicorn': "gunicorn, WSGI, multi-process",
+    'uvicorn': "uvicorn, ASGI, multi-process",
+}
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8000
+READY_TIMEOUT = 30
+STOP_TIMEOUT = 15
+
+def auto_workers(server):
+    cores = os.cpu_count() or 1
+    if server == 'gunicorn':
+        return cores * 2 + 1  # sync workers spend much of their time waiting on I/O
+    if server == 'uvicorn':
+        return cores  # each async worker already overlaps its I/O
+    return 1
+
+def free_port(host=DEFAULT_HOST, port=DEFAULT_PORT, attempts=20):
+    """First port from `port` on that nothing listens on (so readiness can't hit another server)"""
+    for candidate in range(port, port + attempts):
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            if sock.connect_ex((host, candidate)) != 0:
+                return candidate
+    raise RuntimeError(f"No free port between {port} and {port + attempts - 1}")
+
+def server_command(server, venv_path, project_name, host, port, workers):
+    if server == 'gunicorn':
+        return [venv_python(venv_path), '-m', 'gunicorn', f"{project_name}.wsgi:application",
+                '--bind', f"{host}:{port}", '--workers', str(workers), '--graceful-timeout', str(STOP_TIMEOUT)]
+    if server == 'uvicorn':
+        return [venv_python(venv_path), '-m', 'uvicorn', f"{project_name}.asgi:application",
+                '--host', host, '--port', str(port), '--workers', str(workers),
+                '--timeout-graceful-shutdown', str(STOP_TIMEOUT)]
+    return [venv_python(venv_path), 'manage.py', 'runserver', f"{host}:{port}"]
+
+def wait_until_ready(url, process=None, timeout=READY_TIMEOUT):
+    """Poll url until the server answers with any HTTP status; False on timeout or exit"""
+    deadline = time.monotonic() + timeout
+    delay = 0.05
+    while time.monotonic() < deadline:
+        if process is not None and process.poll() is not None:
+            return False
+        try:
+            with urllib.request.urlopen(url, timeout=2):
+                return True
+        except urllib.error.HTTPError:
+            return True  # 3xx/4xx/5xx: the server is up and handling requests
+        except (urllib.error.URLError, ConnectionError, socket.timeout):
+            time.sleep(delay)
+            delay = min(delay * 2, 0.5)
+    return False
+
+def child_pids(pid):
+    """PIDs of a process's direct children, or None where pgrep isn't available"""
+    try:
+        output = subprocess.run(['pgrep', '-P', str(pid)], stdout=subprocess.PIPE, text=True).stdout
+    except OSError:
+        return None
+    return {int(line) for line in output.split()}
+
+def wait_for_new_workers(process, old_workers, count, timeout=READY_TIMEOUT):
+    """Wait until `count` workers not in old_workers run under process; False on timeout or exit"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            return False
+        if len(child_pids(process.pid) - old_workers) >= count:
+            return True
+        time.sleep(0.1)
+    return False
+
+class ServerProcess:
+    """One running server; start(), reload() and stop() are all graceful"""
+
+    def __init__(self, project_path, project_name, server='runserver', workers=None,
+                 host=DEFAULT_HOST, port=None, quiet=False):
+        if server == 'gunicorn' and os.name == 'nt':
+            server = 'uvicorn'
+        self.project_path = project_path
+        self.project_name = project_name
+        self.server = server
+        self.workers = workers or auto_workers(server)
+        self.host = host
+        self.port = port
+        self.venv_path = find_venv(project_path)
+        self.quiet = quiet  # drop the server's own output (e.g. per-request logs under load)
+        self.process = None
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}/"
+
+    def start(self, ready_path='admin/'):
+        if self.venv_path is None:
+            raise FileNotFoundError(f"No virtualenv found in {self.project_path}")
+        if self.server != 'runserver':
+            ensure_packages(self.venv_path, [self.server])
+        self.port = free_port(self.host, self.port or DEFAULT_PORT)
+        command = server_command(self.server, self.venv_path, self.project_name, self.host, self.port, self.workers)
+        output = subprocess.DEVNULL if self.quiet else None
+        self.process = subprocess.Popen(command, cwd=self.project_path, stdout=output, stderr=output)
+        started = time.monotonic()
+        if not wait_until_ready(self.url + ready_path, self.process):
+            self.stop()
+            raise RuntimeError(f"{self.server} did not become ready within {READY_TIMEOUT}s")
+        return time.monotonic() - started
+
+    def reload(self, ready_path='admin/'):
+        """Pick up code changes without dropping in-flight requests"""
+        if self.server == 'gunicorn':
+            # New workers start before the old ones finish their requests.
+            # The old workers keep answering meanwhile, so readiness alone
+            # proves nothing: wait for a full set of new worker PIDs first.
+            old_workers = child_pids(self.process.pid)
+            self.process.send_signal(signal.SIGHUP)
+            if old_workers is not None and not wait_for_new_workers(self.process, old_workers, self.workers):
+                raise RuntimeError("gunicorn did not start new workers after reload")
+            # Without pgrep this is only a liveness check
+            if not wait_until_ready(self.url + ready_path, self.process):
+                raise RuntimeError("gunicorn did not come back after reload")
+            return
+        self.stop()
+        self.start(ready_path)
+
+    def stop(self):
+        if self.process is None or self.process.poll() is not None:
+            return
+        # SIGTERM is a graceful shutdown for gunicorn and uvicorn; runserver stops on Ctrl+C
+        if os.name == 'nt':
+            self.process.terminate()
+        else:
+            self.process.send_signal(signal.SIGINT if self.server == 'runserver' else signal.SIGTERM)
+        try:
+            self.process.wait(timeout=STOP_TIMEOUT + 5)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+
+def ask_server():
+    print("\nServer:")
+    servers = list(SERVERS)
+    for idx, server in enumerate(servers, 1):
+        print(f"{idx}. {SERVERS[server]}")
+    choice = input(f"Choose option (1-{len(servers)}) [1]: ").strip()
+    server = servers[int(choice) - 1] if choice.isdigit() and 1 <= int(choice) <= len(servers) else 'runserver'
+    workers = None
+    if server != 'runserver':
+        answer = input(f"Workers [{auto_workers(server)}]: ").strip()
+        workers = int(answer) if answer.isdigit() and int(answer) > 0 else None
+    return server, workers
+
+def serve(project_path, project_name, server='runserver', workers=None, open_path='admin/'):
+    """Start the server, open the browser once it answers, then reload/quit on request"""
+    runner = ServerProcess(project_path, project_name, server, workers)
+    try:
+        print(f"\n🚀 Starting {runner.server}" +
+              (f" with {runner.workers} workers" if runner.server != 'runserver' else "") + "...")
+        seconds = runner.start(open_path)
+        print(f"✅ Ready at {runner.url} after {seconds:.1f}s")
+        if runner.server != 'runserver':
+            print("ℹ️ Static files aren't served by this server (run collectstatic and serve STATIC_ROOT)")
+        webbrowser.open(runner.url + open_path)
+
+        while True:
+            command = input("\n[r] reload, [q] stop the server: ").strip().lower()
+            if command == 'r':
+                runner.reload(open_path)
+                print("✅ Reloaded")
+            elif command == 'q':
+                break
+    except (KeyboardInterrupt, EOFError):
+        pass
+    except Exception as e:
+        print(f"❌ Error running server: {e}")
+    finally:
+        runner.stop()
+        print("🛑 Server stopped")
+
+def main():
+    print("\n" + "="*50)
+    print("Server Runner".center(50))
+    print("="*50)
+
+    project_path = os.path.normpath(input("\nEnter full path to your Django project (where manage.py is): ").strip())
+    project_name = input("Enter your Django project name (folder inside project path): ").strip()
+    if not os.path.exists(os.path.join(project_path, project_name, 'settings.py')):
+        print("❌ settings.py not found")
+        return
+    server, workers = ask_server()
+    serve(project_path, project_name, server, workers)
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] in SERVERS:
+        serve(os.path.abspath(sys.argv[2]), sys.argv[3], sys.argv[1],
+              int(sys.argv[4]) if len(sys.argv) > 4 else None)
+    else:
+        main()
@@ -0,0 +1,514 @@
+import os
+import ast
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+# Syntax-tree based editor for Django settings.py files.
+#
+# The file is parsed once with `ast`; edits are queued on lightweight views of
+# the top-level setting values and applied in one pass on save(). Only the
+# values that changed are re-rendered - everything else (comments, quoting,
+# layout) is copied from the original source - and the result is written
+# atomically. Usage:
+#
+#     with SettingsEditor(settings_path) as editor:
+#         editor.add_installed_app('blog')
+#         editor.add_template_dir(Raw("BASE_DIR / 'templates'"))
+#         editor.set('DATABASES', {...})
+#
+# Values are plain Python literals; wrap expressions in Raw(...).
+
+INDENT = '    '
+
+class Raw:
+    """Python source inserted verbatim, e.g. Raw("BASE_DIR / 'templates'")"""
+
+    def __init__(self, source):
+        self.source = source
+
+    def __repr__(self):
+        return f"Raw({self.source!r})"
+
+    def __eq__(self, other):
+        return isinstance(other, Raw) and _same_source(self.source, other.source)
+
+    def __hash__(self):
+        return hash(_normalized(self.source))
+
+def _normalized(source):
+    try:
+        return ast.dump(ast.parse(source.strip(), mode='eval'))
+    except SyntaxError:
+        return source.strip()
+
+def _same_source(a, b):
+    return _normalized(a) == _normalized(b)
+
+def _python_source(value):
+    if isinstance(value, Raw):
+        return value.source
+    if isinstance(value, (str, int, float, bool, type(None))):
+        return repr(value)
+    raise TypeError(f"Cannot render {type(value).__name__} as a settings value")
+
+# --- Views over setting values -----------------------------------------------
+
+class _Value:
+    def __init__(self):
+        self.dirty = False
+        # Comments around an item of a list or dict literal, kept when it is re-rendered
+        self.comments = []    # full lines above the item
+        self.comment = None   # at the end of the item's line
+
+    def modified(self):
+        return self.dirty
+
+class _Leaf(_Value):
+    def __init__(self, source):
+        super().__init__()
+        self.source = source
+
+    def render(self, indent):
+        return self.source
+
+    def python(self):
+        try:
+            return ast.literal_eval(self.source)
+        except (ValueError, SyntaxError):
+            return Raw(self.source)
+
+class _List(_Value):
+    """A list or tuple literal"""
+
+    def __init__(self, items, original=None, brackets='[]'):
+        super().__init__()
+        self.items = items
+        self.original = original
+        self.brackets = brackets
+        self.closing_comments = []  # full lines after the last item
+
+    def modified(self):
+        return self.dirty or self.original is None or any(item.modified() for item in self.items)
+
+    def render(self, indent):
+        if not self.modified():
+            return self.original
+        opening, closing = self.brackets
+        if not self.items:
+            return opening + closing
+        if (self.brackets == '()' and all(isinstance(item, _Leaf) for item in self.items)
+                and not any(item.comments or item.comment for item in self.items)):
+            # Short tuples such as ('loader.Class', 'arg') stay on one line
+            inline = ', '.join(item.render(indent) for item in self.items)
+            if len(inline) <= 60:
+                return f"({inline}{',' if len(self.items) == 1 else ''})"
+        inner = indent + INDENT
+        lines = [_with_comments(item, f"{item.render(inner)},", inner) for item in self.items]
+        lines += [f"{inner}{comment}\n" for comment in self.closing_comments]
+        return f"{opening}\n{''.join(lines)}{indent}{closing}"
+
+    def python(self):
+        values = [item.python() for item in self.items]
+        return tuple(values) if self.brackets == '()' else values
+
+    def __len__(self):
+        return len(self.items)
+
+    def __getitem__(self, index):
+        return self.items[index]
+
+    def index(self, value):
+        source = _source_for(value)
+        for position, item in enumerate(self.items):
+            if isinstance(item, _Leaf) and _same_source(item.source, source):
+                return position
+        raise ValueError(f"{value!r} not in list")
+
+    def __contains__(self, value):
+        try:
+            self.index(value)
+            return True
+        except ValueError:
+            return False
+
+    def insert(self, position, value):
+        self.items.insert(position, _from_python(value))
+        self.dirty = True
+
+    def append(self, value):
+        self.insert(len(self.items), value)
+
+    def remove(self, value):
+        del self.items[self.index(value)]
+        self.dirty = True
+
+class _Dict(_Value):
+    def __init__(self, keys, values, original=None):
+        super().__init__()
+        self.keys = keys
+        self.values = values
+        self.original = original
+        self.closing_comments = []
+
+    def modified(self):
+        return self.dirty or self.original is None or any(value.modified() for value in self.values)
+
+    def render(self, indent):
+        if not self.modified():
+            return self.original
+        if not self.keys:
+            return '{}'
+        inner = indent + INDENT
+        lines = [_with_comments(key, f"{key.render(inner)}: {value.render(inner)},", inner)
+                 for key, value in zip(self.keys, self.values)]
+        lines += [f"{inner}{comment}\n" for comment in self.closing_comments]
+        return f"{{\n{''.join(lines)}{indent}}}"
+
+    def python(self):
+        return {key.python(): value.python() for key, value in zip(self.keys, self.values)}
+
+    def _position(self, key):
+        for position, existing in enumerate(self.keys):
+            if isinstance(existing, _Leaf) and existing.python() == key:
+                return position
+        return None
+
+    def __contains__(self, key):
+        return self._position(key) is not None
+
+    def __getitem__(self, key):
+        position = self._position(key)
+        if position is None:
+            raise KeyError(key)
+        return self.values[position]
+
+    def get(self, key, default=None):
+        position = self._position(key)
+        return default if position is None else self.values[position]
+
+    def __setitem__(self, key, value):
+        position = self._position(key)
+        if position is None:
+            self.keys.append(_Leaf(repr(key)))
+            self.values.append(_from_python(value))
+        else:
+            self.values[position] = _from_python(value)
+        self.dirty = True
+
+    def setdefault(self, key, value):
+        if key not in self:
+            self[key] = value
+        return self[key]
+
+    def pop(self, key, default=None):
+        position = self._position(key)
+        if position is None:
+            return default
+        self.keys.pop(position)
+        value = self.values.pop(position)
+        self.dirty = True
+        return value.python()
+
+def _source_for(value):
+    if isinstance(value, _Value):
+        return value.render('')
+    if isinstance(value, (list, tuple, dict)):
+        return _from_python(value).render('')
+    return _python_source(value)
+
+def _from_python(value):
+    if isinstance(value, _Value):
+        return value
+    if isinstance(value, dict):
+        return _Dict([_Leaf(_python_source(key)) for key in value],
+                     [_from_python(item) for item in value.values()])
+    if isinstance(value, (list, tuple)):
+        brackets = '()' if isinstance(value, tuple) else '[]'
+        return _List([_from_python(item) for item in value], brackets=brackets)
+    return _Leaf(_python_source(value))
+
+def _with_comments(item, line, indent):
+    above = ''.join(f"{indent}{comment}\n" for comment in item.comments)
+    return f"{above}{indent}{line}{'  ' + item.comment if item.comment else ''}\n"
+
+def _between(text):
+    """(comment ending the previous line, full-line comments) in the source between two items"""
+    first, _, rest = text.partition('\n')
+    trailing = first[first.index('#'):].rstrip() if '#' in first else None
+    return trailing, [line.strip() for line in rest.splitlines() if line.strip().startswith('#')]
+
+def _attach_comments(container, node, spans, source, offset):
+    """Record the comments around each (first view, start node, end node) item of a literal"""
+    position = offset(node.lineno, node.col_offset) + 1  # after the opening bracket
+    previous = None
+    for view, first, last in spans:
+        trailing, comments = _between(source[position:offset(first.lineno, first.col_offset)])
+        if previous is None:
+            view.comments = ([trailing] if trailing else []) + comments
+        else:
+            previous.comment, view.comments = trailing, comments
+        position = offset(last.end_lineno, last.end_col_offset)
+        previous = view
+    if previous is not None:
+        previous.comment, container.closing_comments = _between(
+            source[position:offset(node.end_lineno, node.end_col_offset) - 1])
+    return container
+
+def _wrap(node, source, offset):
+    """View over an expression node; untouched parts render as their original text"""
+    original = ast.get_source_segment(source, node)
+    if isinstance(node, (ast.List, ast.Tuple)):
+        brackets = '()' if isinstance(node, ast.Tuple) else '[]'
+        if isinstance(node, ast.Tuple) and not original.startswith('('):
+            return _Leaf(original)  # bare tuple like `A = 'x', 'y'`
+        items = [_wrap(elt, source, offset) for elt in node.elts]
+        return _attach_comments(_List(items, original, brackets), node,
+                                [(item, elt, elt) for item, elt in zip(items, node.elts)], source, offset)
+    if isinstance(node, ast.Dict) and None not in node.keys:
+        keys = [_wrap(key, source, offset) for key in node.keys]
+        values = [_wrap(value, source, offset) for value in node.values]
+        return _attach_comments(_Dict(keys, values, original), node,
+                                list(zip(keys, node.keys, node.values)), source, offset)
+    return _Leaf(original)
+
+# --- Editor --------------------------------------------------------------------
+
+class SettingsEditor:
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'r', encoding='utf-8') as f:
+            self.source = f.read()
+        self.tree = ast.parse(self.source, filename=path)
+        self._lines = self.source.splitlines(keepends=True)
+        self._line_starts = [0]
+        for line in self._lines:
+            self._line_starts.append(self._line_starts[-1] + len(line))
+
+        self._assignments = {}
+        for node in self.tree.body:
+            if (isinstance(node, ast.Assign) and len(node.targets) == 1
+                    and isinstance(node.targets[0], ast.Name)):
+                self._assignments[node.targets[0].id] = node  # last assignment wins, as in Python
+        self._values = {}
+        self._replaced = set()
+        self._new = {}
+        self._removed = set()
+        self._imports = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.save()
+
+    # Generic access
+
+    def __contains__(self, name):
+        return (name in self._new or name in self._assignments) and name not in self._removed
+
+    def value(self, name):
+        """Editable view of a setting's value (list/dict views support item edits)"""
+        if name in self._removed:
+            raise KeyError(name)
+        if name in self._new:
+            return self._new[name]
+        if name not in self._values:
+            if name not in self._assignments:
+                raise KeyError(name)
+            self._values[name] = _wrap(self._assignments[name].value, self.source, self._offset)
+        return self._values[name]
+
+    def get(self, name, default=None):
+        """Current Python value of a setting (expressions come back as Raw)"""
+        try:
+            return self.value(name).python()
+        except KeyError:
+            return default
+
+    def set(self, name, value):
+        self._removed.discard(name)
+        wrapped = _from_python(value)
+        wrapped.dirty = True
+        if name in self._assignments:
+            self._values[name] = wrapped
+            self._replaced.add(name)
+        else:
+            self._new[name] = wrapped
+        return wrapped
+
+    def setdefault(self, name, value):
+        if name not in self:
+            self.set(name, value)
+        return self.value(name)
+
+    def remove(self, name):
+        self._new.pop(name, None)
+        if name in self._assignments:
+            self._removed.add(name)
+
+    def ensure_import(self, statement):
+        """Add an import line (e.g. 'import os') unless the module already has it"""
+        wanted = ast.dump(ast.parse(statement).body[0])
+        existing = [ast.dump(node) for node in self.tree.body if isinstance(node, (ast.Import, ast.ImportFrom))]
+        if wanted not in existing and statement not in self._imports:
+            self._imports.append(statement)
+
+    # Common edits
+
+    def installed_apps(self):
+        return list(self.get('INSTALLED_APPS', []))
+
+    def add_installed_app(self, app_name, position=None, before=None):
+        """Add an app (at the end, at `position`, or before another app); False if already present"""
+        apps = self.setdefault('INSTALLED_APPS', [])
+        if app_name in apps:
+            return False
+        if before is not None and before in apps:
+            position = apps.index(before)
+        apps.insert(len(apps) if position is None else position, app_name)
+        return True
+
+    def add_middleware(self, path, position=None, after=None):
+        middleware = self.setdefault('MIDDLEWARE', [])
+        if path in middleware:
+            return False
+        if after is not None and after in middleware:
+            position = middleware.index(after) + 1
+        middleware.insert(len(middleware) if position is None else position, path)
+        return True
+
+    def remove_middleware(self, path):
+        middleware = self.setdefault('MIDDLEWARE', [])
+        if path not in middleware:
+            return False
+        middleware.remove(path)
+        return True
+
+    def databases(self):
+        """{alias: editable dict view} for every DATABASES entry written as a dict literal"""
+        if 'DATABASES' not in self:
+            return {}
+        databases = self.value('DATABASES')
+        if not isinstance(databases, _Dict):
+            return {}
+        return {key.python(): config for key, config in zip(databases.keys, databases.values)
+                if isinstance(config, _Dict)}
+
+    def django_templates(self):
+        """The DjangoTemplates backend dict inside TEMPLATES (created if missing)"""
+        templates = self.setdefault('TEMPLATES', [])
+        for backend in templates.items:
+            if isinstance(backend, _Dict):
+                engine = backend.get('BACKEND')
+                if engine is None or engine.python() == 'django.template.backends.django.DjangoTemplates':
+                    return backend
+        templates.append({
+            'BACKEND': 'django.template.backends.django.DjangoTemplates',
+            'DIRS': [],
+            'APP_DIRS': True,
+            'OPTIONS': {
+                'context_processors': [
+                    'django.template.context_processors.request',
+                    'django.contrib.auth.context_processors.auth',
+                    'django.contrib.messages.context_processors.messages',
+                ],
+            },
+        })
+        return templates.items[-1]
+
+    def add_template_dir(self, directory):
+        """Add a DIRS entry (a string path or a Raw expression); False if already present"""
+        dirs = self.django_templates().setdefault('DIRS', [])
+        if not isinstance(dirs, _List):
+            raise ValueError("TEMPLATES DIRS is not a list literal")
+        if directory in dirs:
+            return False
+        dirs.append(directory)
+        return True
+
+    # Output
+
+    def _offset(self, lineno, col_offset):
+        # ast column offsets are UTF-8 byte offsets
+        line = self._lines[lineno - 1]
+        return self._line_starts[lineno - 1] + len(line.encode('utf-8')[:col_offset].decode('utf-8'))
+
+    def render(self):
+        replacements = []
+        for name, node in self._assignments.items():
+            if name in self._removed:
+                start = self._line_starts[node.lineno - 1]
+                end = self._line_starts[node.end_lineno]
+                replacements.append((start, end, ''))
+            elif name in self._values and (name in self._replaced or self._values[name].modified()):
+                value = node.value
+                start = self._offset(value.lineno, value.col_offset)
+                end = self._offset(value.end_lineno, value.end_col_offset)
+                replacements.append((start, end, self._values[name].render('')))
+
+        if self._imports:
+            statements = ''.join(f"{statement}\n" for statement in self._imports)
+            imports = [node for node in self.tree.body if isinstance(node, (ast.Import, ast.ImportFrom))]
+            first = self.tree.body[0] if self.tree.body else None
+            if imports:
+                replacements.append((self._line_starts[imports[-1].end_lineno],) * 2 + (statements,))
+            elif isinstance(first, ast.Expr) and isinstance(first.value, ast.Constant):
+                # After the module docstring
+                replacements.append((self._line_starts[first.end_lineno],) * 2 + ('\n' + statements,))
+            else:
+                replacements.append((0, 0, statements))
+
+        content = self.source
+        for start, end, text in sorted(replacements, key=lambda r: (r[0], r[1]), reverse=True):
+            content = content[:start] + text + content[end:]
+
+        if self._new:
+            if content and not content.endswith('\n'):
+                content += '\n'
+            for name, value in self._new.items():
+                content += f"\n{name} = {value.render('')}\n"
+        return content
+
+    def save(self, backup=False):
+        """Write all queued edits atomically; returns True if the file changed"""
+        content = self.render()
+        if content == self.source:
+            return False
+        ast.parse(content, filename=self.path)  # never write a broken settings.py
+
+        if backup:
+            shutil.copy2(self.path, self.path + '.bak')
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(prefix='.settings-', suffix='.py', dir=directory)
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(content)
+                f.flush()
+                os.fsync(f.fileno())
+            shutil.copymode(self.path, tmp_path)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self.__init__(self.path)
+        return True
+
+def edit_many(settings_paths, edit, max_workers=None, backup=False):
+    """Apply edit(editor) to many settings files in parallel, one write per file.
+
+    Returns {path: True/False (changed) or the exception raised}.
+    """
+    def apply(path):
+        try:
+            editor = SettingsEditor(path)
+            edit(editor)
+            return editor.save(backup=backup)
+        except Exception as e:
+            return e
+
+    settings_paths = list(settings_paths)
+    with ThreadPoolExecutor(max_workers=max_workers or min(32, len(settings_paths) or 1)) as pool:
+        return dict(zip(settings_paths, pool.map(apply, settings_paths)))
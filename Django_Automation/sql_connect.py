@@ -1,40 +1,143 @@
 import os
+import json
 import subprocess
-import re
 import getpass
 
-def run_migrations(project_path):
+from venv_introspect import find_venv, ensure_packages, installed_version, version_tuple, venv_python
+from settings_editor import SettingsEditor
+from replica_router import ask_replicas, configure_replicas, remove_replicas
+from migration_analyzer import analyze_migrations, print_report, needs_confirmation
+from migrate_runner import stream, run_migrate, print_summary
+
+BENCH_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'db_pool_bench.py')
+TRANSFER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'sqlite_to_mysql.py')
+REPLICA_HARNESS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'replica_harness.py')
+
+# How DATABASES['default'] reuses MySQL connections:
+# - default:    a new TCP + auth handshake for every request (Django's default)
+# - persistent: one connection per worker thread kept for CONN_MAX_AGE seconds,
+#               checked with CONN_HEALTH_CHECKS before reuse (Django 4.1+)
+# - pooled:     a bounded SQLAlchemy QueuePool per process (django-db-connection-pool):
+#               POOL_SIZE connections kept open, up to MAX_OVERFLOW more under load,
+#               recycled after RECYCLE seconds (max lifetime), PRE_PING checked on checkout
+CONNECTION_MODES = {
+    'default': "New connection per request (Django default)",
+    'persistent': "Persistent connections (CONN_MAX_AGE + health checks)",
+    'pooled': "Connection pool (bounded per process, pre-ping, max lifetime, overflow limit)",
+}
+PERSISTENT_MAX_AGE = 300
+DEFAULT_POOL = {'POOL_SIZE': 10, 'MAX_OVERFLOW': 10, 'RECYCLE': 3600, 'PRE_PING': True, 'TIMEOUT': 30}
+POOL_PACKAGE = 'django-db-connection-pool'
+
+def connection_settings(mode, pool=None, django_version=(5, 2)):
+    """ENGINE plus the connection-reuse keys of DATABASES['default'] for a mode"""
+    if mode == 'pooled':
+        # Django still closes its connection after each request (CONN_MAX_AGE 0),
+        # which hands it back to the pool instead of disconnecting
+        return {'ENGINE': 'dj_db_conn_pool.backends.mysql', 'CONN_MAX_AGE': 0,
+                'POOL_OPTIONS': {**DEFAULT_POOL, **(pool or {})}}
+    if mode == 'persistent':
+        settings = {'ENGINE': 'django.db.backends.mysql', 'CONN_MAX_AGE': PERSISTENT_MAX_AGE}
+        if django_version >= (4, 1):
+            settings['CONN_HEALTH_CHECKS'] = True
+        return settings
+    return {'ENGINE': 'django.db.backends.mysql', 'CONN_MAX_AGE': 0}
+
+def ask_connection_mode():
+    """Prompt for a connection mode and, when pooled, its limits"""
+    print("\n🔌 Connection handling")
+    modes = list(CONNECTION_MODES)
+    for idx, mode in enumerate(modes, 1):
+        print(f"{idx}. {CONNECTION_MODES[mode]}")
+    choice = input("Choose option (1/2/3) [1]: ").strip()
+    mode = modes[int(choice) - 1] if choice in ('1', '2', '3') else 'default'
+
+    pool = {}
+    if mode == 'pooled':
+        for key, label in (('POOL_SIZE', "Pool size per process"), ('MAX_OVERFLOW', "Max overflow connections"),
+                           ('RECYCLE', "Max connection lifetime in seconds")):
+            value = input(f"{label} [{DEFAULT_POOL[key]}]: ").strip()
+            if value.isdigit():
+                pool[key] = int(value)
+    return mode, pool
+
+def run_pool_benchmark(project_path, project_name, venv_path, requests=200):
+    """Compare connect overhead per request for every connection mode"""
+    ensure_packages(venv_path, [POOL_PACKAGE])
+    results = {}
+    for mode in CONNECTION_MODES:
+        print(f"⏱️ Benchmarking '{mode}' connections...")
+        process = subprocess.run(
+            [venv_python(venv_path), BENCH_SCRIPT, project_path, f"{project_name}.settings", mode, str(requests)],
+            cwd=project_path,
+            stdout=subprocess.PIPE,
+            text=True,
+        )
+        if process.returncode != 0:
+            print(f"❌ Benchmark failed for '{mode}' (exit code {process.returncode}); see the error output above")
+            return None
+        results[mode] = json.loads(process.stdout.strip().splitlines()[-1])
+
+    pooled = results['pooled']['mean_ms']
+    print(f"\n{'Mode':<12}{'ms/request':>12}{'p95 ms':>10}{'Connects':>10}{'Overhead vs pool':>18}")
+    print("-" * 62)
+    for mode, result in results.items():
+        overhead = f"{result['mean_ms'] - pooled:+.3f} ms"
+        print(f"{mode:<12}{result['mean_ms']:>12}{result['p95_ms']:>10}{result['server_connects']:>10}{overhead:>18}")
+    return results
+
+def run_migrations(project_path, project_name, venv_path):
     """Run Django migrations after successful configuration"""
     print("\n🔄 Running Django Migrations...")
     
-    makemigrations_command = ["python", "manage.py", "makemigrations"]
+    makemigrations_command = [venv_python(venv_path), "manage.py", "makemigrations"]
     print(f"Running: {' '.join(makemigrations_command)} in {project_path}")
-    makemigrations_process = subprocess.run(
-        makemigrations_command,
+    returncode, _ = stream(makemigrations_command, project_path)
+    if returncode != 0:
+        print(f"\n❌ Makemigrations failed (exit code {returncode})")
+        return False # Stop if makemigrations fails
+
+    # Flag table rewrites and index builds before anything locks a big table
+    report = analyze_migrations(project_path, project_name, venv_path)
+    if report is None:
+        if input("Migrate without the analysis? (y/n) [n]: ").strip().lower() != 'y':
+            return False
+    else:
+        print_report(report)
+        if needs_confirmation(report) and input("\nApply these migrations now? (y/n) [n]: ").strip().lower() != 'y':
+            print("ℹ️ Migrations not applied; run manage.py migrate when ready")
+            return False
+
+    # Every non-replica alias, in parallel, timed per migration
+    report = run_migrate(project_path, project_name, venv_path)
+    print_summary(report)
+    if not report['success']:
+        print("\n❌ Migration errors; see the output above")
+        return False
+    print("\n✅ Migrations completed successfully!")
+    return True
+
+def transfer_sqlite_data(project_path, project_name, venv_path, sqlite_path):
+    """Stream every model table from sqlite_path into the configured database, then verify it"""
+    print(f"\n🚚 Copying data from {sqlite_path}...")
+    process = subprocess.run(
+        [venv_python(venv_path), TRANSFER_SCRIPT, project_path, f"{project_name}.settings", sqlite_path],
         cwd=project_path,
-        shell=False,
-        capture_output=True,
-        text=True
     )
-    print(makemigrations_process.stdout)
-    if makemigrations_process.stderr:
-        print(f"\n❌ Makemigrations errors:\n{makemigrations_process.stderr}")
-        return # Stop if makemigrations fails
-
-    migrate_command = ["python", "manage.py", "migrate"]
-    print(f"Running: {' '.join(migrate_command)} in {project_path}")
-    migrate_process = subprocess.run(
-        migrate_command,
+    if process.returncode != 0:
+        print("\n❌ Data transfer failed or did not verify; db.sqlite3 is untouched")
+        return False
+    print("\n✅ Data copied and verified (row counts and checksums match)")
+    return True
+
+def run_replica_harness(project_path, project_name, venv_path, requests=1000):
+    """Drive simulated requests through the router against local SQLite stand-ins"""
+    print("\n🧪 Checking replica routing with local stand-in databases...")
+    process = subprocess.run(
+        [venv_python(venv_path), REPLICA_HARNESS, project_path, f"{project_name}.settings", str(requests)],
         cwd=project_path,
-        shell=False,
-        capture_output=True,
-        text=True
     )
-    print(migrate_process.stdout)
-    if migrate_process.stderr:
-        print(f"\n❌ Migration errors:\n{migrate_process.stderr}")
-    else:
-        print("\n✅ Migrations completed successfully!")
+    return process.returncode == 0
 
 def auto_activate_and_configure():
     print("\n🚀 Django Project Configuration & Migration Setup 🚀")
@@ -44,38 +147,21 @@ def auto_activate_and_configure():
         print(f"❌ Path not found: {project_path}")
         return
     
-    venv_path = None
-    for venv_name in ['venv', '.venv', 'env']:
-        possible_path = os.path.join(project_path, venv_name)
-        if os.path.exists(possible_path):
-            venv_path = possible_path
-            break
-    
+    venv_path = find_venv(project_path)
     if not venv_path:
         print("\n❌ No virtualenv found in project! Please create one (e.g., `python3 -m venv venv`)")
         return
-    
-    print(f"\n🔧 Activating virtual environment and installing dependencies at {venv_path}")
-    commands = [
-        f"source {os.path.join(venv_path, 'bin', 'activate')}",
-        "pip install --upgrade pip",
-        "pip install Django PyMySQL",
-        '''python -c "import pymysql; print(f'\\n✅ PyMySQL {pymysql.__version__} ready!')"''',
-        '''python -c "import django; print(f'\\n✅ Django {django.VERSION} ready!')"'''
-    ]
-    
-    setup_process = subprocess.run(
-        " && ".join(commands),
-        shell=True,
-        executable="/bin/bash",
-        capture_output=True,
-        text=True
-    )
-    print(setup_process.stdout)
-    if setup_process.stderr:
-        print(f"\n❌ Setup errors:\n{setup_process.stderr}")
+
+    print(f"\n🔧 Checking dependencies in virtual environment at {venv_path}")
+    try:
+        # Versions come from dist-info metadata; pip only runs for missing packages
+        ensure_packages(venv_path, ['Django', 'PyMySQL'])
+    except subprocess.CalledProcessError as e:
+        print(f"\n❌ Setup errors:\n{e}")
         return
-        
+    print(f"\n✅ PyMySQL {installed_version(venv_path, 'PyMySQL')} ready!")
+    print(f"✅ Django {installed_version(venv_path, 'Django')} ready!")
+
     project_name = os.path.basename(project_path)
     settings_path = os.path.join(project_path, project_name, "settings.py")
 
@@ -98,41 +184,47 @@ def auto_activate_and_configure():
         print("\n❌ Database name and user are required!")
         return
 
-    config_template = f"""
-DATABASES = {{
-    'default': {{
-        'ENGINE': 'django.db.backends.mysql',
-        'NAME': '{db_config['NAME']}',
-        'USER': '{db_config['USER']}',
-        'PASSWORD': '{db_config['PASSWORD']}',
-        'HOST': '{db_config['HOST']}',
-        'PORT': '{db_config['PORT']}',
-        'OPTIONS': {{
+    # Existing SQLite data can be streamed over once MySQL has the schema
+    sqlite_path = os.path.join(project_path, "db.sqlite3")
+    copy_data = (os.path.exists(sqlite_path) and
+                 input("Copy existing data from db.sqlite3 into MySQL after migrating? (y/n) [y]: ").strip().lower() != 'n')
+
+    mode, pool = ask_connection_mode()
+    if mode == 'pooled':
+        try:
+            ensure_packages(venv_path, [POOL_PACKAGE])
+        except subprocess.CalledProcessError as e:
+            print(f"\n❌ Could not install {POOL_PACKAGE}: {e}")
+            return
+
+    print("\n📖 Read Replicas")
+    print("-----------------------")
+    replicas, weights = ask_replicas(db_config)
+
+    reuse = connection_settings(mode, pool, version_tuple(installed_version(venv_path, 'Django')))
+    database = {
+        'ENGINE': reuse.pop('ENGINE'),
+        **db_config,
+        'OPTIONS': {
             'init_command': "SET sql_mode='STRICT_TRANS_TABLES'",
             'charset': 'utf8mb4',
-        }},
-    }}
-}}
-"""
+        },
+        **reuse,
+    }
 
-    backup_path = settings_path + ".bak"
     try:
-        with open(settings_path, 'r') as f:
-            original = f.read()
-        with open(backup_path, 'w') as b:
-            b.write(original)
-        
-        # Find where DATABASES starts and where it ends
-        match = re.search(r"DATABASES\s*=\s*{.*?}(?=\s*#|\s*\w+\s*=|$)", original, re.DOTALL)
-
-        if match:
-            start, end = match.span()
-            updated_content = original[:start] + config_template + original[end:]
+        # Replaces the whole DATABASES assignment, nested dicts included;
+        # the previous file is kept as settings.py.bak
+        editor = SettingsEditor(settings_path)
+        if replicas:
+            # Replicas share the primary's engine, options and connection mode
+            configure_replicas(editor, project_path, project_name, database, replicas, weights)
+            print(f"\n✅ Router for {len(replicas)} read replica(s) written to {project_name}/db_router.py")
         else:
-            updated_content = original + "\n" + config_template + "\n"
-
-        with open(settings_path, 'w') as f:
-            f.write(updated_content)
+            # A previous run may have set up replicas; their router would route reads to missing aliases
+            editor.set('DATABASES', {'default': database})
+            remove_replicas(editor, project_name)
+        editor.save(backup=True)
 
         print("\n✅ Database configured successfully!")
     except Exception as e:
@@ -176,7 +268,16 @@ DATABASES = {{
         print(f"    {pymysql_import_line}")
         print(f"    {pymysql_install_line}")
 
-    run_migrations(project_path)
+    migrated = run_migrations(project_path, project_name, venv_path)
+
+    if copy_data and migrated:
+        transfer_sqlite_data(project_path, project_name, venv_path, sqlite_path)
+
+    if input("\nBenchmark connect overhead with and without pooling? (y/n) [n]: ").strip().lower() == 'y':
+        run_pool_benchmark(project_path, project_name, venv_path)
+
+    if replicas and input("Check read/write routing with simulated requests? (y/n) [n]: ").strip().lower() == 'y':
+        run_replica_harness(project_path, project_name, venv_path)
 
 if __name__ == "__main__":
     auto_activate_and_configure()
\ No newline at end of file
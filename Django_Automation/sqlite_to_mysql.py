@@ -0,0 +1,296 @@
+import os
+import sys
+import json
+import time
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+
+# Streams every model table from the old db.sqlite3 into the project's new
+# DATABASES['default'] (MySQL after sql_connect). Runs *inside the project's
+# venv*, after `migrate` has created the target schema:
+#
+#     venv/bin/python sqlite_to_mysql.py <project_path> <settings_module> <sqlite_path> [batch_size] [workers]
+#
+# - Tables are copied in foreign-key dependency order; tables on the same
+#   level don't depend on each other and are copied in parallel threads.
+# - Rows are read with fetchmany() and written with executemany(), one batch
+#   at a time and committed per batch, so memory stays flat whatever the
+#   database size.
+# - Target tables are emptied first (migrate already filled content types and
+#   permissions) and rows keep their primary keys, so references stay valid.
+# - On MySQL, secondary indexes are dropped for the load and rebuilt after
+#   it, and foreign key / unique checks are off for the loading sessions.
+# - Afterwards every table is verified with an ORM row count and a checksum
+#   of all rows, read back through each database's own type converters.
+
+SOURCE = 'sqlite_source'
+TARGET = 'default'
+DEFAULT_BATCH_SIZE = 5000
+
+def _models():
+    from django.apps import apps
+    return [model for model in apps.get_models(include_auto_created=True)
+            if model._meta.managed and not model._meta.proxy and not model._meta.swapped]
+
+def dependency_levels(models):
+    """Group models into levels; each level only references models of earlier levels"""
+    by_table = {model._meta.db_table: model for model in models}
+    requires = {}
+    for model in models:
+        related = set()
+        for field in model._meta.concrete_fields:
+            if field.remote_field is not None and field.related_model is not None:
+                table = field.related_model._meta.db_table
+                if table in by_table and table != model._meta.db_table:
+                    related.add(table)
+        requires[model._meta.db_table] = related
+
+    levels = []
+    remaining = dict(requires)
+    while remaining:
+        ready = sorted(table for table, tables in remaining.items() if not tables & remaining.keys())
+        if not ready:
+            ready = sorted(remaining)  # reference cycle: load the rest together, checks are off
+        levels.append([by_table[table] for table in ready])
+        for table in ready:
+            del remaining[table]
+    return levels
+
+def _columns(model):
+    return [field.column for field in model._meta.concrete_fields]
+
+def _prepare_session(connection):
+    # Foreign key checks off for this connection (MySQL, SQLite; a no-op elsewhere)
+    connection.disable_constraint_checking()
+    if connection.vendor == 'mysql':
+        with connection.cursor() as cursor:
+            cursor.execute("SET UNIQUE_CHECKS = 0")
+
+def _row_converter(model, connection):
+    """Per-row conversion for non-MySQL targets; MySQL takes SQLite's values as they are"""
+    from datetime import timezone
+    from django.conf import settings
+
+    if connection.vendor == 'mysql':
+        return None
+    fields = model._meta.concrete_fields
+    kinds = [field.get_internal_type() for field in fields]
+
+    def convert(row):
+        converted = []
+        for field, kind, value in zip(fields, kinds, row):
+            if value is not None:
+                if kind == 'JSONField' and isinstance(value, str):
+                    value = json.loads(value)
+                else:
+                    value = field.to_python(value)
+                    if kind == 'DateTimeField' and settings.USE_TZ and value.tzinfo is None:
+                        value = value.replace(tzinfo=timezone.utc)  # SQLite stores UTC, naive
+            converted.append(field.get_db_prep_save(value, connection))
+        return converted
+
+    return convert
+
+def copy_table(model, batch_size):
+    from django.db import connections, transaction
+
+    source, target = connections[SOURCE], connections[TARGET]
+    table = model._meta.db_table
+    columns = _columns(model)
+    quoted = ', '.join(target.ops.quote_name(column) for column in columns)
+    insert_sql = (f"INSERT INTO {target.ops.quote_name(table)} ({quoted}) "
+                  f"VALUES ({', '.join(['%s'] * len(columns))})")
+    select_sql = (f"SELECT {', '.join(source.ops.quote_name(column) for column in columns)} "
+                  f"FROM {source.ops.quote_name(table)}")
+    convert = _row_converter(model, target)
+
+    started = time.perf_counter()
+    rows = 0
+    try:
+        _prepare_session(target)
+        with source.cursor() as read, target.cursor() as write:
+            read.execute(select_sql)
+            while True:
+                batch = read.fetchmany(batch_size)
+                if not batch:
+                    break
+                if convert is not None:
+                    batch = [convert(row) for row in batch]
+                # One commit per batch, not per row
+                with transaction.atomic(using=TARGET):
+                    write.executemany(insert_sql, batch)
+                rows += len(batch)
+    finally:
+        # Connections are per thread; don't leave them to the pool's threads
+        source.close()
+        target.close()
+
+    seconds = time.perf_counter() - started
+    print(f"✅ {table}: {rows:,} rows in {seconds:.1f}s ({rows / seconds if seconds else 0:,.0f} rows/s)", flush=True)
+    return {'table': table, 'rows': rows, 'seconds': round(seconds, 3)}
+
+def _truncate(models):
+    from django.db import connections
+
+    target = connections[TARGET]
+    _prepare_session(target)
+    with target.cursor() as cursor:
+        if target.vendor == 'mysql':
+            for model in models:
+                cursor.execute(f"TRUNCATE TABLE {target.ops.quote_name(model._meta.db_table)}")
+        else:
+            from django.core.management.color import no_style
+            tables = [model._meta.db_table for model in models]
+            for sql in target.ops.sql_flush(no_style(), tables, reset_sequences=False, allow_cascade=True):
+                cursor.execute(sql)
+
+def _secondary_indexes(models):
+    """Non-unique MySQL indexes that no foreign key relies on: [(table, name, columns)]"""
+    from django.db import connections
+
+    target = connections[TARGET]
+    if target.vendor != 'mysql':
+        return []
+    indexes = []
+    with target.cursor() as cursor:
+        for model in models:
+            table = model._meta.db_table
+            constraints = target.introspection.get_constraints(cursor, table)
+            fk_columns = [info['columns'] for info in constraints.values() if info['foreign_key']]
+            for name, info in constraints.items():
+                columns = info['columns']
+                if (not info['index'] or info['primary_key'] or info['unique'] or info['foreign_key']
+                        or not columns or None in columns):
+                    continue
+                if any(columns[:len(fk)] == fk for fk in fk_columns):
+                    continue  # MySQL needs an index leading with the FK columns
+                indexes.append((table, name, columns))
+    return indexes
+
+def _drop_indexes(indexes):
+    from django.db import connections
+
+    target = connections[TARGET]
+    with target.cursor() as cursor:
+        for table, name, columns in indexes:
+            cursor.execute(f"DROP INDEX {target.ops.quote_name(name)} ON {target.ops.quote_name(table)}")
+
+def _create_indexes(indexes):
+    from django.db import connections
+
+    target = connections[TARGET]
+    with target.cursor() as cursor:
+        for table, name, columns in indexes:
+            cursor.execute(f"CREATE INDEX {target.ops.quote_name(name)} ON {target.ops.quote_name(table)} "
+                           f"({', '.join(target.ops.quote_name(column) for column in columns)})")
+
+def _reset_sequences(models):
+    from django.db import connections
+    from django.core.management.color import no_style
+
+    target = connections[TARGET]
+    statements = target.ops.sequence_reset_sql(no_style(), models)
+    if statements:
+        with target.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
+
+def _json_default(value):
+    if isinstance(value, (bytes, memoryview)):
+        return bytes(value).hex()
+    return str(value)
+
+def _table_digest(model, alias, batch_size):
+    """Row count and sha256 over all rows in pk order, as the ORM reads them"""
+    from django.db import connections
+
+    digest = hashlib.sha256()
+    count = 0
+    attnames = [field.attname for field in model._meta.concrete_fields]
+    try:
+        rows = model._base_manager.using(alias).order_by('pk').values_list(*attnames)
+        for row in rows.iterator(chunk_size=batch_size):
+            digest.update(json.dumps(row, sort_keys=True, default=_json_default).encode())
+            digest.update(b'\n')
+            count += 1
+    finally:
+        connections[alias].close()
+    return count, digest.hexdigest()
+
+def verify_table(model, batch_size):
+    source_count = model._base_manager.using(SOURCE).count()
+    target_count = model._base_manager.using(TARGET).count()
+    result = {'table': model._meta.db_table, 'source_rows': source_count, 'target_rows': target_count}
+    if source_count == target_count:
+        _, source_digest = _table_digest(model, SOURCE, batch_size)
+        _, target_digest = _table_digest(model, TARGET, batch_size)
+        result['checksum_ok'] = source_digest == target_digest
+    else:
+        result['checksum_ok'] = False
+    result['ok'] = result['checksum_ok']
+    return result
+
+def transfer(project_path, settings_module, sqlite_path, batch_size=DEFAULT_BATCH_SIZE, workers=None):
+    os.chdir(project_path)
+    sys.path.insert(0, project_path)
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
+
+    import django
+    from django.conf import settings
+
+    # Connections are created lazily, so the source alias can still be added here
+    settings.DATABASES[SOURCE] = {'ENGINE': 'django.db.backends.sqlite3', 'NAME': sqlite_path}
+    django.setup()
+    from django.db import connections
+
+    source_tables = set(connections[SOURCE].introspection.table_names())
+    target_tables = set(connections[TARGET].introspection.table_names())
+    models = [model for model in _models()
+              if model._meta.db_table in source_tables and model._meta.db_table in target_tables]
+    levels = dependency_levels(models)
+    workers = workers or min(8, (os.cpu_count() or 1) * 2)
+    print(f"🚚 Copying {len(models)} tables in {len(levels)} dependency levels "
+          f"({workers} parallel workers, batches of {batch_size:,})", flush=True)
+
+    started = time.perf_counter()
+    _truncate(models)
+    indexes = _secondary_indexes(models)
+    _drop_indexes(indexes)
+    copied = []
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for level in levels:
+                copied.extend(pool.map(lambda model: copy_table(model, batch_size), level))
+    finally:
+        if indexes:
+            print(f"🔧 Rebuilding {len(indexes)} secondary indexes...", flush=True)
+            _create_indexes(indexes)
+    _reset_sequences(models)
+    load_seconds = time.perf_counter() - started
+
+    print("🔎 Verifying row counts and checksums...", flush=True)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        checks = list(pool.map(lambda model: verify_table(model, batch_size), models))
+    connections.close_all()
+
+    failed = [check for check in checks if not check['ok']]
+    for check in failed:
+        print(f"❌ {check['table']}: {check['source_rows']:,} rows in SQLite, {check['target_rows']:,} in target"
+              f"{'' if check['source_rows'] != check['target_rows'] else ', checksums differ'}", flush=True)
+
+    report = {
+        'tables': len(models),
+        'rows': sum(table['rows'] for table in copied),
+        'load_seconds': round(load_seconds, 2),
+        'indexes_rebuilt': len(indexes),
+        'verified': not failed,
+        'failed_tables': [check['table'] for check in failed],
+    }
+    print(json.dumps(report))
+    return report
+
+if __name__ == "__main__":
+    report = transfer(sys.argv[1], sys.argv[2], sys.argv[3],
+                      int(sys.argv[4]) if len(sys.argv) > 4 else DEFAULT_BATCH_SIZE,
+                      int(sys.argv[5]) if len(sys.argv) > 5 else None)
+    sys.exit(0 if report['verified'] else 1)
@@ -0,0 +1,241 @@
+import os
+import sys
+import time
+import random
+import sqlite3
+import tempfile
+import threading
+
+from settings_editor import SettingsEditor
+from venv_introspect import find_venv, installed_version, version_tuple
+
+# SQLite tuning for concurrent dev/staging use. Every new connection gets:
+# - journal_mode=WAL: readers no longer block the writer (and vice versa)
+# - busy_timeout: wait for the write lock instead of failing "database is locked"
+# - synchronous=NORMAL: in WAL mode, fsync at checkpoints instead of every commit
+# - mmap_size / cache_size: serve reads from memory-mapped pages and a bigger page cache
+#
+# Django 5.1+ runs these through DATABASES OPTIONS (init_command, plus
+# transaction_mode=IMMEDIATE so writers queue up front instead of deadlocking
+# on lock upgrade). Older releases get a small connection_created handler
+# module inside the project package.
+
+PRAGMAS = [
+    ('journal_mode', 'WAL'),
+    ('busy_timeout', 5000),          # ms
+    ('synchronous', 'NORMAL'),
+    ('mmap_size', 134217728),        # 128 MiB
+    ('cache_size', -20000),          # negative = KiB, so ~20 MB
+]
+SQLITE_ENGINE = 'django.db.backends.sqlite3'
+HANDLER_MODULE = 'sqlite_tuning'
+
+def pragma_statements():
+    return [f"PRAGMA {name}={value}" for name, value in PRAGMAS]
+
+HANDLER_PY = '''from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+# SQLite tuning applied to every new connection (generated by sqlite_tuning.py)
+PRAGMAS = {pragmas!r}
+
+@receiver(connection_created)
+def tune_sqlite(sender, connection, **kwargs):
+    if connection.vendor == 'sqlite':
+        for pragma in PRAGMAS:
+            connection.connection.execute(pragma)
+'''
+HANDLER_IMPORT = f"from . import {HANDLER_MODULE}  # noqa: F401 (SQLite PRAGMAs per connection)"
+
+def _install_handler(project_path, project_name):
+    package_path = os.path.join(project_path, project_name)
+    with open(os.path.join(package_path, f'{HANDLER_MODULE}.py'), 'w') as f:
+        f.write(HANDLER_PY.format(pragmas=pragma_statements()))
+
+    init_py_path = os.path.join(package_path, '__init__.py')
+    content = ''
+    if os.path.exists(init_py_path):
+        with open(init_py_path, 'r') as f:
+            content = f.read()
+    if HANDLER_IMPORT not in content:
+        with open(init_py_path, 'a') as f:
+            f.write(('\n' if content and not content.endswith('\n') else '') + HANDLER_IMPORT + '\n')
+
+def apply_tuning(project_path, project_name, django_version=None):
+    """Tune every SQLite database in settings.py; returns the aliases tuned"""
+    settings_path = os.path.join(project_path, project_name, 'settings.py')
+    if django_version is None:
+        django_version = version_tuple(installed_version(find_venv(project_path), 'Django') or '0')
+
+    tuned = []
+    with SettingsEditor(settings_path) as editor:
+        for alias, config in editor.databases().items():
+            engine = config.get('ENGINE')
+            if engine is None or engine.python() != SQLITE_ENGINE:
+                continue
+            tuned.append(alias)
+            if django_version >= (5, 1):
+                options = config.setdefault('OPTIONS', {})
+                init_command = ';'.join(pragma_statements())
+                if options.get('init_command') is None or options['init_command'].python() != init_command:
+                    options['init_command'] = init_command
+                if options.get('transaction_mode') is None:
+                    options['transaction_mode'] = 'IMMEDIATE'
+
+    if tuned and django_version < (5, 1):
+        _install_handler(project_path, project_name)
+    return tuned
+
+# --- Benchmark -------------------------------------------------------------------
+
+BENCH_ROWS = 10000
+
+def _seed(path):
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, payload TEXT, hits INTEGER DEFAULT 0)")
+    conn.execute("CREATE TABLE counters (name TEXT PRIMARY KEY, value INTEGER)")
+    conn.execute("INSERT INTO counters VALUES ('items', ?)", (BENCH_ROWS,))
+    conn.executemany("INSERT INTO items (payload) VALUES (?)", ((f"row {i}" * 8,) for i in range(BENCH_ROWS)))
+    conn.commit()
+    conn.close()
+
+def _connect(path, tuned):
+    # Like Django: autocommit connection, Python's default 5s busy timeout
+    conn = sqlite3.connect(path, timeout=5.0, isolation_level=None, check_same_thread=False)
+    if tuned:
+        for statement in pragma_statements():
+            conn.execute(statement)
+    return conn
+
+def _writer(path, tuned, immediate, stop, stats):
+    conn = _connect(path, tuned)
+    while not stop.is_set():
+        try:
+            # A save() touching two tables inside transaction.atomic()
+            conn.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+            conn.execute("INSERT INTO items (payload) VALUES (?)", ("new row" * 8,))
+            conn.execute("UPDATE counters SET value = value + 1 WHERE name = 'items'")
+            conn.execute("COMMIT")
+            stats['writes'] += 1
+        except sqlite3.OperationalError:
+            stats['locked'] += 1
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+    conn.close()
+
+def _reader(path, tuned, stop, stats):
+    conn = _connect(path, tuned)
+    while not stop.is_set():
+        try:
+            start = random.randint(1, BENCH_ROWS - 100)
+            conn.execute("SELECT id, payload FROM items WHERE id BETWEEN ? AND ?", (start, start + 50)).fetchall()
+            conn.execute("SELECT value FROM counters WHERE name = 'items'").fetchone()
+            stats['reads'] += 1
+        except sqlite3.OperationalError:
+            stats['locked'] += 1
+    conn.close()
+
+def run_benchmark(tuned, writers=4, readers=8, seconds=5.0, immediate=None):
+    """Hammer a scratch database from threads; returns ops/s and lock errors.
+
+    immediate: start write transactions with BEGIN IMMEDIATE (defaults to
+    tuned; only Django 5.1+ tuning applies it)
+    """
+    immediate = tuned if immediate is None else immediate
+    with tempfile.TemporaryDirectory(prefix='sqlite-bench-') as scratch:
+        path = os.path.join(scratch, 'bench.sqlite3')
+        _seed(path)
+        stop = threading.Event()
+        stats = [{'writes': 0, 'reads': 0, 'locked': 0} for _ in range(writers + readers)]
+        threads = [threading.Thread(target=_writer, args=(path, tuned, immediate, stop, stats[i]))
+                   for i in range(writers)]
+        threads += [threading.Thread(target=_reader, args=(path, tuned, stop, stats[writers + i]))
+                    for i in range(readers)]
+        for thread in threads:
+            thread.start()
+        time.sleep(seconds)
+        stop.set()
+        for thread in threads:
+            thread.join()
+
+    totals = {key: sum(stat[key] for stat in stats) for key in ('writes', 'reads', 'locked')}
+    return {
+        'writes_per_sec': round(totals['writes'] / seconds, 1),
+        'reads_per_sec': round(totals['reads'] / seconds, 1),
+        'locked_errors': totals['locked'],
+    }
+
+def benchmark(writers=4, readers=8, seconds=5.0, django_version=None):
+    """Compare default and tuned connections; django_version (a tuple) picks
+    what the tuned run applies, as apply_tuning would for that release"""
+    # Before 5.1 the connection_created handler sets the PRAGMAs only; Django
+    # still starts write transactions with a deferred BEGIN
+    immediate = django_version is None or django_version >= (5, 1)
+    print(f"\n⏱️ {writers} writer and {readers} reader threads, {seconds:g}s per run...")
+    if not immediate:
+        print("ℹ️ Django < 5.1: the tuned run uses PRAGMAs only (no BEGIN IMMEDIATE)")
+    default = run_benchmark(False, writers, readers, seconds)
+    tuned = run_benchmark(True, writers, readers, seconds, immediate)
+
+    print(f"\n{'Metric':<18}{'Default':>12}{'Tuned':>12}{'Change':>12}")
+    print("-" * 54)
+    for label, key in (("Writes/sec", 'writes_per_sec'), ("Reads/sec", 'reads_per_sec'),
+                       ("Locked errors", 'locked_errors')):
+        old, new = default[key], tuned[key]
+        change = f"{(new - old) / old * 100:+.1f}%" if old else "-"
+        print(f"{label:<18}{old:>12}{new:>12}{change:>12}")
+    return default, tuned
+
+def _project_django(project_path):
+    """Django version tuple installed in a project's venv, or None if unknown"""
+    venv_path = find_venv(os.path.normpath(project_path)) if project_path else None
+    version = installed_version(venv_path, 'Django') if venv_path else None
+    return version_tuple(version) if version else None
+
+def main():
+    print("\n" + "="*50)
+    print("SQLite Concurrency Tuning".center(50))
+    print("="*50)
+
+    while True:
+        print("\nChoose an option:")
+        print("1. Tune SQLite for an existing project")
+        print("2. Run the multi-threaded read/write benchmark")
+        print("3. Exit")
+
+        choice = input("Enter your choice (1/2/3): ").strip()
+
+        if choice == '1':
+            project_path = os.path.normpath(input("\nEnter full path to your Django project (where manage.py is): ").strip())
+            project_name = input("Enter your Django project name (folder inside project path): ").strip()
+            if not os.path.exists(os.path.join(project_path, project_name, 'settings.py')):
+                print("❌ settings.py not found")
+                continue
+            try:
+                tuned = apply_tuning(project_path, project_name)
+            except SyntaxError as e:
+                print(f"❌ Could not parse settings.py: {e}")
+                continue
+            if tuned:
+                print(f"✅ Tuned SQLite database(s): {', '.join(tuned)}")
+            else:
+                print("ℹ️ No SQLite databases configured in settings.py")
+
+        elif choice == '2':
+            seconds = input("Seconds per run [5]: ").strip()
+            project_path = input("Project path, to match its Django version (Enter for Django 5.1+): ").strip()
+            benchmark(seconds=float(seconds) if seconds else 5.0, django_version=_project_django(project_path))
+
+        elif choice == '3':
+            print("Goodbye!")
+            break
+        else:
+            print("Invalid choice. Please select 1, 2 or 3.")
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == 'bench':
+        # sqlite_tuning.py bench [seconds] [project_path]
+        benchmark(seconds=float(sys.argv[2]) if len(sys.argv) > 2 else 5.0,
+                  django_version=_project_django(sys.argv[3]) if len(sys.argv) > 3 else None)
+    else:
+        main()
@@ -1,50 +1,15 @@
 import os
-import subprocess
+import sys
 import re
 
+from bootstrap import create_traditional_project
+from pipeline import has_checkpoints
+
 def validate_name(name):
     """Ensure valid Python package name"""
     if not name or not re.match(r'^[a-zA-Z][a-zA-Z0-9_]*$', name):
         raise ValueError("Name must start with a letter and contain only letters, numbers, or underscores")
 
-def create_traditional_project(project_path, project_name):
-    """Create traditional Django structure matching the screenshot"""
-    try:
-        venv_path = os.path.join(project_path, 'venv')
-        # Create virtual environment
-        subprocess.run(f"python -m venv {venv_path}", shell=True, check=True)
-
-        # Install Django inside the venv
-        install_cmd = f"""
-        source {os.path.join(venv_path, 'bin/activate')} && \
-        pip install django && \
-        deactivate
-        """
-        subprocess.run(install_cmd, shell=True, executable='/bin/bash', check=True)
-
-        # Create Django project inside the project_path
-        create_cmd = f"""
-        cd {project_path} && \
-        source {os.path.join(venv_path, 'bin/activate')} && \
-        django-admin startproject {project_name} . && \
-        deactivate
-        """
-        subprocess.run(create_cmd, shell=True, executable='/bin/bash', check=True)
-
-        # Run migrations to create db.sqlite3
-        migrate_cmd = f"""
-        cd {project_path} && \
-        source {os.path.join(venv_path, 'bin/activate')} && \
-        python manage.py migrate && \
-        deactivate
-        """
-        subprocess.run(migrate_cmd, shell=True, executable='/bin/bash', check=True)
-
-        return True
-    except subprocess.CalledProcessError as e:
-        print(f"❌ Error during setup: {e}")
-        return False
-
 def main():
     print("\n" + "="*50)
     print("Django Traditional Project Creator".center(50))
@@ -88,10 +53,16 @@ def main():
     try:
         os.makedirs(project_path, exist_ok=False)
     except FileExistsError:
-        print(f"❌ Project folder already exists: {project_path}")
-        return
+        # A folder left by a failed bootstrap is resumed instead of rejected
+        if not has_checkpoints(project_path):
+            print(f"❌ Project folder already exists: {project_path}")
+            return
+        print(f"♻️ Resuming unfinished bootstrap in {project_path}")
 
-    if create_traditional_project(project_path, project_name):
+    use_golden = input("Clone from golden snapshot for fast creation? (y/n) [y]: ").strip().lower() != 'n'
+    tune_sqlite = input("Tune SQLite for concurrent access (WAL, busy_timeout)? (y/n) [n]: ").strip().lower() == 'y'
+
+    if create_traditional_project(project_path, project_name, golden=use_golden, sqlite_tuning=tune_sqlite):
         print(f"\n✅ Traditional structure created at:")
         print(f"{project_path}/")
         print(f"├── db.sqlite3")
@@ -115,4 +86,9 @@ def main():
     input("\nPress Enter to exit...")
 
 if __name__ == "__main__":
-    main()
+    # `python start_project_folder_given.py manifest.json` provisions every project in the manifest
+    if len(sys.argv) > 1:
+        from batch_provision import provision_from_manifest
+        provision_from_manifest(sys.argv[1])
+    else:
+        main()
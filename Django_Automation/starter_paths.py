@@ -0,0 +1,14 @@
+import os
+
+# Shared cache folder for everything the automation scripts keep between runs
+# (wheelhouse, lockfiles, golden snapshots, package store, ...).
+STARTER_HOME = os.environ.get(
+    'DJANGO_STARTER_HOME',
+    os.path.join(os.path.expanduser('~'), '.django_starter')
+)
+
+def starter_dir(*parts):
+    """Return a folder inside STARTER_HOME, creating it if needed"""
+    path = os.path.join(STARTER_HOME, *parts)
+    os.makedirs(path, exist_ok=True)
+    return path
@@ -0,0 +1,13 @@
+try:
+    import django
+except ImportError:
+    django = None  # tests that need Django are skipped; run them with a project's venv/bin/python
+
+def setup_django():
+    """Minimal settings for tests that build Django fields and migration operations"""
+    if django is None:
+        return
+    from django.conf import settings
+    if not settings.configured:
+        settings.configure(USE_TZ=True, INSTALLED_APPS=[])
+        django.setup()
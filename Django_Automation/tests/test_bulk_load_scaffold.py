@@ -0,0 +1,69 @@
+import decimal
+import datetime
+import unittest
+
+from tests import django, setup_django
+from bulk_load_scaffold import BULK_LOAD_PY
+
+def setUpModule():
+    setup_django()
+
+def _field(field_class, name, **options):
+    field = field_class(**options)
+    field.set_attributes_from_name(name)
+    return field
+
+@unittest.skipUnless(django, "Django is not installed")
+class CoerceTests(unittest.TestCase):
+    """The generated command's per-row conversion, without a database"""
+
+    def setUp(self):
+        from django.core.management.base import CommandError
+        from django.db import models
+
+        namespace = {}
+        exec(compile(BULK_LOAD_PY, 'bulk_load.py', 'exec'), namespace)
+        self.command = namespace['Command']()
+        self.command.auto_values = {}
+        self.CommandError = CommandError
+        self.models = models
+
+    def coerce(self, fields, row):
+        return self.command._coerce(fields, row, line=2)
+
+    def test_values_go_through_to_python(self):
+        fields = [(_field(self.models.IntegerField, 'qty'), 'qty'),
+                  (_field(self.models.DecimalField, 'price', max_digits=6, decimal_places=2), 'price'),
+                  (_field(self.models.BooleanField, 'active'), 'active')]
+        self.assertEqual(self.coerce(fields, {'qty': '3', 'price': '9.50', 'active': '1'}),
+                         [3, decimal.Decimal('9.50'), True])
+
+    def test_empty_strings(self):
+        fields = [(_field(self.models.CharField, 'note', max_length=10), 'note'),
+                  (_field(self.models.IntegerField, 'rank', null=True), 'rank'),
+                  (_field(self.models.IntegerField, 'stock', default=7), 'stock')]
+        # '' stays '' for text; numbers get NULL or their default
+        self.assertEqual(self.coerce(fields, {'note': '', 'rank': '', 'stock': ''}), ['', None, 7])
+
+    def test_missing_column_uses_default(self):
+        fields = [(_field(self.models.CharField, 'status', max_length=10, default='new'), None)]
+        self.assertEqual(self.coerce(fields, {}), ['new'])
+
+    def test_missing_auto_now_column_uses_load_time(self):
+        created = _field(self.models.DateTimeField, 'created', auto_now_add=True)
+        loaded_at = datetime.datetime(2024, 5, 1, tzinfo=datetime.timezone.utc)
+        self.command.auto_values = {created: loaded_at}
+        self.assertEqual(self.coerce([(created, None)], {}), [loaded_at])
+
+    def test_not_null_without_value(self):
+        fields = [(_field(self.models.IntegerField, 'qty'), 'qty')]
+        with self.assertRaisesRegex(self.CommandError, r"Line 2, column qty: empty value"):
+            self.coerce(fields, {'qty': ''})
+
+    def test_invalid_value_names_line_and_column(self):
+        fields = [(_field(self.models.IntegerField, 'qty'), 'qty')]
+        with self.assertRaisesRegex(self.CommandError, r"Line 2, column qty"):
+            self.coerce(fields, {'qty': 'many'})
+
+if __name__ == '__main__':
+    unittest.main()
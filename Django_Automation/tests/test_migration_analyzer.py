@@ -0,0 +1,95 @@
+import unittest
+
+from tests import django, setup_django
+from migration_analyzer import classify, _risk, HIGH_SECONDS, MEDIUM_SECONDS
+
+def setUpModule():
+    setup_django()
+
+@unittest.skipUnless(django, "Django is not installed")
+class ClassifyTests(unittest.TestCase):
+    def setUp(self):
+        from django.db import models
+        from django.db.migrations.state import ModelState, ProjectState
+
+        self.models = models
+        self.state = ProjectState()
+        self.state.add_model(ModelState('shop', 'Order', [
+            ('id', models.AutoField(primary_key=True)),
+            ('total', models.IntegerField()),
+            ('note', models.CharField(max_length=20, null=True)),
+        ]))
+        self.state.add_model(ModelState('shop', 'Item', [
+            ('id', models.AutoField(primary_key=True)),
+        ], options={'db_table': 'legacy_items'}))
+
+    def classify(self, operation, vendor='postgresql'):
+        return [(kind, table) for kind, table, _, _ in classify(operation, 'shop', self.state, vendor)]
+
+    def test_add_nullable_field_is_cheap(self):
+        from django.db.migrations import operations
+        operation = operations.AddField('order', 'coupon', self.models.CharField(max_length=10, null=True))
+        self.assertEqual(self.classify(operation), [])
+
+    def test_add_not_null_field_rewrites(self):
+        from django.db.migrations import operations
+        operation = operations.AddField('order', 'paid', self.models.BooleanField(default=False))
+        self.assertEqual(self.classify(operation), [('rewrite', 'shop_order')])
+
+    def test_add_foreign_key_builds_an_index(self):
+        from django.db.migrations import operations
+        operation = operations.AddField('item', 'order', self.models.ForeignKey(
+            'shop.Order', null=True, on_delete=self.models.CASCADE))
+        self.assertEqual(self.classify(operation), [('index', 'legacy_items')])  # Meta.db_table
+
+    def test_add_many_to_many_is_a_new_table(self):
+        from django.db.migrations import operations
+        operation = operations.AddField('order', 'items', self.models.ManyToManyField('shop.Item'))
+        self.assertEqual(self.classify(operation), [])
+
+    def test_alter_field_type(self):
+        from django.db.migrations import operations
+        operation = operations.AlterField('order', 'note', self.models.CharField(max_length=200, null=True))
+        self.assertEqual(self.classify(operation), [('rewrite', 'shop_order')])
+
+    def test_set_not_null_scans_or_rewrites_by_vendor(self):
+        from django.db.migrations import operations
+        operation = operations.AlterField('order', 'note', self.models.CharField(max_length=20, default=''))
+        self.assertEqual(self.classify(operation, 'postgresql'), [('scan', 'shop_order')])
+        self.assertEqual(self.classify(operation, 'mysql'), [('rewrite', 'shop_order')])
+
+    def test_alter_field_adds_index(self):
+        from django.db.migrations import operations
+        operation = operations.AlterField('order', 'total', self.models.IntegerField(db_index=True))
+        self.assertEqual(self.classify(operation), [('index', 'shop_order')])
+
+    def test_remove_field_only_costs_on_mysql(self):
+        from django.db.migrations import operations
+        operation = operations.RemoveField('order', 'note')
+        self.assertEqual(self.classify(operation, 'postgresql'), [])
+        self.assertEqual(self.classify(operation, 'mysql'), [('rewrite', 'shop_order')])
+
+    def test_add_index(self):
+        from django.db.migrations import operations
+        operation = operations.AddIndex('order', self.models.Index(fields=['total'], name='order_total_idx'))
+        self.assertEqual(self.classify(operation), [('index', 'shop_order')])
+
+    def test_data_migrations(self):
+        from django.db.migrations import operations
+        self.assertEqual(self.classify(operations.RunPython(lambda apps, schema_editor: None)), [('data', None)])
+        self.assertEqual(self.classify(operations.RunSQL("UPDATE shop_order SET total = 0")), [('data', None)])
+
+    def test_create_model_is_cheap(self):
+        from django.db.migrations import operations
+        operation = operations.CreateModel('Coupon', [('id', self.models.AutoField(primary_key=True))])
+        self.assertEqual(self.classify(operation), [])
+
+class RiskTests(unittest.TestCase):
+    def test_levels(self):
+        self.assertEqual(_risk('rewrite', None), 'review')  # unknown row count
+        self.assertEqual(_risk('rewrite', 0.0), 'low')
+        self.assertEqual(_risk('rewrite', MEDIUM_SECONDS), 'medium')
+        self.assertEqual(_risk('rewrite', HIGH_SECONDS), 'high')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,199 @@
+import os
+import ast
+import tempfile
+import textwrap
+import unittest
+
+from orm_lint import collect_relations, lint_project
+
+SETTINGS = '''INSTALLED_APPS = [
+    'django.contrib.auth',
+    'library.apps.LibraryConfig',
+    'rest_framework',
+]
+'''
+
+MODELS = '''from django.db import models
+
+class Stamped(models.Model):
+    created_by = models.ForeignKey('auth.User', on_delete=models.CASCADE, related_name='%(class)s_created')
+
+    class Meta:
+        abstract = True
+
+class Author(Stamped):
+    name = models.CharField(max_length=50)
+
+class Tag(models.Model):
+    label = models.CharField(max_length=20)
+
+class Book(Stamped):
+    author = models.ForeignKey(Author, on_delete=models.CASCADE, related_name='books')
+    tags = models.ManyToManyField(Tag)
+    title = models.CharField(max_length=50)
+
+class Review(models.Model):
+    book = models.ForeignKey('library.Book', on_delete=models.CASCADE)
+    text = models.TextField()
+'''
+
+def _source(text):
+    return textwrap.dedent(text).lstrip('\n')
+
+class OrmLintTests(unittest.TestCase):
+    def lint(self, views='', tags=None):
+        """Findings for a 'library' app with MODELS and the given views.py / templatetags source"""
+        with tempfile.TemporaryDirectory() as project:
+            files = {
+                'proj/__init__.py': '',
+                'proj/settings.py': SETTINGS,
+                'library/__init__.py': '',
+                'library/apps.py': '',
+                'library/models.py': MODELS,
+                'library/views.py': "from .models import Author, Book, Review, Tag\n" + _source(views),
+                # Migrations are never linted
+                'library/migrations/0001_initial.py': "def forwards(apps, schema_editor):\n"
+                                                      "    for book in Book.objects.all():\n"
+                                                      "        book.author.name\n",
+            }
+            if tags is not None:
+                files['library/templatetags/__init__.py'] = ''
+                files['library/templatetags/library_tags.py'] = _source(tags)
+            for relative, content in files.items():
+                path = os.path.join(project, relative)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path, 'w') as f:
+                    f.write(content)
+            findings, files_scanned = lint_project(project)
+        self.assertEqual(files_scanned, len(files) - 3)  # the app without its migrations
+        return [(finding['severity'], finding['line'], finding['message']) for finding in findings]
+
+    def test_relations_from_models(self):
+        tree = ast.parse(MODELS)
+        relations = collect_relations([('library', tree)])
+        self.assertEqual(relations['Book']['author'], ('fk', 'Author'))
+        self.assertEqual(relations['Book']['tags'], ('m2m', 'Tag'))
+        self.assertEqual(relations['Author']['books'], ('reverse_many', 'Book'))
+        self.assertEqual(relations['Book']['review_set'], ('reverse_many', 'Review'))
+        self.assertEqual(relations['Book']['created_by'], ('fk', 'User'))  # from the abstract base
+        self.assertEqual(relations['User']['book_created'], ('reverse_many', 'Book'))  # %(class)s
+        self.assertNotIn('stamped_created', relations['User'])  # abstract models have no reverse accessors
+
+    def test_clean_project(self):
+        self.assertEqual(self.lint('''
+            def good(request):
+                books = Book.objects.select_related('author__created_by').prefetch_related('tags')
+                for book in books:
+                    print(book.author.name, book.author.created_by.username, book.author_id)
+                    print([tag.label for tag in book.tags.all()])
+                for row in Book.objects.values('author__name'):
+                    print(row['author__name'])
+                return Book.objects.filter(title='z').exists()
+        '''), [])
+
+    def test_foreign_key_in_loop(self):
+        findings = self.lint('''
+            def view(request):
+                for book in Book.objects.filter(title__icontains='x'):
+                    print(book.author.name)
+                    print(book.author.created_by.username)
+        ''')
+        # One finding per relation and loop, at its first use
+        self.assertEqual(findings, [('high', 4, "N+1: loop over Book (line 3) reads book.author, one query per row")])
+
+    def test_partial_select_related(self):
+        findings = self.lint('''
+            def view(request):
+                for book in Book.objects.select_related('author'):
+                    print(book.author.created_by.username)
+        ''')
+        self.assertEqual(findings, [('high', 4, "N+1: loop over Book (line 3) reads "
+                                                "book.author.created_by, one query per row")])
+
+    def test_many_relations_in_nested_loops(self):
+        findings = self.lint('''
+            def view(request):
+                for author in Author.objects.all():
+                    for book in author.books.all():
+                        print(book.review_set.all())
+        ''')
+        self.assertEqual(findings, [
+            ('high', 4, "N+1: loop over Author (line 3) reads author.books, one query per row"),
+            ('high', 5, "N+1: loop over Book (line 4) reads book.review_set, one query per row"),
+        ])
+
+    def test_queries_inside_loop(self):
+        findings = self.lint('''
+            def view(request):
+                for book in Book.objects.prefetch_related('tags'):
+                    Review.objects.filter(book=book).first()
+                    Tag.objects.create(label=book.title)
+        ''')
+        self.assertEqual(findings, [
+            ('medium', 4, "Query on Review inside a loop (first())"),
+            ('low', 5, "Tag.objects.create() inside a loop, one INSERT per row"),
+        ])
+
+    def test_untyped_loop_uses_related_manager_names(self):
+        findings = self.lint('''
+            def helper(items):
+                for item in items:
+                    print(item.books.all())
+        ''')
+        self.assertEqual(findings, [('medium', 4, "Possible N+1: item.books.all() runs a query on "
+                                                  "every iteration (line 3)")])
+
+    def test_counting(self):
+        findings = self.lint('''
+            def view(request):
+                if Book.objects.filter(title='y').count() > 0:
+                    pass
+                total = len(Book.objects.all())
+                books = Book.objects.all()
+                n = books.count()
+                for book in books:
+                    print(book.title)
+                if len(books) == 0:  # cached by the loop above
+                    pass
+                return total, n
+        ''')
+        self.assertEqual(findings, [
+            ('medium', 3, ".count() used as an existence check"),
+            ('medium', 5, "len(queryset) loads every row just to count them"),
+            ('low', 7, "books.count() and then iterating books runs two queries"),
+        ])
+
+    def test_ignore_marker(self):
+        self.assertEqual(self.lint('''
+            def view(request):
+                for review in Review.objects.all():
+                    print(review.book.title)  # orm-lint: ignore
+        '''), [])
+
+    def test_template_tags(self):
+        findings = self.lint(tags='''
+            from django import template
+            from ..models import Book
+            register = template.Library()
+
+            @register.simple_tag
+            def book_count():
+                return Book.objects.count()
+
+            @register.filter
+            def review_total(book):
+                return book.review_set.count()
+
+            @register.filter
+            def upper(value):
+                return value.upper()
+        ''')
+        self.assertEqual(findings, [
+            ('high', 11, "Query inside template filter 'review_total', run on every render "
+                         "and every {% for %} iteration"),
+            ('medium', 7, "Query inside template tag 'book_count', run on every render "
+                          "and every {% for %} iteration"),
+        ])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,140 @@
+import os
+import tempfile
+import unittest
+
+from settings_editor import SettingsEditor, Raw
+
+SETTINGS = '''"""Settings for the test project."""
+from pathlib import Path
+
+# Build paths inside the project like this: BASE_DIR / 'subdir'.
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+DEBUG = True  # keep this on locally
+
+INSTALLED_APPS = [
+    'django.contrib.admin',
+    'django.contrib.auth',
+]
+
+MIDDLEWARE = [
+    'django.middleware.security.SecurityMiddleware',
+    # sessions before auth
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',  # needs sessions
+]
+
+# Database
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'db.sqlite3',
+    }
+}
+'''
+
+SECURITY = 'django.middleware.security.SecurityMiddleware'
+SESSIONS = 'django.contrib.sessions.middleware.SessionMiddleware'
+AUTH = 'django.contrib.auth.middleware.AuthenticationMiddleware'
+
+class SettingsEditorTests(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.path = os.path.join(self.directory.name, 'settings.py')
+        with open(self.path, 'w') as f:
+            f.write(SETTINGS)
+
+    def read(self):
+        with open(self.path) as f:
+            return f.read()
+
+    def edit(self, *edits):
+        editor = SettingsEditor(self.path)
+        for edit in edits:
+            edit(editor)
+        return editor.save()
+
+    def test_no_edits_leaves_file_untouched(self):
+        self.assertFalse(self.edit())
+        self.assertEqual(self.read(), SETTINGS)
+
+    def test_comments_kept_outside_and_inside_edited_values(self):
+        self.edit(lambda editor: editor.add_middleware('shop.middleware.Timing', after=SESSIONS))
+        content = self.read()
+        for line in ('# Build paths inside the project like this', 'DEBUG = True  # keep this on locally',
+                     '    # sessions before auth\n    \'' + SESSIONS,
+                     f"'{AUTH}',  # needs sessions", '# Database'):
+            self.assertIn(line, content)
+
+    def test_only_edited_value_is_rewritten(self):
+        self.edit(lambda editor: editor.set('DEBUG', False))
+        self.assertEqual(self.read(), SETTINGS.replace('DEBUG = True', 'DEBUG = False'))
+
+    def test_add_and_remove_middleware_round_trip(self):
+        self.assertTrue(self.edit(lambda editor: editor.add_middleware('shop.middleware.Timing', position=0)))
+        self.assertEqual(SettingsEditor(self.path).get('MIDDLEWARE'),
+                         ['shop.middleware.Timing', SECURITY, SESSIONS, AUTH])
+
+        self.assertTrue(self.edit(lambda editor: editor.remove_middleware('shop.middleware.Timing')))
+        self.assertEqual(self.read(), SETTINGS)
+
+    def test_add_middleware_after(self):
+        self.edit(lambda editor: editor.add_middleware('shop.middleware.Timing', after=SESSIONS))
+        self.assertEqual(SettingsEditor(self.path).get('MIDDLEWARE'),
+                         [SECURITY, SESSIONS, 'shop.middleware.Timing', AUTH])
+
+    def test_remove_missing_middleware(self):
+        editor = SettingsEditor(self.path)
+        self.assertFalse(editor.remove_middleware('shop.middleware.Timing'))
+        self.assertFalse(editor.save())
+
+    def test_reapplying_edits_is_idempotent(self):
+        def configure(editor):
+            editor.ensure_import('import os')
+            editor.add_installed_app('shop')
+            editor.add_middleware('shop.middleware.Timing', position=0)
+            editor.setdefault('CACHES', {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+            editor.databases()['default'].setdefault('OPTIONS', {'timeout': 20})
+
+        self.assertTrue(self.edit(configure))
+        first = self.read()
+        self.assertFalse(self.edit(configure))
+        self.assertEqual(self.read(), first)
+        self.assertEqual(first.count('import os'), 1)
+        self.assertEqual(first.count("'shop'"), 1)
+
+    def test_raw_expressions(self):
+        self.edit(lambda editor: editor.set('STATIC_ROOT', Raw("BASE_DIR / 'static'")))
+        editor = SettingsEditor(self.path)
+        self.assertIn("STATIC_ROOT = BASE_DIR / 'static'\n", self.read())
+        self.assertEqual(editor.get('STATIC_ROOT'), Raw('BASE_DIR/"static"'))
+        self.assertEqual(editor.databases()['default']['NAME'].python(), Raw("BASE_DIR / 'db.sqlite3'"))
+
+    def test_new_import_goes_after_existing_imports(self):
+        self.edit(lambda editor: editor.ensure_import('import os'))
+        self.assertTrue(self.read().startswith('"""Settings for the test project."""\n'
+                                               'from pathlib import Path\nimport os\n'))
+
+    def test_remove_setting(self):
+        self.edit(lambda editor: editor.remove('DEBUG'))
+        self.assertNotIn('DEBUG', self.read())
+        self.assertNotIn('DEBUG', SettingsEditor(self.path))
+
+    def test_broken_result_is_never_written(self):
+        editor = SettingsEditor(self.path)
+        editor.set('BROKEN', Raw('1 +'))
+        with self.assertRaises(SyntaxError):
+            editor.save()
+        self.assertEqual(self.read(), SETTINGS)
+
+    def test_backup(self):
+        self.edit(lambda editor: editor.set('DEBUG', False))
+        editor = SettingsEditor(self.path)
+        editor.set('DEBUG', True)
+        editor.save(backup=True)
+        with open(self.path + '.bak') as f:
+            self.assertIn('DEBUG = False', f.read())
+
+if __name__ == '__main__':
+    unittest.main()
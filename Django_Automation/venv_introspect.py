@@ -0,0 +1,140 @@
+import os
+import re
+import json
+import glob
+import subprocess
+
+from starter_paths import STARTER_HOME
+
+# Answers "which venv does this project use?" and "what is installed in it?"
+# without starting an interpreter: versions come straight from the
+# *.dist-info/METADATA files in site-packages. Results are cached in memory
+# and on disk, keyed by the site-packages folder's mtime, which changes
+# whenever a distribution is installed or removed.
+VENV_NAMES = ('venv', '.venv', 'env')
+CACHE_PATH = os.path.join(STARTER_HOME, 'introspect-cache.json')
+
+_memory_cache = {}
+
+def bin_dir(venv_path):
+    return os.path.join(venv_path, 'Scripts' if os.name == 'nt' else 'bin')
+
+def venv_python(venv_path):
+    return os.path.join(bin_dir(venv_path), 'python.exe' if os.name == 'nt' else 'python')
+
+def find_venv(project_path, names=VENV_NAMES):
+    """Return the first venv inside project_path (checked via pyvenv.cfg), or None"""
+    for venv_name in names:
+        venv_path = os.path.join(project_path, venv_name)
+        if os.path.isfile(os.path.join(venv_path, 'pyvenv.cfg')):
+            return venv_path
+    return None
+
+def detect_project_name(project_path):
+    """The folder next to manage.py that holds settings.py"""
+    for settings_path in sorted(glob.glob(os.path.join(project_path, '*', 'settings.py'))):
+        return os.path.basename(os.path.dirname(settings_path))
+    return None
+
+def site_packages(venv_path):
+    if os.name == 'nt':
+        paths = [os.path.join(venv_path, 'Lib', 'site-packages')]
+    else:
+        paths = glob.glob(os.path.join(venv_path, 'lib', 'python*', 'site-packages'))
+    return [path for path in paths if os.path.isdir(path)]
+
+def normalize_name(name):
+    return re.sub(r'[-_.]+', '-', name).lower()
+
+def _read_metadata(dist_info):
+    name = version = None
+    try:
+        with open(os.path.join(dist_info, 'METADATA'), 'r', encoding='utf-8', errors='replace') as f:
+            for line in f:
+                if not line.strip():
+                    break  # end of the header block
+                if line.startswith('Name:'):
+                    name = line[5:].strip()
+                elif line.startswith('Version:'):
+                    version = line[8:].strip()
+    except OSError:
+        pass
+    if not (name and version):
+        # Fall back to the folder name: <name>-<version>.dist-info
+        name, _, version = os.path.basename(dist_info)[:-len('.dist-info')].partition('-')
+    return name, version
+
+def _load_disk_cache():
+    try:
+        with open(CACHE_PATH, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _save_disk_cache(cache):
+    os.makedirs(os.path.dirname(CACHE_PATH), exist_ok=True)
+    tmp_path = f"{CACHE_PATH}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(cache, f)
+    os.replace(tmp_path, CACHE_PATH)
+
+def installed_distributions(venv_path):
+    """Return {normalized name: version} for everything installed in the venv"""
+    distributions = {}
+    disk_cache = None
+    for path in site_packages(venv_path):
+        mtime_ns = os.stat(path).st_mtime_ns
+        cached = _memory_cache.get(path)
+        if cached is None or cached['mtime_ns'] != mtime_ns:
+            if disk_cache is None:
+                disk_cache = _load_disk_cache()
+            cached = disk_cache.get(path)
+            if cached is None or cached['mtime_ns'] != mtime_ns:
+                dists = {}
+                for dist_info in glob.glob(os.path.join(path, '*.dist-info')):
+                    name, version = _read_metadata(dist_info)
+                    dists[normalize_name(name)] = version
+                cached = {'mtime_ns': mtime_ns, 'dists': dists}
+                disk_cache[path] = cached
+                _save_disk_cache(disk_cache)
+            _memory_cache[path] = cached
+        distributions.update(cached['dists'])
+    return distributions
+
+def installed_version(venv_path, name):
+    return installed_distributions(venv_path).get(normalize_name(name))
+
+def version_tuple(version):
+    return tuple(int(part) for part in re.findall(r'\d+', version.split('+')[0])[:4])
+
+def _satisfies(version, operator, wanted):
+    if not operator:
+        return True
+    have, want = version_tuple(version), version_tuple(wanted)
+    return {
+        '==': have == want, '>=': have >= want, '<=': have <= want,
+        '>': have > want, '<': have < want, '!=': have != want,
+    }[operator]
+
+def missing_requirements(venv_path, requirements):
+    """Requirements ('Django', 'PyMySQL>=1.1', ...) that the venv does not satisfy"""
+    installed = installed_distributions(venv_path)
+    missing = []
+    for requirement in requirements:
+        match = re.match(r'^\s*([A-Za-z0-9_.\-]+)\s*(==|>=|<=|!=|>|<)?\s*([^\s;]*)', requirement)
+        name, operator, wanted = match.groups()
+        version = installed.get(normalize_name(name))
+        if version is None or not _satisfies(version, operator, wanted):
+            missing.append(requirement)
+    return missing
+
+def ensure_packages(venv_path, requirements):
+    """Install only the requirements the venv doesn't already satisfy; returns what was installed"""
+    missing = missing_requirements(venv_path, requirements)
+    if missing:
+        print(f"📦 Installing {', '.join(missing)}...")
+        subprocess.run(
+            [venv_python(venv_path), '-m', 'pip', 'install', '--disable-pip-version-check', *missing],
+            check=True
+        )
+    return missing
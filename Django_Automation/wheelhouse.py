@@ -0,0 +1,229 @@
+import os
+import re
+import sys
+import fcntl
+import hashlib
+import tempfile
+import subprocess
+from contextlib import contextmanager
+
+from starter_paths import starter_dir
+
+# Wheels are downloaded once into a shared wheelhouse and pinned (with sha256
+# hashes) in one lockfile per Django version and Python version. Project
+# bootstrap then installs from the wheelhouse only, with no network access.
+WHEELHOUSE = starter_dir('wheelhouse')
+LOCK_DIR = starter_dir('locks')
+
+FILL_LOCK = os.path.join(WHEELHOUSE, '.fill.lock')
+
+LOCK_NAME_RE = re.compile(r'^django-(?P<version>[0-9][0-9a-zA-Z.]*)-(?P<tag>py\d+)\.lock$')
+
+def python_tag(version_info=None):
+    """Short interpreter tag used in lockfile names, e.g. py311"""
+    version_info = version_info or sys.version_info
+    return f"py{version_info[0]}{version_info[1]}"
+
+def _version_key(version):
+    """Sort key for versions like 5.1.2 or 5.2rc1 (release parts first)"""
+    parts = []
+    for piece in re.split(r'[.\-]', version):
+        match = re.match(r'^(\d+)(.*)$', piece)
+        if match:
+            parts.append((int(match.group(1)), match.group(2) == '', match.group(2)))
+        else:
+            parts.append((-1, False, piece))
+    return parts
+
+def lock_path(django_version, tag=None):
+    return os.path.join(LOCK_DIR, f"django-{django_version}-{tag or python_tag()}.lock")
+
+def locked_versions(tag=None):
+    """All Django versions that have a lockfile for this interpreter, newest first"""
+    tag = tag or python_tag()
+    versions = []
+    for filename in os.listdir(LOCK_DIR):
+        match = LOCK_NAME_RE.match(filename)
+        if match and match.group('tag') == tag:
+            versions.append(match.group('version'))
+    return sorted(versions, key=_version_key, reverse=True)
+
+def sha256_file(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def _wheel_name_version(filename):
+    """Split 'asgiref-3.8.1-py3-none-any.whl' into ('asgiref', '3.8.1')"""
+    name, version = filename.split('-')[:2]
+    return name.replace('_', '-').lower(), version
+
+def read_lock(path):
+    """Return [(name, version, sha256, wheel_filename)] from a lockfile"""
+    entries = []
+    with open(path, 'r') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            # Format: name==version --hash=sha256:<hex>  # <wheel filename>
+            requirement, _, comment = line.partition('#')
+            spec, hash_part = requirement.split('--hash=sha256:')
+            name, version = spec.strip().split('==')
+            entries.append((name, version, hash_part.strip(), comment.strip()))
+    return entries
+
+@contextmanager
+def _fill_lock():
+    """Serialise wheelhouse fills across processes (parallel project creation)"""
+    with open(FILL_LOCK, 'w') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        yield
+
+def fill_wheelhouse(django_version=None, python=None):
+    """Download Django and its dependencies as wheels once and write the lockfile.
+
+    This is the only step that needs network access. Returns the Django
+    version that was locked.
+    """
+    with _fill_lock():
+        return _fill_wheelhouse(django_version, python)
+
+def _fill_wheelhouse(django_version, python):
+    python = python or sys.executable
+    requirement = f"django=={django_version}" if django_version else "django"
+    print(f"📦 Filling wheelhouse for {requirement} (one-time download)...")
+
+    with tempfile.TemporaryDirectory(dir=WHEELHOUSE) as download_dir:
+        subprocess.run(
+            [python, '-m', 'pip', 'download', requirement,
+             '--only-binary=:all:', '--disable-pip-version-check',
+             '--dest', download_dir],
+            check=True
+        )
+
+        entries = []
+        for filename in sorted(os.listdir(download_dir)):
+            if not filename.endswith('.whl'):
+                continue
+            name, version = _wheel_name_version(filename)
+            source = os.path.join(download_dir, filename)
+            digest = sha256_file(source)
+            target = os.path.join(WHEELHOUSE, filename)
+            if not os.path.exists(target) or sha256_file(target) != digest:
+                os.replace(source, target)
+            entries.append((name, version, digest, filename))
+
+    django_entry = [entry for entry in entries if entry[0] == 'django']
+    if not django_entry:
+        raise RuntimeError("pip download did not produce a Django wheel")
+    locked_version = django_entry[0][1]
+
+    path = lock_path(locked_version)
+    fd, tmp_path = tempfile.mkstemp(prefix='.lock-', dir=LOCK_DIR)
+    with os.fdopen(fd, 'w') as f:
+        f.write(f"# Django {locked_version} for {python_tag()} - generated by wheelhouse.py\n")
+        for name, version, digest, filename in entries:
+            f.write(f"{name}=={version} --hash=sha256:{digest}  # {filename}\n")
+    os.replace(tmp_path, path)
+
+    print(f"✅ Locked Django {locked_version} ({len(entries)} wheels) in {path}")
+    return locked_version
+
+def verify_lock(path):
+    """Check that every wheel pinned in a lockfile is present with the right hash"""
+    problems = []
+    for name, version, digest, filename in read_lock(path):
+        wheel_path = os.path.join(WHEELHOUSE, filename)
+        if not os.path.exists(wheel_path):
+            problems.append(f"missing {filename}")
+        elif sha256_file(wheel_path) != digest:
+            problems.append(f"hash mismatch for {filename}")
+    return problems
+
+def _usable_lock(django_version):
+    if django_version is None:
+        versions = locked_versions()
+        django_version = versions[0] if versions else None
+    if django_version is not None:
+        path = lock_path(django_version)
+        if os.path.exists(path) and not verify_lock(path):
+            return django_version, path
+    return None
+
+def resolve_lock(django_version=None):
+    """Return (version, lockfile path), filling the wheelhouse only when no usable lock exists"""
+    found = _usable_lock(django_version)
+    if found:
+        return found
+
+    with _fill_lock():
+        # Another process may have filled it while we waited for the lock
+        found = _usable_lock(django_version)
+        if found:
+            return found
+        django_version = _fill_wheelhouse(django_version, None)
+    return django_version, lock_path(django_version)
+
+def install_from_lock(venv_python, path):
+    """Install the wheels pinned in a lockfile into a venv from local wheels only"""
+    subprocess.run(
+        [venv_python, '-m', 'pip', 'install',
+         '--no-index', '--find-links', WHEELHOUSE,
+         '--require-hashes', '--no-deps',
+         '--disable-pip-version-check', '--quiet',
+         '-r', path],
+        check=True
+    )
+
+def install_locked(venv_python, django_version=None):
+    """Install the locked Django set into a venv from local wheels only"""
+    django_version, path = resolve_lock(django_version)
+    install_from_lock(venv_python, path)
+    return django_version
+
+def main():
+    print("\n" + "="*50)
+    print("Django Wheelhouse Manager".center(50))
+    print("="*50)
+    print(f"Wheelhouse: {WHEELHOUSE}")
+    print(f"Lockfiles:  {LOCK_DIR}")
+
+    while True:
+        print("\nChoose an option:")
+        print("1. Fill wheelhouse for a Django version")
+        print("2. Verify all lockfiles")
+        print("3. List locked Django versions")
+        print("4. Exit")
+
+        choice = input("Enter your choice (1/2/3/4): ").strip()
+
+        if choice == '1':
+            version = input("Django version (leave empty for latest): ").strip() or None
+            try:
+                fill_wheelhouse(version)
+            except subprocess.CalledProcessError as e:
+                print(f"❌ Download failed: {e}")
+        elif choice == '2':
+            versions = locked_versions()
+            if not versions:
+                print("ℹ️ No lockfiles yet.")
+            for version in versions:
+                problems = verify_lock(lock_path(version))
+                if problems:
+                    print(f"❌ Django {version}: {', '.join(problems)}")
+                else:
+                    print(f"✅ Django {version}: all wheels present and hashes match")
+        elif choice == '3':
+            versions = locked_versions()
+            print("\n".join(f"- Django {v}" for v in versions) or "ℹ️ No lockfiles yet.")
+        elif choice == '4':
+            print("Goodbye!")
+            break
+        else:
+            print("Invalid choice. Please select 1, 2, 3 or 4.")
+
+if __name__ == "__main__":
+    main()